@@ -0,0 +1,1210 @@
+#!/usr/bin/env python3
+"""
+GitHub Repository Manager (asyncio)
+Versão assíncrona do GitHubRepoManager, para serviços que já rodam em asyncio
+Requer: GH_TOKEN como variável de ambiente e aiohttp (requirements-async.txt)
+"""
+
+import os
+import sys
+import time
+import asyncio
+import hashlib
+import requests
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any
+from github_repo_manager import (
+    BackupError,
+    BandwidthLimiter,
+    GitHubRepoManager,
+    JsonlSink,
+    RateLimiter,
+    RepoConfig,
+    ResponseCache,
+    RetryPolicy,
+    ProgressCallback,
+    TopicTarget,
+    _CANCELLED,
+    _GRAPHQL_OWNER_REPOS,
+    _GRAPHQL_VIEWER_REPOS,
+    _BatchTracker,
+    _RequestFlow,
+    _archive_result,
+    _archive_target,
+    _check_download,
+    _discard,
+    _graphql_repo_to_rest,
+    _retry_scope,
+    _store_archive,
+    archive_is_current,
+    load_cached_login,
+    normalize_topics,
+    store_cached_login,
+    topic_changes,
+    verify_archive,
+)
+
+try:
+    import aiohttp
+except ImportError:  # dependência opcional
+    aiohttp = None
+
+
+def _transport_error(error: Exception, method: str, url: str) -> Exception:
+    """Falha de transporte do aiohttp como a exceção equivalente do requests"""
+    if isinstance(error, asyncio.TimeoutError):
+        return requests.Timeout(f"Timeout em {method} {url}")
+    return requests.ConnectionError(str(error))
+
+
+def _sync_file(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+class AsyncGitHubRepoManager:
+    """
+    Gerenciador de repositórios GitHub via API REST, com asyncio + aiohttp
+
+    Mesma superfície do GitHubRepoManager (métodos são corrotinas e as
+    listagens, geradores assíncronos). Todas as requisições compartilham um
+    pool de conexões keep-alive, são limitadas por um semáforo e passam pelo
+    mesmo RateLimiter/ResponseCache da versão síncrona. Erros HTTP levantam
+    requests.HTTPError, como no cliente síncrono.
+
+    Uso:
+        async with AsyncGitHubRepoManager() as gh:
+            repos = await gh.list_repos()
+    """
+
+    BASE_URL = GitHubRepoManager.BASE_URL
+    BATCH_WORKERS = 32
+    BACKUP_WORKERS = GitHubRepoManager.BACKUP_WORKERS
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        pool_size: int = 100,
+        max_concurrency: int = 50,
+        timeout: float = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        base_url: Optional[str] = None,
+        sinks: Optional[List[Any]] = None,
+    ):
+        """
+        Inicializa o gerenciador (a sessão HTTP é aberta na primeira requisição)
+
+        Args:
+            token: GitHub Personal Access Token (ou usa GH_TOKEN do ambiente)
+            pool_size: Conexões keep-alive mantidas no pool
+            max_concurrency: Requisições simultâneas em voo
+            timeout: Timeout de cada requisição em segundos
+            rate_limiter: Agendador de limites (padrão: compartilhado por token)
+            cache: Cache de GETs condicionais (padrão: memória, ou SQLite em
+                GH_CACHE_DB se definido)
+            retry_policy: Retries de falhas transitórias (5xx, reset, timeout)
+            base_url: URL da API (padrão: GH_API_URL ou BASE_URL; ex: GitHub
+                Enterprise ou o simulador local github_simulator.py)
+            sinks: Destinos dos RequestEvent de cada requisição (ver
+                GitHubRepoManager; GH_METRICS_JSONL acrescenta um JsonlSink)
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp não instalado. Instale com: pip install aiohttp")
+
+        self.token = token or os.getenv("GH_TOKEN")
+        if not self.token:
+            raise ValueError(
+                "GH_TOKEN não encontrado. Configure a variável de ambiente ou passe o token."
+            )
+
+        base_url = base_url or os.getenv("GH_API_URL") or self.BASE_URL
+        self.base_url = base_url.rstrip("/")
+        self.headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter.for_token(self.token)
+        self.graphql_limiter = RateLimiter.for_token(self.token, "graphql")
+        self.cache = cache or ResponseCache(os.getenv("GH_CACHE_DB"))
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.sinks = list(sinks or [])
+        if os.getenv("GH_METRICS_JSONL"):
+            self.sinks.append(JsonlSink(os.environ["GH_METRICS_JSONL"]))
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional["aiohttp.ClientSession"] = None
+        # Usuário autenticado resolvido só no primeiro get_user()
+        self._user: Optional[str] = None
+        # Donos já identificados como "org" ou "user" (ver iter_owner_repos)
+        self._owner_kinds: Dict[str, str] = {}
+
+    # ==================== SESSÃO HTTP ====================
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """Sessão aiohttp (criada no loop atual, na primeira requisição)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        """Fecha as conexões keep-alive do pool, o cache em disco e os sinks"""
+        if self._session is not None:
+            await self._session.close()
+        self.cache.close()
+        for sink in self.sinks:
+            sink.close()
+
+    async def __aenter__(self) -> "AsyncGitHubRepoManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def get_user(self) -> str:
+        """
+        Login do usuário autenticado (ver GitHubRepoManager.user)
+
+        Resolvido na primeira chamada: cache em disco por hash do token, ou
+        validação do token via /user.
+        """
+        if self._user is None:
+            self._user = load_cached_login(self.token)
+        if self._user is None:
+            self._user = await self._get_authenticated_user()
+            store_cached_login(self.token, self._user)
+        return self._user
+
+    @property
+    def user(self) -> str:
+        """
+        Login já resolvido (propriedades não podem esperar a rede)
+
+        Vem do cache em disco quando possível; senão, use await get_user().
+        """
+        if self._user is None:
+            self._user = load_cached_login(self.token)
+        if self._user is None:
+            raise RuntimeError("Usuário ainda não resolvido: use await gh.get_user()")
+        return self._user
+
+    async def _get_authenticated_user(self) -> str:
+        """Obtém o usuário autenticado"""
+        response = await self._make_request("GET", "/user")
+        response.raise_for_status()
+        return response.json()["login"]
+
+    def rate_limit_budget(self, resource: str = "core") -> Dict[str, Any]:
+        """Orçamento de rate limit conhecido (limit, remaining, reset_at, ...)"""
+        limiter = self.graphql_limiter if resource == "graphql" else self.rate_limiter
+        return limiter.budget()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict],
+        params: Optional[Dict],
+        headers: Optional[Dict],
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Envia a requisição e converte a resposta para requests.Response
+
+        Com stream, o corpo de uma resposta de sucesso não é lido: a
+        resposta aiohttp fica em response.raw, para o chamador ler em blocos
+        e liberar.
+        """
+        options: Dict[str, Any] = {}
+        if stream:
+            # Sem limite total: só o tempo entre blocos (downloads longos)
+            options["timeout"] = aiohttp.ClientTimeout(
+                total=None, sock_read=self.timeout
+            )
+        body, resp = b"", None
+        try:
+            async with self._semaphore:
+                resp = await self.session.request(
+                    method, url, json=data, params=params, headers=headers, **options
+                )
+                # Erros têm corpo curto, que o RateLimiter consulta (403/429)
+                if not stream or resp.status >= 400:
+                    async with resp:
+                        body = await resp.read()
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            if stream and resp is not None:
+                resp.release()
+            raise _transport_error(e, method, url) from e
+
+        # Mesmo tipo de resposta do cliente síncrono: raise_for_status(),
+        # json(), links e os helpers de RateLimiter/ResponseCache funcionam
+        response = requests.Response()
+        response.status_code = resp.status
+        response.reason = resp.reason
+        response.url = str(resp.url)
+        response.headers.update(resp.headers)
+        response._content = body
+        response.encoding = resp.charset or "utf-8"
+        if stream:
+            response.raw = resp
+        return response
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Faz requisição à API do GitHub
+
+        Mesma política do cliente síncrono (_RequestFlow): cache condicional,
+        rate limit e retries de falhas transitórias.
+
+        Args:
+            method: Método HTTP (GET, POST, PATCH, DELETE)
+            endpoint: Endpoint da API (ex: /repos/owner/repo) ou URL absoluta
+            data: Dados JSON para enviar
+            params: Parâmetros de query string
+            stream: Não ler o corpo (downloads; sem cache; o chamador libera
+                response.raw)
+
+        Returns:
+            Response object (requests.Response, com o atributo `retries`)
+        """
+        flow = _RequestFlow(self, method, endpoint, data, params, stream)
+        while True:
+            while wait := flow.wait():
+                await asyncio.sleep(wait)
+            try:
+                response = await self._send(
+                    method, flow.url, data, params, flow.headers, stream
+                )
+            except requests.RequestException as e:
+                delay = flow.failed(e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            delay = flow.retry_after(response)
+            if delay is None:
+                return flow.finish()
+            if stream:
+                response.raw.release()
+            await asyncio.sleep(delay)
+
+    _emit = GitHubRepoManager._emit
+
+    async def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        items_key: Optional[str] = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Itera sobre todos os itens de um endpoint paginado
+
+        Segue o header Link (rel="next") e já dispara a próxima página
+        enquanto o chamador processa a atual.
+
+        Args:
+            endpoint: Endpoint da API (ex: /user/repos)
+            params: Parâmetros da primeira página
+            items_key: Chave da lista no JSON (None = resposta já é a lista)
+
+        Yields:
+            Itens de cada página, à medida que chegam
+        """
+        task = asyncio.ensure_future(self._make_request("GET", endpoint, None, params))
+        try:
+            while task is not None:
+                response = await task
+                response.raise_for_status()
+
+                next_url = response.links.get("next", {}).get("url")
+                task = (
+                    asyncio.ensure_future(self._make_request("GET", next_url))
+                    if next_url
+                    else None
+                )
+
+                page = response.json()
+                for item in page[items_key] if items_key else page:
+                    yield item
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """
+        Executa uma consulta GraphQL
+
+        Args:
+            query: Documento GraphQL
+            variables: Variáveis da consulta
+
+        Returns:
+            Campo "data" da resposta
+
+        Raises:
+            requests.HTTPError: Erro HTTP ou erros GraphQL na resposta
+        """
+        response = await self._make_request(
+            "POST", "/graphql", data={"query": query, "variables": variables or {}}
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(e.get("message", "") for e in payload["errors"])
+            raise requests.HTTPError(f"GraphQL: {messages}", response=response)
+        return payload["data"]
+
+    # ==================== OPERAÇÕES DE LEITURA ====================
+
+    _repos_query = GitHubRepoManager._repos_query
+
+    async def list_repos(
+        self,
+        username: Optional[str] = None,
+        type_filter: str = "all",
+        sort: str = "updated",
+        per_page: int = 30,
+    ) -> List[Dict]:
+        """
+        Lista repositórios
+
+        Args:
+            username: Usuário (None = usuário autenticado)
+            type_filter: Filtro (all, owner, public, private, member)
+            sort: Ordenação (created, updated, pushed, full_name)
+            per_page: Resultados por página
+
+        Returns:
+            Lista de repositórios (apenas a primeira página)
+        """
+        endpoint, params = self._repos_query(username, type_filter, sort, per_page)
+        response = await self._make_request("GET", endpoint, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def iter_repos(
+        self,
+        username: Optional[str] = None,
+        type_filter: str = "all",
+        sort: str = "updated",
+        per_page: int = 100,
+    ) -> AsyncIterator[Dict]:
+        """
+        Itera sobre todos os repositórios, página a página (async for)
+
+        Args:
+            username: Usuário (None = usuário autenticado)
+            type_filter: Filtro (all, owner, public, private, member)
+            sort: Ordenação (created, updated, pushed, full_name)
+            per_page: Resultados por página (máx 100)
+
+        Yields:
+            Repositórios à medida que as páginas chegam
+        """
+        endpoint, params = self._repos_query(username, type_filter, sort, per_page)
+        return self.paginate(endpoint, params)
+
+    async def iter_repos_graphql(
+        self, owner: Optional[str] = None, page_size: int = 100
+    ) -> AsyncIterator[Dict]:
+        """
+        Itera sobre repositórios com topics via GraphQL (100 por requisição)
+
+        Args:
+            owner: Usuário ou organização (None = repos do usuário autenticado)
+            page_size: Repositórios por página (máx 100)
+
+        Yields:
+            Repositórios no formato REST, incluindo "topics"
+        """
+        if owner:
+            query = _GRAPHQL_OWNER_REPOS
+            path = ("repositoryOwner", "repositories")
+        else:
+            query = _GRAPHQL_VIEWER_REPOS
+            path = ("viewer", "repositories")
+
+        variables = {"first": page_size, "after": None}
+        if owner:
+            variables["login"] = owner
+        while True:
+            data = await self.graphql(query, variables)
+            if data.get(path[0]) is None:
+                raise requests.HTTPError(f"GraphQL: owner '{owner}' não encontrado")
+            connection = data[path[0]][path[1]]
+
+            for node in connection["nodes"]:
+                yield _graphql_repo_to_rest(node)
+
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            variables["after"] = connection["pageInfo"]["endCursor"]
+
+    def iter_org_repos(
+        self,
+        org: str,
+        type_filter: str = "all",
+        sort: str = "updated",
+        per_page: int = 100,
+    ) -> AsyncIterator[Dict]:
+        """
+        Itera sobre todos os repositórios de uma organização (async for)
+
+        Args:
+            org: Organização
+            type_filter: Filtro (all, public, private, forks, sources, member)
+            sort: Ordenação (created, updated, pushed, full_name)
+            per_page: Resultados por página (máx 100)
+
+        Yields:
+            Repositórios à medida que as páginas chegam
+        """
+        params = {"type": type_filter, "sort": sort, "per_page": per_page}
+        return self.paginate(f"/orgs/{org}/repos", params)
+
+    async def iter_owner_repos(
+        self,
+        owner: str,
+        type_filter: str = "all",
+        sort: str = "updated",
+        per_page: int = 100,
+    ) -> AsyncIterator[Dict]:
+        """
+        Itera sobre os repositórios de um usuário ou organização
+
+        Ver GitHubRepoManager.iter_owner_repos (org primeiro, usuário no 404).
+        """
+        if self._owner_kinds.get(owner) != "user":
+            started = False
+            try:
+                async for repo in self.iter_org_repos(
+                    owner, type_filter, sort, per_page
+                ):
+                    started = True
+                    yield repo
+                self._owner_kinds[owner] = "org"
+                return
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if started or status != 404:
+                    raise
+                self._owner_kinds[owner] = "user"
+
+        async for repo in self.iter_repos(owner, type_filter, sort, per_page):
+            yield repo
+
+    async def scan_owners(
+        self,
+        owners: List[str],
+        type_filter: str = "all",
+        use_graphql: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lista os repositórios de vários usuários/organizações em paralelo
+
+        Ver GitHubRepoManager.scan_owners: mesmo orçamento global (RateLimiter
+        do token) e cada dono entregue assim que termina.
+
+        Args:
+            owners: Usuários e/ou organizações
+            type_filter: Filtro de tipo (listagem REST)
+            use_graphql: Listar via GraphQL (100 repos com topics por requisição)
+            max_workers: Donos listados ao mesmo tempo (padrão: BATCH_WORKERS)
+
+        Yields:
+            Dict com owner, repos, seconds e error, na ordem de conclusão
+        """
+        slots = asyncio.Semaphore(max_workers or self.BATCH_WORKERS)
+
+        async def scan(owner: str) -> Dict[str, Any]:
+            async with slots:
+                start = time.perf_counter()
+                if use_graphql:
+                    listing = self.iter_repos_graphql(owner)
+                else:
+                    listing = self.iter_owner_repos(owner, type_filter)
+                try:
+                    repos = [repo async for repo in listing]
+                except Exception as e:
+                    return {
+                        "owner": owner,
+                        "repos": [],
+                        "seconds": None,
+                        "error": str(e),
+                    }
+                seconds = time.perf_counter() - start
+                return {
+                    "owner": owner,
+                    "repos": repos,
+                    "seconds": seconds,
+                    "error": None,
+                }
+
+        tasks = [asyncio.ensure_future(scan(owner)) for owner in owners]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_repo(self, owner: str, repo: str) -> Dict:
+        """
+        Obtém detalhes de um repositório
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+
+        Returns:
+            Dados do repositório
+        """
+        response = await self._make_request("GET", f"/repos/{owner}/{repo}")
+        response.raise_for_status()
+        return response.json()
+
+    # ==================== ARQUIVAMENTO ====================
+
+    async def archive_repo(self, owner: str, repo: str) -> Dict:
+        """
+        Arquiva um repositório (torna read-only)
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+
+        Returns:
+            Dados do repositório arquivado
+        """
+        return await self.update_repo(owner, repo, archived=True)
+
+    async def unarchive_repo(self, owner: str, repo: str) -> Dict:
+        """
+        Desarquiva um repositório
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+
+        Returns:
+            Dados do repositório desarquivado
+        """
+        return await self.update_repo(owner, repo, archived=False)
+
+    # ==================== EXCLUSÃO ====================
+
+    async def delete_repo(self, owner: str, repo: str, confirm: bool = False) -> bool:
+        """
+        Apaga um repositório (AÇÃO IRREVERSÍVEL!)
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+            confirm: Confirmação de exclusão (segurança)
+
+        Returns:
+            True se deletado com sucesso
+
+        Raises:
+            ValueError: Se confirm=False
+        """
+        if not confirm:
+            raise ValueError(
+                f"ATENÇÃO: Esta ação é IRREVERSÍVEL! "
+                f"Para deletar {owner}/{repo}, chame delete_repo('{owner}', '{repo}', confirm=True)"
+            )
+
+        response = await self._make_request("DELETE", f"/repos/{owner}/{repo}")
+
+        # 404 após retry: a tentativa anterior apagou, mas a resposta se perdeu
+        if response.status_code == 204 or (
+            response.status_code == 404 and response.retries
+        ):
+            return True
+
+        response.raise_for_status()
+        return False
+
+    # ==================== ATUALIZAÇÃO ====================
+
+    async def download_archive(
+        self,
+        owner: str,
+        repo: str,
+        dest_dir: str,
+        archive_format: str = "tarball",
+        ref: Optional[str] = None,
+        bandwidth: Optional[BandwidthLimiter] = None,
+        chunk_size: int = 1 << 16,
+        pushed_at: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Baixa o arquivo (tarball/zipball) de um repositório, em blocos
+
+        Ver GitHubRepoManager.download_archive: mesmo caminho, validação
+        (tamanho, assinatura, SHA-256 relido do disco), arquivo .sha256 e
+        reaproveitamento só de backups mais novos que o último push.
+        """
+        path, endpoint = _archive_target(dest_dir, owner, repo, archive_format, ref)
+
+        checksum = await asyncio.to_thread(verify_archive, path)
+        if checksum is not None:
+            if pushed_at is None:
+                pushed_at = (await self.get_repo(owner, repo)).get("pushed_at")
+            if archive_is_current(path, pushed_at):
+                return _archive_result(path, checksum, os.path.getsize(path), True)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = f"{path}.{os.getpid()}.{id(asyncio.current_task())}.part"
+
+        # Rate limit e 5xx já são tratados por _make_request; aqui só a
+        # conexão que cai no meio do corpo (recomeça: GET é idempotente)
+        retries = 0
+        while True:
+            try:
+                digest, size = await self._stream_to_file(
+                    endpoint, part, bandwidth, chunk_size
+                )
+                break
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self.retry_policy.next_delay(retries)
+                if delay is None:
+                    _discard(part)
+                    raise BackupError(f"{owner}/{repo}: download interrompido ({e})")
+                retries += 1
+                await asyncio.sleep(delay)
+            except BaseException:
+                _discard(part)
+                raise
+
+        return await asyncio.to_thread(
+            _store_archive, part, path, archive_format, digest, size, f"{owner}/{repo}"
+        )
+
+    async def _stream_to_file(
+        self,
+        endpoint: str,
+        path: str,
+        bandwidth: Optional[BandwidthLimiter],
+        chunk_size: int,
+    ) -> tuple[str, int]:
+        """
+        Grava o corpo de um GET em `path`; devolve (SHA-256, bytes)
+
+        Escrita e fsync rodam em threads: o loop segue atendendo as outras
+        tasks enquanto o disco trabalha.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        response = await self._make_request("GET", endpoint, stream=True)
+        resp = response.raw
+        try:
+            response.raise_for_status()
+            f = await asyncio.to_thread(open, path, "wb")
+            try:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    if bandwidth is not None:
+                        await asyncio.sleep(bandwidth.reserve(len(chunk)))
+                    await asyncio.to_thread(f.write, chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                await asyncio.to_thread(_sync_file, f)
+            finally:
+                await asyncio.to_thread(f.close)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            raise _transport_error(e, "GET", response.url) from e
+        finally:
+            resp.release()
+
+        _check_download(response.headers, size, endpoint)
+        return digest.hexdigest(), size
+
+    async def update_repo(
+        self,
+        owner: str,
+        repo: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        homepage: Optional[str] = None,
+        private: Optional[bool] = None,
+        has_issues: Optional[bool] = None,
+        has_projects: Optional[bool] = None,
+        has_wiki: Optional[bool] = None,
+        default_branch: Optional[str] = None,
+        archived: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Atualiza configurações do repositório
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório atual
+            name: Novo nome do repositório
+            description: Nova descrição
+            homepage: Nova URL do site
+            private: Tornar privado/público
+            has_issues: Habilitar issues
+            has_projects: Habilitar projects
+            has_wiki: Habilitar wiki
+            default_branch: Branch padrão
+            archived: Arquivar/desarquivar
+
+        Returns:
+            Dados do repositório atualizado
+        """
+        fields = {
+            "name": name,
+            "description": description,
+            "homepage": homepage,
+            "private": private,
+            "has_issues": has_issues,
+            "has_projects": has_projects,
+            "has_wiki": has_wiki,
+            "default_branch": default_branch,
+            "archived": archived,
+        }
+        data = {key: value for key, value in fields.items() if value is not None}
+
+        response = await self._make_request(
+            "PATCH", f"/repos/{owner}/{repo}", data=data
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def update_visibility(self, owner: str, repo: str, private: bool) -> Dict:
+        """
+        Atualiza visibilidade do repositório
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+            private: True para privado, False para público
+
+        Returns:
+            Dados do repositório atualizado
+        """
+        return await self.update_repo(owner, repo, private=private)
+
+    # ==================== TOPICS (TAGS) ====================
+
+    async def get_topics(self, owner: str, repo: str) -> List[str]:
+        """
+        Obtém topics (tags) do repositório
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+
+        Returns:
+            Lista de topics
+        """
+        response = await self._make_request("GET", f"/repos/{owner}/{repo}/topics")
+        response.raise_for_status()
+        return response.json()["names"]
+
+    async def set_topics(self, owner: str, repo: str, topics: List[str]) -> List[str]:
+        """
+        Define topics (tags) do repositório
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+            topics: Lista de topics (máx 20, lowercase, alphanumeric + hífens)
+
+        Returns:
+            Lista de topics atualizada
+        """
+        response = await self._make_request(
+            "PUT",
+            f"/repos/{owner}/{repo}/topics",
+            data={"names": normalize_topics(topics)},
+        )
+        response.raise_for_status()
+        return response.json()["names"]
+
+    async def add_topics(
+        self,
+        owner: str,
+        repo: str,
+        topics: List[str],
+        current: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Adiciona topics ao repositório (mantém existentes)
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+            topics: Lista de topics para adicionar
+            current: Topics atuais, se já conhecidos (evita o GET)
+
+        Returns:
+            Lista completa de topics
+        """
+        if current is None:
+            current = await self.get_topics(owner, repo)
+        new_topics = normalize_topics(current + topics)
+        if set(new_topics) == set(current):
+            return current
+        return await self.set_topics(owner, repo, new_topics)
+
+    async def reconcile_topics(
+        self,
+        repos: List[Dict],
+        target: TopicTarget,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[asyncio.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Leva os topics de muitos repositórios ao estado desejado
+
+        Só os repos cujo alvo difere dos "topics" da listagem recebem um PUT
+        (ver GitHubRepoManager.reconcile_topics).
+
+        Args:
+            repos: Repositórios da listagem
+            target: Função repo -> topics desejados
+            max_workers: Itens em andamento ao mesmo tempo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
+
+        Returns:
+            Dict do lote mais "topics" (novas listas) e "unchanged"
+        """
+        changes = topic_changes(repos, target)
+        unknown = {
+            r["full_name"]: r
+            for r in repos
+            if r.get("topics") is None and not r.get("archived")
+        }
+        unchanged = sum(1 for r in repos if not r.get("archived")) - len(changes)
+        unchanged -= len(unknown)
+
+        async def reconcile(owner: str, repo: str):
+            nonlocal unchanged
+            full_name = f"{owner}/{repo}"
+            if full_name in unknown:
+                current = await self.get_topics(owner, repo)
+                wanted = normalize_topics(
+                    target({**unknown[full_name], "topics": current})
+                )
+                if set(wanted) == set(current):
+                    unchanged += 1
+                    return current
+                changes[full_name] = wanted
+            return await self.set_topics(owner, repo, changes[full_name])
+
+        items = [tuple(name.split("/", 1)) for name in [*changes, *unknown]]
+        results = await self.run_batch(reconcile, items, max_workers, progress, cancel)
+        results["topics"] = changes
+        results["unchanged"] = unchanged
+        return results
+
+    # ==================== CRIAÇÃO ====================
+
+    async def create_repo(self, config: RepoConfig) -> Dict:
+        """
+        Cria um novo repositório
+
+        Args:
+            config: Configuração do repositório
+
+        Returns:
+            Dados do repositório criado
+        """
+        data = {
+            "name": config.name,
+            "description": config.description,
+            "homepage": config.homepage,
+            "private": config.private,
+            "has_issues": config.has_issues,
+            "has_projects": config.has_projects,
+            "has_wiki": config.has_wiki,
+            "auto_init": config.auto_init,
+        }
+
+        response = await self._make_request("POST", "/user/repos", data=data)
+        response.raise_for_status()
+        repo_data = response.json()
+
+        if config.default_branch and config.default_branch != repo_data.get(
+            "default_branch"
+        ):
+            try:
+                await self.update_repo(
+                    repo_data["owner"]["login"],
+                    config.name,
+                    default_branch=config.default_branch,
+                )
+            except Exception as e:
+                print(
+                    f"Aviso: Não foi possível alterar branch padrão para {config.default_branch}: {e}"
+                )
+
+        return repo_data
+
+    # ==================== OPERAÇÕES EM LOTE ====================
+
+    async def run_batch(
+        self,
+        operation: Callable[[str, str], Awaitable[Any]],
+        repos: List[tuple[str, str]],
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[asyncio.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Executa uma operação por repositório com concorrência limitada
+
+        cancel.set() (ou o cancelamento da própria corrotina) interrompe o
+        lote: itens ainda não iniciados são marcados como cancelados e os que
+        estão em andamento terminam — o cancelamento só é propagado depois
+        deles, para um PUT/DELETE não ser cortado no meio. Falhas transitórias
+        são repetidas dentro de um orçamento de retries compartilhado pelo lote.
+
+        Args:
+            operation: Corrotina (owner, repo) executada para cada item
+            repos: Lista de tuplas (owner, repo)
+            max_workers: Itens em andamento ao mesmo tempo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
+
+        Returns:
+            Dict com sucessos, falhas, cancelados, retries por item
+            ("owner/repo" -> n) e uso do orçamento de retries
+        """
+        batch = _BatchTracker(self.retry_policy, len(repos), progress)
+        stop = cancel or asyncio.Event()
+        slots = asyncio.Semaphore(max_workers or self.BATCH_WORKERS)
+
+        async def run(owner: str, repo: str):
+            name = f"{owner}/{repo}"
+            result, error = None, None
+            async with slots:
+                if stop.is_set():
+                    batch.record(name, _CANCELLED)
+                    return
+                scope = batch.scope()
+                _retry_scope.set(scope)  # cada item roda em sua própria task
+                try:
+                    result = await operation(owner, repo)
+                except Exception as e:
+                    error = e
+                batch.retried(name, scope)
+            batch.record(name, result, error)
+
+        items = asyncio.gather(*(run(owner, repo) for owner, repo in repos))
+        try:
+            await asyncio.shield(items)
+        except asyncio.CancelledError:
+            # Quem espera vaga sai cancelado; quem já começou termina
+            stop.set()
+            await items
+            raise
+
+        return batch.finish()
+
+    async def archive_multiple(
+        self,
+        repos: List[tuple[str, str]],
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[asyncio.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Arquiva múltiplos repositórios em paralelo
+
+        Args:
+            repos: Lista de tuplas (owner, repo)
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
+
+        Returns:
+            Dict com sucessos, falhas, cancelados e retries
+        """
+        return await self.run_batch(
+            self.archive_repo, repos, max_workers, progress, cancel
+        )
+
+    async def unarchive_multiple(
+        self,
+        repos: List[tuple[str, str]],
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[asyncio.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Desarquiva múltiplos repositórios em paralelo
+
+        Args:
+            repos: Lista de tuplas (owner, repo)
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
+
+        Returns:
+            Dict com sucessos, falhas, cancelados e retries
+        """
+        return await self.run_batch(
+            self.unarchive_repo, repos, max_workers, progress, cancel
+        )
+
+    def backup_stage(
+        self,
+        dest_dir: str,
+        archive_format: str = "tarball",
+        max_downloads: Optional[int] = None,
+        bandwidth: Optional[float] = None,
+    ) -> Callable[[str, str], Awaitable[Dict[str, Any]]]:
+        """
+        Etapa de backup para lotes: corrotina (owner, repo) -> download_archive
+
+        As chamadas de todas as tasks dividem um limite de downloads
+        simultâneos e um limite de banda.
+
+        Args:
+            dest_dir: Diretório dos backups
+            archive_format: tarball ou zipball
+            max_downloads: Downloads simultâneos (padrão: BACKUP_WORKERS)
+            bandwidth: Limite de banda total em bytes/s (None = sem limite)
+        """
+        slots = asyncio.Semaphore(max_downloads or self.BACKUP_WORKERS)
+        limiter = BandwidthLimiter(bandwidth) if bandwidth else None
+
+        async def backup(owner: str, repo: str) -> Dict[str, Any]:
+            async with slots:
+                return await self.download_archive(
+                    owner, repo, dest_dir, archive_format, bandwidth=limiter
+                )
+
+        return backup
+
+    async def backup_repos(
+        self,
+        repos: List[tuple[str, str]],
+        dest_dir: str,
+        archive_format: str = "tarball",
+        max_downloads: Optional[int] = None,
+        bandwidth: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[asyncio.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Baixa o arquivo de vários repositórios em paralelo (ver download_archive)
+
+        Returns:
+            Dict com sucessos, falhas, cancelados, retries e backups
+            ("owner/repo" -> dict de download_archive, como em delete_multiple)
+        """
+        backups: Dict[str, Dict[str, Any]] = {}
+        stage = self.backup_stage(dest_dir, archive_format, max_downloads, bandwidth)
+
+        async def backup(owner: str, repo: str):
+            backups[f"{owner}/{repo}"] = await stage(owner, repo)
+
+        results = await self.run_batch(
+            backup, repos, max_downloads or self.BACKUP_WORKERS, progress, cancel
+        )
+        results["backups"] = backups
+        return results
+
+    async def delete_multiple(
+        self,
+        repos: List[tuple[str, str]],
+        confirm: bool = False,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[asyncio.Event] = None,
+        backup_dir: Optional[str] = None,
+        archive_format: str = "tarball",
+        max_downloads: Optional[int] = None,
+        bandwidth: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Deleta múltiplos repositórios em paralelo
+
+        Com backup_dir, cada repo só é deletado depois que o seu backup foi
+        baixado e verificado (ver GitHubRepoManager.delete_multiple).
+
+        Args:
+            repos: Lista de tuplas (owner, repo)
+            confirm: Confirmação de exclusão (segurança)
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
+            backup_dir: Baixar o arquivo de cada repo antes de deletá-lo
+            archive_format: tarball ou zipball
+            max_downloads: Downloads simultâneos (padrão: BACKUP_WORKERS)
+            bandwidth: Limite de banda dos backups em bytes/s
+
+        Returns:
+            Dict com sucessos, falhas, cancelados, retries e backups
+        """
+        if not confirm:
+            raise ValueError(
+                "ATENÇÃO: Esta ação é IRREVERSÍVEL! "
+                "Para deletar múltiplos repos, passe confirm=True"
+            )
+
+        backups: Dict[str, Dict[str, Any]] = {}
+        backup = None
+        if backup_dir:
+            backup = self.backup_stage(
+                backup_dir, archive_format, max_downloads, bandwidth
+            )
+        stop = cancel or asyncio.Event()  # cancelar o lote também o aciona
+
+        async def delete(owner: str, repo: str) -> Any:
+            if backup is not None:
+                backups[f"{owner}/{repo}"] = await backup(owner, repo)
+                # Cancelado durante o download: o backup fica, o repo também
+                if stop.is_set():
+                    return _CANCELLED
+            return await self.delete_repo(owner, repo, confirm=True)
+
+        results = await self.run_batch(delete, repos, max_workers, progress, stop)
+        results["backups"] = backups
+        return results
+
+
+async def _main():
+    """Exemplo de uso"""
+    async with AsyncGitHubRepoManager() as gh:
+        print(f"✓ Autenticado como: {await gh.get_user()}\n")
+
+        print("Seus repositórios:")
+        for repo in await gh.list_repos(per_page=5):
+            status = "🔒 ARQUIVADO" if repo["archived"] else "✓ Ativo"
+            visibility = "🔐 Privado" if repo["private"] else "🌐 Público"
+            print(f"  {status} {visibility} - {repo['full_name']}")
+
+
+def main():
+    try:
+        asyncio.run(_main())
+    except Exception as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark do GitHubRepoManager e do RepoOrganizer contra o simulador local
+Mede tempo de ponta a ponta, requisições e vazão de cada cenário, sem rede
+
+Uso:
+    python3 benchmark_organizer.py --repos 10000 --latency 0.005
+    python3 benchmark_organizer.py --scenario organizer-execute --json base.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+import statistics
+from typing import Callable, Dict, List, Any
+from github_repo_manager import GitHubRepoManager, RateLimiter
+from github_simulator import GitHubSimulator, SimulatorConfig
+from workflow_organizer import RepoOrganizer
+
+
+def _listing_rest(gh: GitHubRepoManager, sim: GitHubSimulator) -> int:
+    return sum(1 for _ in gh.iter_repos(per_page=100))
+
+
+def _listing_graphql(gh: GitHubRepoManager, sim: GitHubSimulator) -> int:
+    return sum(1 for _ in gh.iter_repos_graphql())
+
+
+def _organizer(dry_run: bool) -> Callable[[GitHubRepoManager, GitHubSimulator], int]:
+    def run(gh: GitHubRepoManager, sim: GitHubSimulator) -> int:
+        organizer = RepoOrganizer(dry_run=dry_run, force=True, gh=gh)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            organizer.run(delete=not dry_run)
+        return organizer.stats["total"]
+
+    return run
+
+
+def _batch_archive(workers: int) -> Callable[[GitHubRepoManager, GitHubSimulator], int]:
+    def run(gh: GitHubRepoManager, sim: GitHubSimulator) -> int:
+        targets = [(gh.user, r["name"]) for r in sim.repos() if not r["archived"]][:500]
+        results = gh.archive_multiple(targets, max_workers=workers)
+        return len(results["success"])
+
+    return run
+
+
+SCENARIOS: Dict[str, Callable[[GitHubRepoManager, GitHubSimulator], int]] = {
+    "listing-rest": _listing_rest,
+    "listing-graphql": _listing_graphql,
+    "organizer-dry-run": _organizer(dry_run=True),
+    "organizer-execute": _organizer(dry_run=False),
+    "batch-archive-1": _batch_archive(1),
+    "batch-archive-8": _batch_archive(8),
+    "batch-archive-32": _batch_archive(32),
+}
+
+
+def run_scenario(
+    name: str, config: SimulatorConfig, throttle: bool, repeat: int
+) -> Dict[str, Any]:
+    """
+    Executa um cenário N vezes, cada uma com simulador e gerenciador novos
+
+    Returns:
+        Dict com tempos (mediana/melhor), itens, requisições e status HTTP
+    """
+    timings, items, stats = [], 0, {}
+    for attempt in range(repeat):
+        with GitHubSimulator(config) as sim:
+            gh = GitHubRepoManager(
+                token=f"bench-{name}-{attempt}-{time.time_ns()}", base_url=sim.url
+            )
+            if not throttle:
+                # Mede o cliente, não o limite secundário de 900 pontos/minuto
+                gh.rate_limiter = RateLimiter(points_per_minute=10**9, burst=10**9)
+                gh.graphql_limiter = RateLimiter(points_per_minute=10**9, burst=10**9)
+            gh.user  # autenticação fora da medição
+
+            sim.reset_stats()
+            start = time.perf_counter()
+            items = SCENARIOS[name](gh, sim)
+            timings.append(time.perf_counter() - start)
+            stats = sim.stats()
+            gh.close()
+
+    median = statistics.median(timings)
+    return {
+        "scenario": name,
+        "seconds": median,
+        "best": min(timings),
+        "items": items,
+        "requests": stats["requests"],
+        "requests_per_s": stats["requests"] / median if median else 0.0,
+        "items_per_s": items / median if median else 0.0,
+        "by_status": stats["by_status"],
+        "by_route": stats["by_route"],
+    }
+
+
+def print_table(results: List[Dict[str, Any]]):
+    """Imprime o resumo dos cenários"""
+    print(
+        f"\n{'Cenário':<20} {'Tempo (s)':>10} {'Itens':>7} {'Reqs':>7} "
+        f"{'Reqs/s':>9} {'Itens/s':>9}  Status"
+    )
+    print("-" * 90)
+    for r in results:
+        statuses = " ".join(f"{k}:{v}" for k, v in sorted(r["by_status"].items()))
+        print(
+            f"{r['scenario']:<20} {r['seconds']:>10.2f} {r['items']:>7} "
+            f"{r['requests']:>7} {r['requests_per_s']:>9.0f} "
+            f"{r['items_per_s']:>9.0f}  {statuses}"
+        )
+
+
+def main():
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark do organizador contra o simulador da API do GitHub"
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Cenário a executar (repetível; padrão: todos)",
+    )
+    parser.add_argument("--repos", type=int, default=10000, help="Repos da conta")
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="Latência por requisição (s)"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Variação máxima da latência (s)"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fração de respostas 502/503"
+    )
+    parser.add_argument(
+        "--throttle",
+        action="store_true",
+        help="Manter o limite secundário do cliente (900 pontos/minuto)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Repetições por cenário")
+    parser.add_argument("--json", help="Salvar resultados em JSON (para comparar)")
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        accounts={"octocat": args.repos},
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=10**9,
+    )
+
+    # Login, planos e backups em diretório temporário: não mistura com os do usuário
+    workdir = tempfile.mkdtemp(prefix="gh-bench-")
+    os.environ["GH_AUTH_CACHE"] = os.path.join(workdir, "auth.json")
+    os.environ["GH_PLAN_DIR"] = os.path.join(workdir, "plans")
+    os.environ["GH_BACKUP_DIR"] = os.path.join(workdir, "backups")
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        print(f"▶ {name}...", file=sys.stderr)
+        results.append(run_scenario(name, config, args.throttle, args.repeat))
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {"config": vars(args), "results": results}, f, indent=2, default=str
+            )
+        print(f"\n✓ Resultados salvos em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,62 @@ Interface de linha de comando para gerenciar repositórios GitHub
 
 import os
 import sys
+import cmd
+import csv
+import json
+import shlex
+import sqlite3
 import argparse
-import sys
-from typing import List, Optional, Any
-from github_repo_manager import GitHubRepoManager, RepoConfig
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Any, TextIO
+from github_repo_manager import (
+    DEFAULT_BACKUP_DIR,
+    GitHubRepoManager,
+    MetricsSummary,
+    RepoConfig,
+    topic_changes,
+)
+from repo_mirror import RepoMirror
+
+try:
+    import readline
+except ImportError:  # Windows: shell sem histórico/Tab
+    readline = None
+
+# Idade máxima (segundos) do espelho local antes de uma sync incremental automática
+DEFAULT_MIRROR_TTL = 900
+
+# Histórico de comandos do `shell`
+SHELL_HISTORY = os.path.join(
+    os.path.expanduser("~"), ".cache", "supergithub", "shell_history"
+)
+
+# Colunas do `list --format csv`
+LIST_FIELDS = (
+    "full_name",
+    "private",
+    "archived",
+    "fork",
+    "language",
+    "stargazers_count",
+    "forks_count",
+    "updated_at",
+    "description",
+    "html_url",
+)
+
+
+_manager: Optional[GitHubRepoManager] = None
+# Sinks de métricas entregues ao gerenciador (--stats acrescenta um MetricsSummary)
+_sinks: List[Any] = []
+
+
+def get_manager() -> GitHubRepoManager:
+    """Gerenciador compartilhado entre os comandos (criado no primeiro uso)"""
+    global _manager
+    if _manager is None:
+        _manager = GitHubRepoManager(sinks=_sinks)
+    return _manager
 
 
 def safe_date_slice(date_str: Optional[str]) -> str:
@@ -31,6 +83,28 @@ def parse_bool(val: Any) -> bool:
     return False
 
 
+def print_repo(i: int, repo: dict, show_details: bool = False):
+    """Exibe um repositório da listagem (i = posição)"""
+    # Status e visibilidade
+    status = "🔒" if repo["archived"] else "✓"
+    visibility = "🔐" if repo["private"] else "🌐"
+
+    # Nome e descrição
+    name = repo["full_name"]
+    desc = repo["description"] or "Sem descrição"
+
+    print(f"{i}. {status} {visibility} {name}")
+
+    if show_details:
+        print(f"   📝 {desc}")
+        print(
+            f"   ⭐ {repo['stargazers_count']} stars  "
+            f"🍴 {repo['forks_count']} forks  "
+            f"📅 Atualizado: {safe_date_slice(repo['updated_at'])}"
+        )
+        print(f"   🔗 {repo['html_url']}\n")
+
+
 def print_repo_list(repos: List[dict], show_details: bool = False):
     """Formata e exibe lista de repositórios"""
     if not repos:
@@ -38,54 +112,242 @@ def print_repo_list(repos: List[dict], show_details: bool = False):
         return
 
     for i, repo in enumerate(repos, 1):
-        # Status e visibilidade
-        status = "🔒" if repo["archived"] else "✓"
-        visibility = "🔐" if repo["private"] else "🌐"
+        print_repo(i, repo, show_details)
+
+
+class RepoWriter:
+    """
+    Escreve repositórios à medida que chegam, sem acumular a listagem
+
+    Formatos: text (legível), json (um array, escrito item a item), jsonl (um
+    objeto por linha) e csv (colunas de LIST_FIELDS).
+    """
+
+    def __init__(
+        self,
+        fmt: str = "text",
+        show_details: bool = False,
+        out: Optional[TextIO] = None,
+    ):
+        self.fmt = fmt
+        self.show_details = show_details
+        self.out = out or sys.stdout
+        self.count = 0
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self.out, LIST_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    @property
+    def machine(self) -> bool:
+        """Saída para outras ferramentas (mensagens vão para stderr)"""
+        return self.fmt != "text"
+
+    def write(self, repo: Dict):
+        self.count += 1
+        if self.fmt == "text":
+            print_repo(self.count, repo, self.show_details)
+        elif self.fmt == "csv":
+            self._csv.writerow(repo)
+        elif self.fmt == "jsonl":
+            self.out.write(json.dumps(repo, ensure_ascii=False) + "\n")
+        else:
+            self.out.write("[\n" if self.count == 1 else ",\n")
+            self.out.write(json.dumps(repo, ensure_ascii=False))
+
+    def close(self):
+        if self.fmt == "json":
+            self.out.write("\n]\n" if self.count else "[]\n")
+        elif self.fmt == "text" and not self.count:
+            print("Nenhum repositório encontrado.")
+        self.out.flush()
+
+
+def print_batch_progress(done: int, total: int, name: str, error: Optional[str]):
+    """Exibe o progresso de uma operação em lote"""
+    print(f"  [{done}/{total}] {'✓' if error is None else '✗'} {name}")
+
+
+def print_batch_results(results: dict):
+    """Exibe o resumo de uma operação em lote"""
+    print(f"\n✓ Sucesso: {len(results['success'])}")
+    for repo in results["success"]:
+        print(f"  - {repo}")
+
+    if results["failed"]:
+        print(f"\n✗ Falhas: {len(results['failed'])}")
+        for fail in results["failed"]:
+            print(f"  - {fail['repo']}: {fail['error']}")
+
+    if results.get("cancelled"):
+        print(f"\n⚠️  Cancelados (Ctrl-C): {len(results['cancelled'])}")
+        for repo in results["cancelled"]:
+            print(f"  - {repo}")
 
-        # Nome e descrição
-        name = repo["full_name"]
-        desc = repo["description"] or "Sem descrição"
+    if results.get("retries"):
+        budget = results["retry_budget"]
+        print(f"\n🔁 Retries: {budget['used']} (orçamento do lote: {budget['limit']})")
+        for repo, count in results["retries"].items():
+            print(f"  - {repo}: {count}")
 
-        print(f"{i}. {status} {visibility} {name}")
 
-        if show_details:
-            print(f"   📝 {desc}")
+def print_backups(backups: dict):
+    """Exibe os backups feitos antes de uma deleção"""
+    if not backups:
+        return
+    total = sum(b["bytes"] for b in backups.values())
+    print(f"\n💾 Backups: {len(backups)} ({total / 1024 / 1024:.1f} MB)")
+    for name, backup in backups.items():
+        reused = " (já existia)" if backup["reused"] else ""
+        print(f"  - {name}: {backup['path']} sha256={backup['sha256'][:12]}{reused}")
+
+
+def _list_filters(args) -> dict:
+    """Converte as flags --*-only em filtros de arquivado/privado"""
+    archived = True if args.archived_only else False if args.active_only else None
+    private = True if args.private_only else False if args.public_only else None
+    return {"archived": archived, "private": private}
+
+
+def _matches(repo: Dict, filters: dict) -> bool:
+    """Repositório atende aos filtros de _list_filters"""
+    return all(value is None or repo[key] == value for key, value in filters.items())
+
+
+def _api_listing(gh: GitHubRepoManager, args, filters: dict) -> Iterator[Dict]:
+    """
+    Listagem direta da API com os filtros aplicados
+
+    Filtros que a API entende viram parâmetros (visibilidade em /user/repos);
+    os demais são aplicados aqui e a paginação continua até completar --limit.
+    """
+    type_filter = args.type
+    if filters["private"] is not None and not args.user and type_filter == "all":
+        type_filter = "private" if filters["private"] else "public"
+    # Com filtros locais, páginas cheias: menos requisições até o limite
+    local = filters["archived"] is not None or (
+        filters["private"] is not None and type_filter == args.type
+    )
+    per_page = 100 if local else min(args.limit, 100)
+
+    repos = gh.iter_repos(
+        username=args.user, type_filter=type_filter, sort=args.sort, per_page=per_page
+    )
+    return islice((r for r in repos if _matches(r, filters)), args.limit)
+
+
+def _list_owners(gh: GitHubRepoManager, args, filters: dict, writer: RepoWriter):
+    """Lista vários donos em paralelo, exibindo cada um assim que termina"""
+    owners = [o.strip() for o in args.owners.split(",") if o.strip()]
+    log = sys.stderr if writer.machine else sys.stdout
+    counts = []
+    for result in gh.scan_owners(owners, type_filter=args.type):
+        owner = result["owner"]
+        if result["error"]:
+            print(f"\n✗ {owner}: {result['error']}", file=log)
+            counts.append((owner, None))
+            continue
+
+        repos = [r for r in result["repos"] if _matches(r, filters)]
+        counts.append((owner, len(repos)))
+
+        if writer.machine:
+            for repo in repos[: args.limit]:
+                writer.write(repo)
+            continue
+        print(f"\n{'=' * 60}")
+        print(f"{owner}: {len(repos)} repositórios ({result['seconds']:.1f}s)")
+        print(f"{'=' * 60}\n")
+        print_repo_list(repos[: args.limit], show_details=args.details)
+        if len(repos) > args.limit:
+            print(f"   ... e mais {len(repos) - args.limit}")
+    if writer.machine:
+        writer.close()  # texto: cada dono já exibiu seu bloco (ou "nenhum")
+
+    print(f"\n{'=' * 60}", file=log)
+    print(f"Resumo ({len(owners)} donos)", file=log)
+    print(f"{'=' * 60}", file=log)
+    for owner, count in counts:
+        print(f"  {owner:<30} {'erro' if count is None else count:>8}", file=log)
+    total = sum(c for _, c in counts if c is not None)
+    print(f"  {'Total':<30} {total:>8}", file=log)
+
+
+def _mirror_listing(
+    gh: GitHubRepoManager, args, filters: dict, log: TextIO
+) -> Iterator[Dict]:
+    """
+    Listagem do espelho local, filtrada no SQLite e lida linha a linha
+
+    Um espelho velho é sincronizado antes da primeira linha (incremental:
+    em geral uma página; completa na primeira vez, com --refresh ou a cada
+    FULL_SYNC_INTERVAL).
+    """
+    with RepoMirror(gh) as mirror:
+        scope = mirror.scope_for(args.user, args.type)
+        ttl = float(os.getenv("GH_MIRROR_TTL", DEFAULT_MIRROR_TTL))
+        if args.refresh or mirror.is_stale(scope, ttl):
+            stats = mirror.sync(args.user, args.type, full=args.refresh)
             print(
-                f"   ⭐ {repo['stargazers_count']} stars  "
-                f"🍴 {repo['forks_count']} forks  "
-                f"📅 Atualizado: {safe_date_slice(repo['updated_at'])}"
+                f"🔄 Espelho sincronizado ({stats['mode']}): "
+                f"{stats['upserted']} atualizados, {stats['removed']} removidos",
+                file=log,
             )
-            print(f"   🔗 {repo['html_url']}\n")
+        yield from mirror.iter_query(
+            args.user, args.type, sort=args.sort, limit=args.limit, **filters
+        )
+
+
+def _patch_mirror(
+    changes: Optional[Dict[str, Dict]] = None,
+    removed: Iterable[str] = (),
+    expire: bool = False,
+):
+    """Leva ao espelho local as mudanças já feitas pela API (sem nova sync)"""
+    try:
+        with RepoMirror() as mirror:
+            mirror.forget(removed)
+            for name, fields in (changes or {}).items():
+                mirror.patch(name, fields)
+            if expire:
+                mirror.expire()
+    except sqlite3.Error as e:
+        print(f"⚠️  Espelho local não atualizado: {e}", file=sys.stderr)
 
 
 def cmd_list(args):
-    """Lista repositórios"""
-    gh = GitHubRepoManager()
+    """Lista repositórios (linhas escritas à medida que chegam)"""
+    gh = get_manager()
+    filters = _list_filters(args)
+    writer = RepoWriter(args.format, show_details=args.details)
 
-    repos = gh.list_repos(
-        username=args.user, type_filter=args.type, sort=args.sort, per_page=args.limit
-    )
+    if args.owners:
+        _list_owners(gh, args, filters, writer)
+        return
+
+    log = sys.stderr if writer.machine else sys.stdout
+    repos: Iterable[Dict]
+    if args.no_mirror:
+        repos = _api_listing(gh, args, filters)
+    else:
+        repos = _mirror_listing(gh, args, filters, log)
 
-    # Filtros adicionais
-    if args.archived_only:
-        repos = [r for r in repos if r["archived"]]
-    if args.active_only:
-        repos = [r for r in repos if not r["archived"]]
-    if args.private_only:
-        repos = [r for r in repos if r["private"]]
-    if args.public_only:
-        repos = [r for r in repos if not r["private"]]
+    if not writer.machine:
+        print(f"\n{'=' * 60}")
+        print(f"Repositórios de {args.user or gh.user}")
+        print(f"{'=' * 60}\n")
 
-    print(f"\n{'=' * 60}")
-    print(f"Repositórios de {args.user or gh.user} ({len(repos)} encontrados)")
-    print(f"{'=' * 60}\n")
+    for repo in repos:
+        writer.write(repo)
+    writer.close()
 
-    print_repo_list(repos, show_details=args.details)
+    if not writer.machine:
+        print(f"\n{writer.count} encontrados")
 
 
 def cmd_info(args):
     """Mostra informações detalhadas de um repositório"""
-    gh = GitHubRepoManager()
+    gh = get_manager()
 
     try:
         repo = gh.get_repo(args.owner, args.repo)
@@ -114,8 +376,10 @@ def cmd_info(args):
         print(f"   Atualizado: {safe_date_slice(repo['updated_at'])}")
         print(f"   Push: {safe_date_slice(repo['pushed_at'])}")
 
-        # Topics
-        topics = gh.get_topics(args.owner, args.repo)
+        # Topics (já incluídos no payload do repositório)
+        topics = repo.get("topics")
+        if topics is None:
+            topics = gh.get_topics(args.owner, args.repo)
         if topics:
             print(f"\n🏷️ Topics: {', '.join(topics)}")
 
@@ -126,27 +390,25 @@ def cmd_info(args):
 
 def cmd_archive(args):
     """Arquiva repositório(s)"""
-    gh = GitHubRepoManager()
+    gh = get_manager()
 
     if args.batch:
         # Modo lote
         repos = [(args.owner, repo.strip()) for repo in args.repo.split(",")]
 
         print(f"Arquivando {len(repos)} repositórios...")
-        results = gh.archive_multiple(repos)
-
-        print(f"\n✓ Sucesso: {len(results['success'])}")
-        for repo in results["success"]:
-            print(f"  - {repo}")
-
-        if results["failed"]:
-            print(f"\n✗ Falhas: {len(results['failed'])}")
-            for fail in results["failed"]:
-                print(f"  - {fail['repo']}: {fail['error']}")
+        results = gh.archive_multiple(
+            repos,
+            max_workers=args.workers,
+            progress=print_batch_progress,
+        )
+        _patch_mirror({name: {"archived": True} for name in results["success"]})
+        print_batch_results(results)
     else:
         # Modo único
         try:
             result = gh.archive_repo(args.owner, args.repo)
+            _patch_mirror({f"{args.owner}/{args.repo}": result})
             print(f"✓ Repositório arquivado: {result['full_name']}")
         except Exception as e:
             print(f"❌ Erro: {e}", file=sys.stderr)
@@ -155,27 +417,25 @@ def cmd_archive(args):
 
 def cmd_unarchive(args):
     """Desarquiva repositório(s)"""
-    gh = GitHubRepoManager()
+    gh = get_manager()
 
     if args.batch:
         # Modo lote
         repos = [(args.owner, repo.strip()) for repo in args.repo.split(",")]
 
         print(f"Desarquivando {len(repos)} repositórios...")
-        results = gh.unarchive_multiple(repos)
-
-        print(f"\n✓ Sucesso: {len(results['success'])}")
-        for repo in results["success"]:
-            print(f"  - {repo}")
-
-        if results["failed"]:
-            print(f"\n✗ Falhas: {len(results['failed'])}")
-            for fail in results["failed"]:
-                print(f"  - {fail['repo']}: {fail['error']}")
+        results = gh.unarchive_multiple(
+            repos,
+            max_workers=args.workers,
+            progress=print_batch_progress,
+        )
+        _patch_mirror({name: {"archived": False} for name in results["success"]})
+        print_batch_results(results)
     else:
         # Modo único
         try:
             result = gh.unarchive_repo(args.owner, args.repo)
+            _patch_mirror({f"{args.owner}/{args.repo}": result})
             print(f"✓ Repositório desarquivado: {result['full_name']}")
         except Exception as e:
             print(f"❌ Erro: {e}", file=sys.stderr)
@@ -184,7 +444,7 @@ def cmd_unarchive(args):
 
 def cmd_delete(args):
     """Deleta repositório(s)"""
-    gh = GitHubRepoManager()
+    gh = get_manager()
 
     # Confirmação de segurança
     if not args.force and not args.yes:
@@ -196,34 +456,50 @@ def cmd_delete(args):
             print("Operação cancelada.")
             return
 
+    # Backup antes de deletar (padrão): sem backup verificado, o repo fica
+    backup_dir = None
+    if not args.no_backup:
+        backup_dir = args.backup_dir or os.getenv("GH_BACKUP_DIR") or DEFAULT_BACKUP_DIR
+        print(f"💾 Backups ({args.archive_format}) em {backup_dir}")
+    bandwidth = args.bandwidth * 1024 * 1024 if args.bandwidth else None
+
+    # Modo lote ou único: o mesmo caminho, com o backup como porta da deleção
     if args.batch:
-        # Modo lote
         repos = [(args.owner, repo.strip()) for repo in args.repo.split(",")]
-
         print(f"Deletando {len(repos)} repositórios...")
-        results = gh.delete_multiple(repos, confirm=True)
-
-        print(f"\n✓ Sucesso: {len(results['success'])}")
-        for repo in results["success"]:
-            print(f"  - {repo}")
+    else:
+        repos = [(args.owner, args.repo)]
+
+    results = gh.delete_multiple(
+        repos,
+        confirm=True,
+        max_workers=args.workers,
+        progress=print_batch_progress if args.batch else None,
+        backup_dir=backup_dir,
+        archive_format=args.archive_format,
+        max_downloads=args.backup_workers,
+        bandwidth=bandwidth,
+    )
+    _patch_mirror(removed=results["success"])
 
-        if results["failed"]:
-            print(f"\n✗ Falhas: {len(results['failed'])}")
-            for fail in results["failed"]:
-                print(f"  - {fail['repo']}: {fail['error']}")
+    if args.batch:
+        print_batch_results(results)
+        print_backups(results["backups"])
+    elif results["failed"]:
+        print(f"❌ Erro: {results['failed'][0]['error']}", file=sys.stderr)
+        sys.exit(1)
+    elif results["cancelled"]:
+        print_backups(results["backups"])
+        print(f"⚠️  Cancelado: {args.owner}/{args.repo} não foi deletado")
+        sys.exit(1)
     else:
-        # Modo único
-        try:
-            gh.delete_repo(args.owner, args.repo, confirm=True)
-            print(f"✓ Repositório deletado: {args.owner}/{args.repo}")
-        except Exception as e:
-            print(f"❌ Erro: {e}", file=sys.stderr)
-            sys.exit(1)
+        print_backups(results["backups"])
+        print(f"✓ Repositório deletado: {args.owner}/{args.repo}")
 
 
 def cmd_update(args):
     """Atualiza configurações do repositório"""
-    gh = GitHubRepoManager()
+    gh = get_manager()
 
     # Prepara dados de atualização
     updates = {}
@@ -251,6 +527,7 @@ def cmd_update(args):
 
     try:
         result = gh.update_repo(args.owner, args.repo, **updates)
+        _patch_mirror({f"{args.owner}/{args.repo}": result})
         print(f"✓ Repositório atualizado: {result['full_name']}")
 
         # Mostra mudanças
@@ -265,7 +542,7 @@ def cmd_update(args):
 
 def cmd_topics(args):
     """Gerencia topics do repositório"""
-    gh = GitHubRepoManager()
+    gh = get_manager()
 
     try:
         if args.action == "list":
@@ -289,6 +566,7 @@ def cmd_topics(args):
                 result = gh.set_topics(args.owner, args.repo, topics)
             else:
                 result = gh.add_topics(args.owner, args.repo, topics)
+            _patch_mirror({f"{args.owner}/{args.repo}": {"topics": result}})
             print(f"✓ Topics atualizados: {', '.join(result)}")
 
     except Exception as e:
@@ -296,9 +574,50 @@ def cmd_topics(args):
         sys.exit(1)
 
 
+def cmd_topics_sync(args):
+    """Reconcilia topics de todos os repositórios (PUT só onde muda)"""
+    gh = get_manager()
+
+    add = [t.strip() for t in (args.add or "").split(",") if t.strip()]
+    remove = {t.strip().lower() for t in (args.remove or "").split(",") if t.strip()}
+    if not (add or remove or args.language):
+        print("❌ Erro: Use --add, --remove e/ou --language.")
+        sys.exit(1)
+
+    def target(repo: dict) -> List[str]:
+        topics = [t for t in repo["topics"] if t not in remove] + add
+        if args.language and repo.get("language"):
+            topics.append(repo["language"])
+        return topics
+
+    # A listagem já traz os topics: o alvo é calculado sem requisições extras
+    repos = list(gh.iter_repos(username=args.user, per_page=100))
+
+    if args.dry_run:
+        changes = topic_changes(repos, target)
+        for name, topics in changes.items():
+            print(f"  {name}: {', '.join(topics) or '(nenhum)'}")
+        print(f"\n{len(changes)} de {len(repos)} repositórios mudariam (dry-run)")
+        return
+
+    results = gh.reconcile_topics(
+        repos, target, max_workers=args.workers, progress=print_batch_progress
+    )
+    changed = results["topics"]
+    _patch_mirror(
+        {
+            name: {"topics": changed[name]}
+            for name in results["success"]
+            if name in changed
+        }
+    )
+    print(f"\nSem mudança (0 requisições): {results['unchanged']}")
+    print_batch_results(results)
+
+
 def cmd_create(args):
     """Cria novo repositório"""
-    gh = GitHubRepoManager()
+    gh = get_manager()
 
     config = RepoConfig(
         name=args.name,
@@ -314,6 +633,7 @@ def cmd_create(args):
 
     try:
         repo = gh.create_repo(config)
+        _patch_mirror(expire=True)
         print(f"✓ Repositório criado: {repo['html_url']}")
 
         # Adicionar topics se especificado
@@ -327,18 +647,37 @@ def cmd_create(args):
         sys.exit(1)
 
 
-def main():
-    """Ponto de entrada do CLI"""
+def build_parser() -> argparse.ArgumentParser:
+    """Parser do CLI (também usado pelos comandos do `shell`)"""
     parser = argparse.ArgumentParser(
         description="GitHub Repository Manager - Gerenciador de repositórios GitHub",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Imprimir latência/percentis por endpoint ao final",
+    )
+
     subparsers = parser.add_subparsers(dest="command", help="Comandos disponíveis")
 
     # Comando: list
-    parser_list = subparsers.add_parser("list", help="Listar repositórios")
+    parser_list = subparsers.add_parser(
+        "list",
+        help="Listar repositórios",
+        description="Lista repositórios do espelho local, escrevendo cada linha "
+        "assim que lida. Um espelho velho (GH_MIRROR_TTL) é sincronizado antes "
+        "da primeira linha: em geral uma página, mas a sync completa (primeira "
+        "vez, --refresh ou uma vez por dia) relê a conta inteira. --no-mirror "
+        "lista direto da API, página a página.",
+    )
     parser_list.add_argument("--user", "-u", help="Usuário (padrão: autenticado)")
+    parser_list.add_argument(
+        "--owners",
+        help="Usuários/organizações separados por vírgula, listados em paralelo "
+        "(direto da API; --limit vale por dono)",
+    )
     parser_list.add_argument(
         "--type",
         "-t",
@@ -369,6 +708,23 @@ def main():
     parser_list.add_argument(
         "--public-only", action="store_true", help="Apenas públicos"
     )
+    parser_list.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ressincronizar o espelho local por completo antes de listar",
+    )
+    parser_list.add_argument(
+        "--no-mirror",
+        action="store_true",
+        help="Listar direto da API, sem usar o espelho local",
+    )
+    parser_list.add_argument(
+        "--format",
+        "-f",
+        default="text",
+        choices=["text", "json", "jsonl", "csv"],
+        help="Formato da saída (json/jsonl/csv: uma linha por repo, sem cabeçalho)",
+    )
     parser_list.set_defaults(func=cmd_list)
 
     # Comando: info
@@ -387,6 +743,13 @@ def main():
         action="store_true",
         help="Modo lote (repos separados por vírgula)",
     )
+    parser_archive.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=GitHubRepoManager.BATCH_WORKERS,
+        help="Operações paralelas no modo lote",
+    )
     parser_archive.set_defaults(func=cmd_archive)
 
     # Comando: unarchive
@@ -401,6 +764,13 @@ def main():
         action="store_true",
         help="Modo lote (repos separados por vírgula)",
     )
+    parser_unarchive.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=GitHubRepoManager.BATCH_WORKERS,
+        help="Operações paralelas no modo lote",
+    )
     parser_unarchive.set_defaults(func=cmd_unarchive)
 
     # Comando: delete
@@ -413,12 +783,46 @@ def main():
         action="store_true",
         help="Modo lote (repos separados por vírgula)",
     )
+    parser_delete.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=GitHubRepoManager.BATCH_WORKERS,
+        help="Operações paralelas no modo lote",
+    )
     parser_delete.add_argument(
         "--yes", "-y", action="store_true", help="Confirmar automaticamente"
     )
     parser_delete.add_argument(
         "--force", "-f", action="store_true", help="Forçar sem confirmação (PERIGOSO!)"
     )
+    parser_delete.add_argument(
+        "--backup-dir",
+        help="Diretório dos backups (padrão: GH_BACKUP_DIR ou "
+        "~/.local/share/supergithub/backups)",
+    )
+    parser_delete.add_argument(
+        "--no-backup",
+        action="store_true",
+        help="Deletar sem baixar o arquivo do repositório antes (PERIGOSO!)",
+    )
+    parser_delete.add_argument(
+        "--archive-format",
+        default="tarball",
+        choices=["tarball", "zipball"],
+        help="Formato do backup",
+    )
+    parser_delete.add_argument(
+        "--backup-workers",
+        type=int,
+        default=GitHubRepoManager.BACKUP_WORKERS,
+        help="Downloads de backup simultâneos",
+    )
+    parser_delete.add_argument(
+        "--bandwidth",
+        type=float,
+        help="Limite de banda total dos backups (MB/s)",
+    )
     parser_delete.set_defaults(func=cmd_delete)
 
     # Comando: update
@@ -445,6 +849,30 @@ def main():
     parser_topics.add_argument("--topics", help="Topics separados por vírgula")
     parser_topics.set_defaults(func=cmd_topics)
 
+    # Comando: topics-sync
+    parser_sync = subparsers.add_parser(
+        "topics-sync", help="Reconciliar topics de todos os repositórios"
+    )
+    parser_sync.add_argument("--user", "-u", help="Usuário (padrão: autenticado)")
+    parser_sync.add_argument("--add", help="Topics a garantir (separados por vírgula)")
+    parser_sync.add_argument(
+        "--remove", help="Topics a remover (separados por vírgula)"
+    )
+    parser_sync.add_argument(
+        "--language", action="store_true", help="Adicionar a linguagem como topic"
+    )
+    parser_sync.add_argument(
+        "--dry-run", action="store_true", help="Só mostrar o que mudaria"
+    )
+    parser_sync.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=GitHubRepoManager.BATCH_WORKERS,
+        help="PUTs paralelos",
+    )
+    parser_sync.set_defaults(func=cmd_topics_sync)
+
     # Comando: create
     parser_create = subparsers.add_parser("create", help="Criar repositório")
     parser_create.add_argument("name", help="Nome do repositório")
@@ -471,6 +899,188 @@ def main():
     parser_create.add_argument("--topics", help="Topics separados por vírgula")
     parser_create.set_defaults(func=cmd_create)
 
+    # Comando: shell
+    parser_shell = subparsers.add_parser(
+        "shell", help="Shell interativo (uma sessão para vários comandos)"
+    )
+    parser_shell.set_defaults(func=cmd_shell)
+
+    return parser
+
+
+class GhShell(cmd.Cmd):
+    """
+    Shell interativo: os comandos do CLI sobre um único gerenciador
+
+    Pool de conexões, cache de ETags, login resolvido e rate limiter vivem
+    durante toda a sessão. Tab completa comandos, opções, donos e nomes de
+    repositórios (do espelho local, sem chamar a API). Os comandos que mudam
+    repos atualizam o espelho (_patch_mirror), e os nomes são relidos depois
+    de cada comando: um repo deletado some de `list` e do Tab na hora.
+    """
+
+    intro = "GitHub Repository Manager - shell (help, Tab completa, exit sai)"
+    prompt = "gh> "
+
+    def __init__(self, parser: argparse.ArgumentParser):
+        super().__init__()
+        self.parser = parser
+        self.subparsers: Dict[str, argparse.ArgumentParser] = next(
+            action.choices
+            for action in parser._actions
+            if isinstance(action, argparse._SubParsersAction)
+        )
+        self._names: Optional[List[tuple]] = None
+
+    # ---- execução ----
+
+    def default(self, line: str):
+        try:
+            tokens = shlex.split(line)
+        except ValueError as e:
+            print(f"❌ Erro: {e}", file=sys.stderr)
+            return
+        if tokens[0] == "shell":
+            print("Já no shell.")
+            return
+        try:
+            args = self.parser.parse_args(tokens)
+        except SystemExit:
+            return  # argparse já exibiu o erro ou a ajuda
+        try:
+            args.func(args)
+        except SystemExit:
+            pass  # comandos saem com sys.exit(1) em erro; o shell continua
+        except KeyboardInterrupt:
+            print("\n⚠️  Interrompido")
+        except Exception as e:
+            print(f"❌ Erro: {e}", file=sys.stderr)
+        finally:
+            self._names = None  # delete/update/... já corrigiram o espelho
+
+    def emptyline(self):
+        pass  # não repetir o último comando (ex: delete)
+
+    def do_help(self, arg: str):
+        if arg in self.subparsers:
+            self.subparsers[arg].print_help()
+        else:
+            self.parser.print_help()
+
+    def do_exit(self, arg: str) -> bool:
+        """Sair do shell"""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg: str) -> bool:
+        print()
+        return True
+
+    # ---- completação ----
+
+    def names(self) -> List[tuple]:
+        """Pares (dono, nome) do espelho local, lidos uma vez por comando"""
+        if self._names is None:
+            with RepoMirror() as mirror:
+                self._names = mirror.names()
+        return self._names
+
+    def completenames(self, text: str, *ignored) -> List[str]:
+        commands = [name for name in self.subparsers if name != "shell"]
+        return [c for c in commands + ["exit", "help"] if c.startswith(text)]
+
+    def completedefault(self, text: str, line: str, begidx: int, endidx: int):
+        try:
+            tokens = shlex.split(line[:begidx])
+        except ValueError:
+            return []  # aspas ainda abertas
+        subparser = self.subparsers.get(tokens[0]) if tokens else None
+        if subparser is None:
+            return []
+        options = {
+            option: action
+            for action in subparser._actions
+            for option in action.option_strings
+        }
+        if text.startswith("-"):
+            return [option for option in options if option.startswith(text)]
+
+        previous = options.get(tokens[-1]) if len(tokens) > 1 else None
+        if previous is not None and previous.nargs != 0:
+            dest = previous.dest
+            choices = previous.choices
+            values: Dict[str, str] = {}
+        else:
+            # Posição do argumento entre os posicionais do subcomando
+            positionals = [a for a in subparser._actions if not a.option_strings]
+            values = {}
+            index = 0
+            skip = False
+            for token in tokens[1:]:
+                if skip:
+                    skip = False
+                elif token in options:
+                    skip = options[token].nargs != 0
+                elif index < len(positionals):
+                    values[positionals[index].dest] = token
+                    index += 1
+            if index >= len(positionals):
+                return []
+            dest = positionals[index].dest
+            choices = positionals[index].choices
+
+        if choices:
+            return [c for c in choices if c.startswith(text)]
+        # Listas separadas por vírgula: completa o último item
+        head, _, last = text.rpartition(",")
+        head = f"{head}," if head else ""
+        if dest in ("owner", "user", "owners"):
+            candidates = {owner for owner, _ in self.names()}
+        elif dest == "repo":
+            owner = values.get("owner")
+            candidates = {name for o, name in self.names() if o == owner}
+        else:
+            return []
+        return sorted(head + c for c in candidates if c.startswith(last))
+
+    # ---- histórico ----
+
+    def preloop(self):
+        if readline is None:
+            return
+        readline.set_completer_delims(" \t\n")  # nomes têm "-" e ","
+        try:
+            readline.read_history_file(SHELL_HISTORY)
+        except OSError:
+            pass
+
+    def postloop(self):
+        if readline is None:
+            return
+        os.makedirs(os.path.dirname(SHELL_HISTORY), exist_ok=True)
+        readline.set_history_length(1000)
+        readline.write_history_file(SHELL_HISTORY)
+
+
+def cmd_shell(args):
+    """Shell interativo com sessão persistente"""
+    gh = get_manager()
+    shell = GhShell(build_parser())
+    print(shell.intro)
+    print(f"Conectado como {gh.user}")
+    while True:
+        try:
+            shell.cmdloop(intro="")
+            break
+        except KeyboardInterrupt:
+            print("^C")
+
+
+def main():
+    """Ponto de entrada do CLI"""
+    parser = build_parser()
+
     # Parse argumentos
     args = parser.parse_args()
 
@@ -484,12 +1094,36 @@ def main():
         print("Configure com: export GH_TOKEN='ghp_seu_token_aqui'")
         sys.exit(1)
 
+    summary = None
+    if args.stats:
+        summary = MetricsSummary()
+        _sinks.append(summary)
+
     # Executa comando
     try:
         args.func(args)
+    except BrokenPipeError:
+        # Saída encerrada pelo leitor (ex: | head): não é erro
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
     except Exception as e:
         print(f"❌ Erro: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if _manager is not None:
+            cassette = _manager.transport_stats()
+            _manager.close()
+            if cassette:
+                print(
+                    f"🎞️  Cassete ({cassette['mode']}): {cassette['requests']} "
+                    f"requisições, {len(cassette['misses'])} fora da gravação, "
+                    f"{cassette['unused']} gravadas não usadas",
+                    file=sys.stderr,
+                )
+        if summary is not None:
+            print(
+                f"\n📈 Requisições por endpoint:\n{summary.format_table()}",
+                file=sys.stderr,
+            )
 
 
 if __name__ == "__main__":
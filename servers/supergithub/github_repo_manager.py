@@ -6,13 +6,116 @@ Requer: GH_TOKEN como variável de ambiente
 """
 
 import os
+import re
 import sys
+import gzip
 import json
+import time
+import base64
+import random
+import hashlib
+import sqlite3
+import threading
 import requests
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
 from enum import Enum
 
+# Callback de progresso dos lotes: (concluídos, total, "owner/repo", erro ou None)
+ProgressCallback = Callable[[int, int, str, Optional[str]], None]
+
+# Marca itens de lote que não chegaram a executar por cancelamento
+_CANCELLED = object()
+
+# Validade (s) do login em cache por token (ver GitHubRepoManager.user)
+AUTH_TTL = float(os.getenv("GH_AUTH_TTL", 24 * 3600))
+
+# Respostas mantidas em memória pelo ResponseCache (as demais ficam no SQLite)
+CACHE_MAX_ENTRIES = int(os.getenv("GH_CACHE_ENTRIES", 1024))
+
+# Destino padrão dos backups de pré-deleção (ver download_archive)
+DEFAULT_BACKUP_DIR = os.path.join(
+    os.path.expanduser("~"), ".local", "share", "supergithub", "backups"
+)
+
+# Extensão e assinatura (primeiros bytes) de cada formato de arquivo
+ARCHIVE_FORMATS = {"tarball": (".tar.gz", b"\x1f\x8b"), "zipball": (".zip", b"PK")}
+
+
+# Campos de repositório buscados em massa via GraphQL (ver iter_repos_graphql)
+_GRAPHQL_REPO_FIELDS = """
+  nodes {
+    name
+    nameWithOwner
+    owner { login }
+    description
+    url
+    homepageUrl
+    isArchived
+    isFork
+    visibility
+    stargazerCount
+    forkCount
+    primaryLanguage { name }
+    defaultBranchRef { name }
+    createdAt
+    updatedAt
+    pushedAt
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+  }
+  pageInfo { hasNextPage endCursor }
+"""
+
+_GRAPHQL_VIEWER_REPOS = """
+query($first: Int!, $after: String) {
+  viewer {
+    repositories(
+      first: $first
+      after: $after
+      ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {""" + _GRAPHQL_REPO_FIELDS + "}\n  }\n}"
+
+_GRAPHQL_OWNER_REPOS = """
+query($login: String!, $first: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(
+      first: $first
+      after: $after
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {""" + _GRAPHQL_REPO_FIELDS + "}\n  }\n}"
+
+
+def _graphql_repo_to_rest(node: Dict) -> Dict:
+    """Converte um nó Repository do GraphQL para o formato da API REST"""
+    return {
+        "name": node["name"],
+        "full_name": node["nameWithOwner"],
+        "owner": {"login": node["owner"]["login"]},
+        "description": node["description"],
+        "html_url": node["url"],
+        "homepage": node["homepageUrl"],
+        "archived": node["isArchived"],
+        "fork": node["isFork"],
+        "private": node["visibility"] != "PUBLIC",
+        "visibility": node["visibility"].lower(),
+        "stargazers_count": node["stargazerCount"],
+        "forks_count": node["forkCount"],
+        "language": (node["primaryLanguage"] or {}).get("name"),
+        "default_branch": (node["defaultBranchRef"] or {}).get("name"),
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "pushed_at": node["pushedAt"],
+        "topics": [t["topic"]["name"] for t in node["repositoryTopics"]["nodes"]],
+    }
+
 
 class Visibility(Enum):
     """Enum para visibilidade de repositórios"""
@@ -36,17 +139,1318 @@ class RepoConfig:
     default_branch: str = "main"
 
 
+class RateLimiter:
+    """
+    Agendador de requisições ciente dos limites da API do GitHub
+
+    Combina três mecanismos, compartilhados por todas as threads (e por todos
+    os gerenciadores que usam o mesmo token):
+    - Limite primário: acompanha X-RateLimit-Remaining/Reset e, quando o
+      orçamento acaba, segura novas requisições até o reset
+    - Limite secundário: token bucket em "pontos por minuto" (GET = 1,
+      mutações = 5), como documentado pelo GitHub
+    - Back-off: respeita Retry-After e pausa em respostas 403/429 de limite
+    """
+
+    _registry: Dict[str, "RateLimiter"] = {}
+    _registry_lock = threading.Lock()
+
+    WRITE_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
+
+    def __init__(
+        self,
+        points_per_minute: int = 900,
+        burst: int = 60,
+        reserve: int = 0,
+        secondary_backoff: float = 60,
+        max_wait: float = 900,
+        max_attempts: int = 5,
+    ):
+        """
+        Args:
+            points_per_minute: Vazão sustentada do token bucket
+            burst: Pontos disponíveis de imediato (capacidade do bucket)
+            reserve: Requisições do limite primário mantidas em reserva
+            secondary_backoff: Pausa inicial (s) no limite secundário sem Retry-After
+            max_wait: Pausa máxima (s); acima disso a resposta de erro é devolvida
+            max_attempts: Tentativas por requisição ao esbarrar no limite
+        """
+        self.rate = points_per_minute / 60
+        self.burst = burst
+        self.reserve = reserve
+        self.secondary_backoff = secondary_backoff
+        self.max_wait = max_wait
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._secondary_hits = 0
+
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch (X-RateLimit-Reset)
+        self.resource: Optional[str] = None
+        self.throttled = 0
+
+    @classmethod
+    def for_token(cls, token: str, resource: str = "core") -> "RateLimiter":
+        """Instância compartilhada por token e recurso (core, graphql, ...)"""
+        key = f"{hashlib.sha256(token.encode()).hexdigest()} {resource}"
+        with cls._registry_lock:
+            if key not in cls._registry:
+                # GraphQL tem limite secundário próprio de 2000 pontos/minuto
+                points = 2000 if resource == "graphql" else 900
+                cls._registry[key] = cls(points_per_minute=points)
+            return cls._registry[key]
+
+    def try_acquire(self, method: str = "GET") -> float:
+        """
+        Tenta reservar a requisição sem bloquear
+
+        Returns:
+            0 se a requisição pode ser enviada, senão segundos até tentar de novo
+        """
+        cost = 5 if method.upper() in self.WRITE_METHODS else 1
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled_at) * self.rate
+            )
+            self._refilled_at = now
+
+            wait = self._blocked_until - now
+            if wait <= 0 and self.remaining is not None:
+                if self.remaining <= self.reserve and self.reset_at:
+                    wait = self.reset_at - time.time() + 1
+            if wait <= 0:
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    return 0
+                wait = (cost - self._tokens) / self.rate
+            self.throttled += 1
+            return min(wait, self.max_wait)
+
+    def acquire(self, method: str = "GET"):
+        """Bloqueia até a requisição poder ser enviada"""
+        while True:
+            wait = self.try_acquire(method)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def update(self, response: requests.Response):
+        """Atualiza o orçamento a partir dos headers X-RateLimit-*"""
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        with self._lock:
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+            self.limit = int(headers.get("X-RateLimit-Limit", self.limit or 0))
+            self.reset_at = float(headers.get("X-RateLimit-Reset", self.reset_at or 0))
+            self.resource = headers.get("X-RateLimit-Resource", self.resource)
+            if response.status_code < 400:
+                self._secondary_hits = 0
+
+    def backoff_delay(self, response: requests.Response) -> Optional[float]:
+        """Segundos a esperar se a resposta indica limite atingido (None = não)"""
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            return float(retry_after)
+
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = float(response.headers.get("X-RateLimit-Reset", time.time()))
+            return max(reset - time.time(), 0) + 1
+
+        if response.status_code == 429 or "rate limit" in response.text.lower():
+            with self._lock:
+                self._secondary_hits += 1
+                return self.secondary_backoff * 2 ** (self._secondary_hits - 1)
+
+        return None
+
+    def pause(self, seconds: float):
+        """Segura todas as requisições deste token pelos próximos N segundos"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def budget(self) -> Dict[str, Any]:
+        """Orçamento atual conhecido do token"""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "resource": self.resource,
+                "paused_for": max(self._blocked_until - time.monotonic(), 0),
+                "throttled": self.throttled,
+            }
+
+
+class ResponseCache:
+    """
+    Cache HTTP de requisições GET condicionais (ETag/Last-Modified)
+
+    Guarda o corpo das respostas em memória (LRU de até max_entries) e,
+    opcionalmente, em um arquivo SQLite. Cada GET é revalidado com If-None-Match/If-Modified-Since; um 304
+    (que não consome rate limit) é servido com o corpo em cache.
+    """
+
+    # Headers da resposta original preservados no cache (Link = paginação)
+    KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+    def __init__(
+        self, path: Optional[str] = None, max_entries: int = CACHE_MAX_ENTRIES
+    ):
+        """
+        Args:
+            path: Arquivo SQLite para persistir o cache (None = só memória)
+            max_entries: Respostas mantidas em memória; as menos usadas saem
+                (e voltam do SQLite, se houver, quando pedidas de novo)
+        """
+        self.path = path
+        self.max_entries = max(max_entries, 0)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._db = None
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, headers TEXT NOT NULL, body BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(token: str, url: str, params: Optional[Dict]) -> str:
+        """Chave por token (o GitHub varia a resposta por Authorization) e URL"""
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        raw = f"{hashlib.sha256(token.encode()).hexdigest()[:16]} {url} {query}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Entrada em cache ({"headers", "body"}) ou None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT headers, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = {"headers": json.loads(row[0]), "body": row[1]}
+                    self._remember(key, entry)
+            return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Põe a entrada no fim do LRU e descarta as mais antigas (com o lock)"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def conditional_headers(
+        self, key: str, entry: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """Headers If-None-Match/If-Modified-Since para revalidar a entrada"""
+        entry = entry or self.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if "ETag" in entry["headers"]:
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if "Last-Modified" in entry["headers"]:
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def store(self, key: str, response: requests.Response):
+        """Conta um miss e guarda a resposta 200 se tiver ETag/Last-Modified"""
+        headers = {
+            h: response.headers[h] for h in self.KEPT_HEADERS if h in response.headers
+        }
+        with self._lock:
+            self.misses += 1
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+
+        entry = {"headers": headers, "body": response.content}
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, headers, body) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(headers), entry["body"]),
+                )
+                self._db.commit()
+
+    def revive(
+        self,
+        key: str,
+        response: requests.Response,
+        entry: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response:
+        """
+        Transforma um 304 na resposta 200 em cache
+
+        Passe a entrada usada em conditional_headers: ela pode ter saído do
+        LRU enquanto a requisição estava no ar.
+        """
+        entry = entry or self.get(key)
+        if entry is None:
+            return response
+        with self._lock:
+            self.hits += 1
+            self._remember(key, entry)
+        response.status_code = 200
+        response.reason = "OK (cache)"
+        response._content = entry["body"]
+        response.headers.update(entry["headers"])
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits (304 servidos do cache), misses e taxa de acerto"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._memory),
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def close(self):
+        """Fecha o arquivo SQLite, se houver"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CassetteMiss(requests.RequestException):
+    """Requisição sem interação correspondente no cassete (modo replay)"""
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    Transporte que grava interações com a API em um cassete e as reproduz
+
+    - record: envia de verdade (pool/retries do HTTPAdapter) e grava método,
+      URL, corpo, resposta e latência; o cassete (JSON + gzip) é salvo em
+      close(). O header Authorization nunca é gravado.
+    - replay: responde a partir do cassete, sem rede, esperando a latência
+      original multiplicada por time_scale (0 = instantâneo). Requisições
+      iguais são servidas na ordem gravada; uma requisição que não está no
+      cassete levanta CassetteMiss (ex: N+1 introduzido por código novo).
+
+    stats() compara a execução com a gravação: requisições por endpoint,
+    misses e interações gravadas que não foram usadas.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self, path: str, mode: str = "replay", time_scale: float = 1.0, **kwargs
+    ):
+        """
+        Args:
+            path: Arquivo do cassete (.json.gz)
+            mode: "record" ou "replay"
+            time_scale: Fator aplicado à latência gravada no replay
+            **kwargs: Repassados ao HTTPAdapter (pool, max_retries)
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Modo de cassete inválido: {mode} (use record/replay)")
+        super().__init__(**kwargs)
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._queues: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[str, int] = {}
+        self._misses: List[str] = []
+
+        if mode == "replay":
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                cassette = json.load(f)
+            self._interactions = cassette["interactions"]
+            for interaction in self._interactions:
+                self._queues.setdefault(interaction["key"], []).append(interaction)
+
+    @staticmethod
+    def _key(request: requests.PreparedRequest) -> str:
+        """
+        Identifica a requisição por método, caminho + query e hash do corpo
+
+        O host fica de fora: um cassete gravado contra o simulador ou um
+        GitHub Enterprise reproduz com qualquer base_url.
+        """
+        url = urlparse(request.url)
+        target = f"{url.path}?{url.query}" if url.query else url.path
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        digest = hashlib.sha256(body).hexdigest()[:16] if body else "-"
+        return f"{request.method} {target} {digest}"
+
+    @staticmethod
+    def _endpoint(key: str) -> str:
+        """Método + caminho (sem query) para agregação"""
+        method, target, _ = key.split(" ")
+        return f"{method} {target.split('?')[0]}"
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = self._key(request)
+        if self.mode == "record":
+            start = time.perf_counter()
+            response = super().send(request, **kwargs)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._interactions.append(
+                    {
+                        "key": key,
+                        "status": response.status_code,
+                        "reason": response.reason,
+                        "headers": dict(response.headers),
+                        "body": base64.b64encode(response.content).decode(),
+                        "elapsed": elapsed,
+                    }
+                )
+                self._served[key] = self._served.get(key, 0) + 1
+            return response
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                self._misses.append(key)
+                raise CassetteMiss(
+                    f"Cassete {self.path} não tem (mais) respostas para {key}",
+                    request=request,
+                )
+            interaction = queue.pop(0)
+            self._served[key] = self._served.get(key, 0) + 1
+
+        if self.time_scale:
+            time.sleep(interaction["elapsed"] * self.time_scale)
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers.update(interaction["headers"])
+        response._content = base64.b64decode(interaction["body"])
+        response.url = request.url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(seconds=interaction["elapsed"])
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Requisições por endpoint, latência gravada, misses e não usadas"""
+        with self._lock:
+            by_endpoint: Dict[str, int] = {}
+            for key, count in self._served.items():
+                endpoint = self._endpoint(key)
+                by_endpoint[endpoint] = by_endpoint.get(endpoint, 0) + count
+            return {
+                "mode": self.mode,
+                "requests": sum(self._served.values()),
+                "by_endpoint": by_endpoint,
+                "recorded": len(self._interactions),
+                "recorded_latency": sum(i["elapsed"] for i in self._interactions),
+                "misses": list(self._misses),
+                "unused": sum(len(queue) for queue in self._queues.values()),
+            }
+
+    def close(self):
+        """Fecha o pool e, no modo record, salva o cassete"""
+        super().close()
+        if self.mode != "record":
+            return
+        with self._lock:
+            cassette = {"version": self.VERSION, "interactions": self._interactions}
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with gzip.open(self.path, "wt", encoding="utf-8") as f:
+                json.dump(cassette, f)
+
+
+class BandwidthLimiter:
+    """
+    Limite de banda (bytes/s) compartilhado por vários downloads
+
+    Balde de tokens em bytes: cada bloco recebido é debitado e, se o saldo
+    fica negativo, quem leu espera o tempo que a dívida leva para ser paga.
+    """
+
+    def __init__(self, bytes_per_second: float, burst: Optional[float] = None):
+        """
+        Args:
+            bytes_per_second: Taxa sustentada somando todos os downloads
+            burst: Bytes acumuláveis em ociosidade (padrão: 1s de taxa)
+        """
+        self.rate = bytes_per_second
+        self.capacity = burst or bytes_per_second
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, size: int) -> float:
+        """Debita `size` bytes sem bloquear; devolve os segundos a esperar"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= size
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+
+    def consume(self, size: int):
+        """Debita `size` bytes, esperando se a taxa foi excedida"""
+        wait = self.reserve(size)
+        if wait:
+            time.sleep(wait)
+
+
+class BackupError(Exception):
+    """Backup ausente ou inválido (a deleção do repositório não prossegue)"""
+
+
+def _file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 de um arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_archive(path: str) -> Optional[str]:
+    """
+    Confere um backup contra o seu arquivo .sha256 (formato do sha256sum)
+
+    Returns:
+        O SHA-256 se o arquivo existe e confere; None caso contrário
+    """
+    try:
+        with open(f"{path}.sha256", encoding="utf-8") as f:
+            expected = f.read().split()[0]
+        actual = _file_sha256(path)
+    except (OSError, IndexError):
+        return None
+    return actual if actual == expected else None
+
+
+def archive_is_current(path: str, pushed_at: Optional[str]) -> bool:
+    """
+    Backup gravado depois do último push do repositório?
+
+    Sem data de push conhecida, o backup é considerado velho (baixar de novo
+    é o lado seguro antes de uma deleção).
+    """
+    if not pushed_at:
+        return False
+    try:
+        written = os.path.getmtime(path)
+    except OSError:
+        return False
+    pushed = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+    return written > pushed.timestamp()
+
+
+def _archive_target(
+    dest_dir: str, owner: str, repo: str, archive_format: str, ref: Optional[str]
+) -> tuple[str, str]:
+    """Caminho do backup em <dest_dir>/<owner>/ e endpoint que o gera"""
+    suffix = f"-{ref.replace('/', '-')}" if ref else ""
+    extension = ARCHIVE_FORMATS[archive_format][0]
+    endpoint = f"/repos/{owner}/{repo}/{archive_format}"
+    if ref:
+        endpoint += f"/{ref}"
+    return os.path.join(dest_dir, owner, f"{repo}{suffix}{extension}"), endpoint
+
+
+def _archive_result(path: str, sha256: str, size: int, reused: bool) -> Dict:
+    return {"path": path, "bytes": size, "sha256": sha256, "reused": reused}
+
+
+def _check_download(headers: Any, size: int, endpoint: str):
+    """Confere o corpo recebido (corpo curto vira erro de conexão: repetível)"""
+    # Content-Length só vale para o corpo sem Content-Encoding
+    expected = headers.get("Content-Length")
+    if expected and not headers.get("Content-Encoding") and int(expected) != size:
+        raise requests.ConnectionError(f"corpo incompleto: {size} de {expected} bytes")
+    if not size:
+        raise BackupError(f"{endpoint}: arquivo vazio")
+
+
+def _store_archive(
+    part: str, path: str, archive_format: str, digest: str, size: int, name: str
+) -> Dict:
+    """
+    Valida um download completo e o publica com o nome final
+
+    Confere a assinatura do formato e o SHA-256 relido do disco, grava o
+    <arquivo>.sha256 e só então renomeia; se algo falha, o .part é apagado.
+    """
+    magic = ARCHIVE_FORMATS[archive_format][1]
+    try:
+        with open(part, "rb") as f:
+            head = f.read(len(magic))
+        if head != magic:
+            raise BackupError(f"{name}: não é um {archive_format} válido")
+        if _file_sha256(part) != digest:
+            raise BackupError(f"{name}: checksum em disco diverge")
+    except BaseException:
+        _discard(part)
+        raise
+
+    with open(f"{path}.sha256", "w", encoding="utf-8") as f:
+        f.write(f"{digest}  {os.path.basename(path)}\n")
+    os.replace(part, path)
+    return _archive_result(path, digest, size, reused=False)
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class RetryBudget:
+    """Orçamento de retries compartilhado por todos os itens de um lote"""
+
+    def __init__(self, limit: Optional[int] = None):
+        """
+        Args:
+            limit: Retries permitidos no lote inteiro (None = sem limite)
+        """
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self) -> bool:
+        """Consome um retry; False se o orçamento acabou"""
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+
+@dataclass
+class RetryScope:
+    """Contexto de retry da operação atual (um item de lote)"""
+
+    budget: RetryBudget
+    retries: int = 0
+
+
+# Escopo ativo, definido por item em run_batch (contextvar: vale por thread/task)
+_retry_scope: ContextVar[Optional[RetryScope]] = ContextVar("retry_scope", default=None)
+
+
+class RetryPolicy:
+    """
+    Política de retry para falhas transitórias (5xx, conexão resetada, timeout)
+
+    Só requisições idempotentes são repetidas — repetir um POST de criação
+    pode duplicar o efeito. Falhas de conexão antes do envio são repetidas
+    pelo adapter (urllib3) para qualquer método. Entre tentativas, back-off
+    exponencial com jitter completo; em lotes, um RetryBudget limita o total
+    de retries para uma API fora do ar não multiplicar a carga.
+    """
+
+    RETRY_STATUSES = {500, 502, 503, 504}
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    # Campos que tornam um PATCH não idempotente (renomear muda a URL)
+    NON_IDEMPOTENT_FIELDS = {"name"}
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        batch_ratio: float = 0.1,
+        min_batch_budget: int = 10,
+    ):
+        """
+        Args:
+            max_attempts: Tentativas por requisição (1 = sem retry)
+            backoff: Pausa base (s), dobrada a cada tentativa
+            max_backoff: Pausa máxima (s) entre tentativas
+            batch_ratio: Retries por item no orçamento de um lote
+            min_batch_budget: Orçamento mínimo de retries por lote
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_ratio = batch_ratio
+        self.min_batch_budget = min_batch_budget
+
+    def is_idempotent(self, method: str, url: str, data: Optional[Dict]) -> bool:
+        """
+        Classifica a requisição
+
+        GET/PUT (ex: topics)/DELETE são idempotentes; PATCH também, desde que só
+        defina valores absolutos (archived, description, ...) e não renomeie;
+        POST só quando é consulta GraphQL (criação de repo não é).
+        """
+        method = method.upper()
+        if method in self.IDEMPOTENT_METHODS:
+            return True
+        if method == "PATCH":
+            return not self.NON_IDEMPOTENT_FIELDS & set(data or {})
+        if method == "POST" and url.endswith("/graphql"):
+            query = (data or {}).get("query", "").lstrip()
+            return not query.startswith("mutation")
+        return False
+
+    def is_transient(
+        self,
+        response: Optional[requests.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> bool:
+        """True para 5xx transitórios e falhas de conexão/timeout"""
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response is not None and response.status_code in self.RETRY_STATUSES
+
+    def next_delay(self, retries: int) -> Optional[float]:
+        """
+        Autoriza mais um retry e devolve a pausa (None = desistir)
+
+        Args:
+            retries: Retries já feitos nesta requisição
+        """
+        if retries + 1 >= self.max_attempts:
+            return None
+        scope = _retry_scope.get()
+        if scope is not None:
+            if not scope.budget.spend():
+                return None
+            scope.retries += 1
+        cap = min(self.max_backoff, self.backoff * 2**retries)
+        return random.uniform(0, cap)
+
+    def batch_budget(self, items: int) -> RetryBudget:
+        """Orçamento de retries para um lote de N itens"""
+        return RetryBudget(max(self.min_batch_budget, int(items * self.batch_ratio)))
+
+
+class _BatchTracker:
+    """
+    Resultados de um lote: sucessos, falhas, cancelados, retries e progresso
+
+    Mesma contabilidade para o run_batch síncrono (threads) e o assíncrono
+    (tasks); só o agendamento dos itens muda entre eles.
+    """
+
+    def __init__(
+        self,
+        retry_policy: "RetryPolicy",
+        total: int,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        self.budget = retry_policy.batch_budget(total)
+        self.total = total
+        self.progress = progress
+        self.results: Dict[str, Any] = {
+            "success": [],
+            "failed": [],
+            "cancelled": [],
+            "retries": {},
+            "retry_budget": {"limit": self.budget.limit, "used": 0},
+        }
+        self._lock = threading.Lock()
+
+    def scope(self) -> RetryScope:
+        """Escopo de retry de um item (debita do orçamento do lote)"""
+        return RetryScope(self.budget)
+
+    def retried(self, name: str, scope: RetryScope):
+        """Guarda quantos retries o item usou"""
+        if scope.retries:
+            with self._lock:
+                self.results["retries"][name] = scope.retries
+
+    def record(
+        self, name: str, result: Any = None, error: Optional[BaseException] = None
+    ):
+        """Registra o desfecho de um item (resultado _CANCELLED = cancelado)"""
+        results = self.results
+        with self._lock:
+            if error is None and result is _CANCELLED:
+                results["cancelled"].append(name)
+                return
+            if error is None:
+                results["success"].append(name)
+            else:
+                results["failed"].append({"repo": name, "error": str(error)})
+            done = len(results["success"]) + len(results["failed"])
+        if self.progress:
+            self.progress(done, self.total, name, None if error is None else str(error))
+
+    def finish(self) -> Dict[str, Any]:
+        """Resultados do lote, com o uso final do orçamento de retries"""
+        self.results["retry_budget"]["used"] = self.budget.used
+        return self.results
+
+
+# Caminhos com dono/repositório viram templates nas métricas (cardinalidade baixa)
+_ENDPOINT_TEMPLATES = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/users/[^/]+"), "/users/{username}"),
+    (re.compile(r"^/orgs/[^/]+"), "/orgs/{org}"),
+    (re.compile(r"/(tarball|zipball)/.+$"), r"/\1/{ref}"),
+]
+
+
+def template_endpoint(url: str) -> str:
+    """Caminho da URL com dono/repositório/ref substituídos por placeholders"""
+    path = urlparse(url).path or "/"
+    for pattern, template in _ENDPOINT_TEMPLATES:
+        path = pattern.sub(template, path, count=1)
+    return path
+
+
+@dataclass
+class RequestEvent:
+    """Evento estruturado emitido por requisição (ver GitHubRepoManager.sinks)"""
+
+    method: str
+    endpoint: str  # template, ex: /repos/{owner}/{repo}/topics
+    url: str
+    status: Optional[int]  # None = falha de transporte
+    latency: float  # segundos, incluindo retries e esperas de rate limit
+    bytes: int  # corpo recebido (0 em um 304)
+    retries: int
+    rate_remaining: Optional[int]
+    cached: bool  # 304 servido do cache
+    started_at: float  # epoch
+    error: Optional[str] = None
+
+    @classmethod
+    def build(
+        cls,
+        method: str,
+        url: str,
+        started_at: float,
+        latency: float,
+        response: Optional[requests.Response] = None,
+        received: int = 0,
+        retries: int = 0,
+        cached: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> "RequestEvent":
+        """Monta o evento a partir da resposta final (ou da exceção)"""
+        remaining = None
+        if response is not None:
+            header = response.headers.get("X-RateLimit-Remaining")
+            remaining = int(header) if header and header.isdigit() else None
+        return cls(
+            method=method.upper(),
+            endpoint=template_endpoint(url),
+            url=url,
+            status=response.status_code if response is not None else None,
+            latency=latency,
+            bytes=received,
+            retries=retries,
+            rate_remaining=remaining,
+            cached=cached,
+            started_at=started_at,
+            error=type(error).__name__ if error is not None else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class MetricsSummary:
+    """Sink em memória: histograma de latência e totais por endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[tuple, List[float]] = {}
+        self._totals: Dict[tuple, Dict[str, int]] = {}
+
+    def emit(self, event: RequestEvent):
+        key = (event.method, event.endpoint)
+        with self._lock:
+            self._latencies.setdefault(key, []).append(event.latency)
+            totals = self._totals.setdefault(
+                key, {"errors": 0, "bytes": 0, "retries": 0, "cached": 0}
+            )
+            totals["errors"] += event.status is None or event.status >= 400
+            totals["bytes"] += event.bytes
+            totals["retries"] += event.retries
+            totals["cached"] += event.cached
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _percentile(ordered: List[float], pct: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Linhas por endpoint (latências em ms), do maior tempo total ao menor"""
+        with self._lock:
+            rows = []
+            for key, latencies in self._latencies.items():
+                ordered = sorted(latencies)
+                rows.append(
+                    {
+                        "method": key[0],
+                        "endpoint": key[1],
+                        "count": len(ordered),
+                        "p50": self._percentile(ordered, 50) * 1000,
+                        "p90": self._percentile(ordered, 90) * 1000,
+                        "p99": self._percentile(ordered, 99) * 1000,
+                        "max": ordered[-1] * 1000,
+                        "total": sum(ordered),
+                        **self._totals[key],
+                    }
+                )
+        return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+    def format_table(self) -> str:
+        """Tabela de latência/percentis para imprimir no fim da execução"""
+        rows = self.summary()
+        if not rows:
+            return "Nenhuma requisição registrada"
+        lines = [
+            f"{'Endpoint':<40} {'N':>6} {'Erros':>5} {'p50 ms':>8} {'p90 ms':>8} "
+            f"{'p99 ms':>8} {'máx ms':>8} {'Total s':>8} {'KB':>8} {'Retry':>5}",
+            "-" * 110,
+        ]
+        for r in rows:
+            name = f"{r['method']} {r['endpoint']}"
+            lines.append(
+                f"{name:<40} {r['count']:>6} {r['errors']:>5} {r['p50']:>8.1f} "
+                f"{r['p90']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f} "
+                f"{r['total']:>8.2f} {r['bytes'] / 1024:>8.1f} {r['retries']:>5}"
+            )
+        return "\n".join(lines)
+
+
+class JsonlSink:
+    """Sink que grava um evento JSON por linha em um arquivo"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Arquivo JSONL (aberto em modo append)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, event: RequestEvent):
+        line = json.dumps(event.to_dict(), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class TracingSink:
+    """
+    Sink que transforma cada requisição em um span no estilo OpenTelemetry
+
+    Com o pacote opentelemetry instalado (e sem exporter próprio), os spans
+    vão para o tracer global configurado pela aplicação. Sem ele, os spans
+    são dicts com os atributos das convenções semânticas HTTP, entregues ao
+    exporter (se houver) e guardados em self.spans.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[Callable[[Dict[str, Any]], None]] = None,
+        service_name: str = "supergithub",
+    ):
+        """
+        Args:
+            exporter: Função chamada com cada span (dict)
+            service_name: Nome do tracer/serviço
+        """
+        self.exporter = exporter
+        self.service_name = service_name
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._tracer = None
+        if exporter is None:
+            try:
+                from opentelemetry import trace  # dependência opcional
+            except ImportError:
+                pass
+            else:
+                self._tracer = trace.get_tracer(service_name)
+
+    @staticmethod
+    def _attributes(event: RequestEvent) -> Dict[str, Any]:
+        attributes = {
+            "http.request.method": event.method,
+            "url.full": event.url,
+            "url.template": event.endpoint,
+            "http.response.body.size": event.bytes,
+            "http.request.resend_count": event.retries,
+            "github.cache_hit": event.cached,
+        }
+        if event.status is not None:
+            attributes["http.response.status_code"] = event.status
+        if event.rate_remaining is not None:
+            attributes["github.ratelimit.remaining"] = event.rate_remaining
+        if event.error:
+            attributes["error.type"] = event.error
+        return attributes
+
+    def emit(self, event: RequestEvent):
+        name = f"{event.method} {event.endpoint}"
+        start_ns = int(event.started_at * 1e9)
+        end_ns = start_ns + int(event.latency * 1e9)
+        failed = event.status is None or event.status >= 500
+        attributes = self._attributes(event)
+
+        if self._tracer is not None:
+            from opentelemetry.trace import SpanKind, Status, StatusCode
+
+            span = self._tracer.start_span(
+                name, kind=SpanKind.CLIENT, start_time=start_ns, attributes=attributes
+            )
+            if failed:
+                span.set_status(Status(StatusCode.ERROR, event.error))
+            span.end(end_time=end_ns)
+            return
+
+        span = {
+            "name": name,
+            "kind": "CLIENT",
+            "trace_id": os.urandom(16).hex(),
+            "span_id": os.urandom(8).hex(),
+            "start_time_unix_nano": start_ns,
+            "end_time_unix_nano": end_ns,
+            "status": "ERROR" if failed else "UNSET",
+            "attributes": attributes,
+            "resource": {"service.name": self.service_name},
+        }
+        with self._lock:
+            self.spans.append(span)
+        if self.exporter is not None:
+            self.exporter(span)
+
+    def close(self):
+        pass
+
+
+def _auth_cache_path() -> str:
+    """Arquivo do cache de logins (GH_AUTH_CACHE ou ~/.cache/supergithub)"""
+    return os.getenv("GH_AUTH_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "supergithub", "auth.json"
+    )
+
+
+def load_cached_login(token: str, ttl: Optional[float] = None) -> Optional[str]:
+    """
+    Login em cache para o token, se ainda dentro do TTL
+
+    Args:
+        token: Token de acesso (só o hash SHA-256 é gravado)
+        ttl: Validade em segundos (padrão: AUTH_TTL)
+
+    Returns:
+        Login ou None (sem cache, expirado ou arquivo ilegível)
+    """
+    ttl = AUTH_TTL if ttl is None else ttl
+    try:
+        with open(_auth_cache_path()) as f:
+            entry = json.load(f).get(hashlib.sha256(token.encode()).hexdigest())
+    except (OSError, ValueError):
+        return None
+    if not entry or time.time() - entry["cached_at"] > ttl:
+        return None
+    return entry["login"]
+
+
+def store_cached_login(token: str, login: str):
+    """Grava o login do token no cache em disco (falhas são ignoradas)"""
+    path = _auth_cache_path()
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        entries = {}
+
+    # Remove entradas expiradas para o arquivo não crescer indefinidamente
+    now = time.time()
+    entries = {k: v for k, v in entries.items() if now - v["cached_at"] <= AUTH_TTL}
+    entries[hashlib.sha256(token.encode()).hexdigest()] = {
+        "login": login,
+        "cached_at": now,
+    }
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def normalize_topics(topics: Iterable[str]) -> List[str]:
+    """Topics como a API os guarda: minúsculos, sem repetição, no máximo 20"""
+    normalized: List[str] = []
+    for topic in topics:
+        topic = topic.lower().strip()
+        if topic and topic not in normalized:
+            normalized.append(topic)
+    return normalized[:20]
+
+
+# Topics desejados de um repo, a partir do objeto da listagem (com "topics")
+TopicTarget = Callable[[Dict], Iterable[str]]
+
+
+def topic_changes(repos: Iterable[Dict], target: TopicTarget) -> Dict[str, List[str]]:
+    """
+    Calcula localmente os topics que mudam, sem requisições
+
+    Args:
+        repos: Repositórios da listagem (REST e GraphQL já trazem "topics")
+        target: Função repo -> topics desejados
+
+    Returns:
+        Dict "owner/repo" -> nova lista de topics, só para repos que mudam
+        (repos arquivados, read-only, e sem "topics" são ignorados)
+    """
+    changes = {}
+    for repo in repos:
+        current = repo.get("topics")
+        if current is None or repo.get("archived"):
+            continue
+        wanted = normalize_topics(target(repo))
+        if set(wanted) != set(current):
+            changes[repo["full_name"]] = wanted
+    return changes
+
+
+class _RequestFlow:
+    """
+    Política de uma requisição, sem I/O: cache condicional, rate limit,
+    retries de falhas transitórias e o RequestEvent final
+
+    Compartilhada pelos gerenciadores síncrono e assíncrono, que só enviam
+    e esperam (time.sleep ou asyncio.sleep) cada um do seu jeito:
+
+        flow = _RequestFlow(gh, method, endpoint, data, params)
+        while True:
+            while wait := flow.wait():
+                sleep(wait)
+            try:
+                response = send(flow.url, flow.headers)
+            except requests.RequestException as e:
+                delay = flow.failed(e)
+                if delay is None:
+                    raise
+                sleep(delay)
+                continue
+            delay = flow.retry_after(response)
+            if delay is None:
+                return flow.finish()
+            sleep(delay)  # depois de descartar a resposta
+    """
+
+    def __init__(
+        self,
+        gh: Any,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        stream: bool = False,
+    ):
+        """
+        Args:
+            gh: Gerenciador (base_url, token, limiters, cache, retry_policy, sinks)
+            method: Método HTTP
+            endpoint: Endpoint da API ou URL absoluta
+            data: Corpo JSON (decide a idempotência de PATCHes)
+            params: Parâmetros de query string (parte da chave do cache)
+            stream: Corpo não lido (downloads; sem cache)
+        """
+        self.gh = gh
+        self.method = method
+        self.url = (
+            endpoint if endpoint.startswith("http") else f"{gh.base_url}{endpoint}"
+        )
+        self.stream = stream
+        graphql = self.url.endswith("/graphql")
+        # Consultas GraphQL custam 1 ponto, apesar de serem POST
+        self.cost = "GET" if graphql else method
+        self.limiter = gh.graphql_limiter if graphql else gh.rate_limiter
+        self.idempotent = gh.retry_policy.is_idempotent(method, self.url, data)
+
+        # GETs são condicionais: um 304 é servido do cache
+        self.cache_key: Optional[str] = None
+        self.cache_entry: Optional[Dict[str, Any]] = None
+        self.headers: Optional[Dict] = None
+        if method.upper() == "GET" and not stream:
+            self.cache_key = ResponseCache.make_key(gh.token, self.url, params)
+            self.cache_entry = gh.cache.get(self.cache_key)
+            self.headers = gh.cache.conditional_headers(
+                self.cache_key, self.cache_entry
+            )
+
+        # Latência medida do primeiro envio à resposta final (com retries)
+        self.started_at, self.start = time.time(), time.perf_counter()
+        self.retries = self.limited = self.received = 0
+        self.cached = False
+        self.response: Optional[requests.Response] = None
+
+    def wait(self) -> float:
+        """Segundos a esperar antes do próximo envio (0 = pode enviar)"""
+        return self.limiter.try_acquire(self.cost)
+
+    def failed(self, error: requests.RequestException) -> Optional[float]:
+        """Pausa antes de repetir após uma falha de transporte (None = desistir)"""
+        delay = None
+        if self.idempotent and self.gh.retry_policy.is_transient(error=error):
+            delay = self.gh.retry_policy.next_delay(self.retries)
+        if delay is None:
+            self._emit(self.url, error=error)
+            return None
+        self.retries += 1
+        return delay
+
+    def retry_after(self, response: requests.Response) -> Optional[float]:
+        """
+        Pausa antes de reenviar após uma resposta (None = resposta final)
+
+        A resposta final fica em self.response (um 304 vira a do cache). Se
+        há pausa, o chamador descarta a resposta e envia de novo.
+        """
+        limiter = self.limiter
+        limiter.update(response)
+        self.received = 0 if self.stream else len(response.content)
+        self.response = response
+
+        if self.cache_key is not None:
+            if response.status_code == 304:
+                self.response = self.gh.cache.revive(
+                    self.cache_key, response, self.cache_entry
+                )
+                self.cached = True
+                return None
+            if response.status_code == 200:
+                self.gh.cache.store(self.cache_key, response)
+
+        # Limite atingido: pausa o token inteiro (wait() cobre a espera)
+        delay = limiter.backoff_delay(response)
+        if delay is not None and delay <= limiter.max_wait:
+            self.limited += 1
+            if self.limited >= limiter.max_attempts:
+                return None
+            limiter.pause(delay)
+            return 0.0
+
+        # Falha transitória (5xx): repete só o que é seguro repetir
+        if self.idempotent and self.gh.retry_policy.is_transient(response=response):
+            delay = self.gh.retry_policy.next_delay(self.retries)
+            if delay is not None:
+                self.retries += 1
+                return delay
+        return None
+
+    def finish(self) -> requests.Response:
+        """Resposta final, com o atributo `retries` e o evento emitido"""
+        response = self.response
+        response.retries = self.retries
+        # Downloads redirecionam para URLs assinadas: vale o endpoint
+        self._emit(self.url if self.stream else response.url or self.url)
+        return response
+
+    def _emit(self, url: str, error: Optional[BaseException] = None):
+        if not self.gh.sinks:
+            return
+        latency = time.perf_counter() - self.start
+        if error is not None:
+            event = RequestEvent.build(
+                self.method,
+                url,
+                self.started_at,
+                latency,
+                retries=self.retries,
+                error=error,
+            )
+        else:
+            event = RequestEvent.build(
+                self.method,
+                url,
+                self.started_at,
+                latency,
+                self.response,
+                self.received,
+                self.retries,
+                self.cached,
+            )
+        self.gh._emit(event)
+
+
 class GitHubRepoManager:
     """Gerenciador de repositórios GitHub via API REST"""
 
     BASE_URL = "https://api.github.com"
+    BATCH_WORKERS = 8
+    # Downloads de backup simultâneos (cada um segura uma conexão longa)
+    BACKUP_WORKERS = 4
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        timeout: float = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[HTTPAdapter] = None,
+        sinks: Optional[List[Any]] = None,
+    ):
         """
         Inicializa o gerenciador
 
         Args:
             token: GitHub Personal Access Token (ou usa GH_TOKEN do ambiente)
+            pool_size: Conexões keep-alive mantidas no pool
+            max_retries: Retries de conexão (requisição ainda não enviada)
+            timeout: Timeout de cada requisição em segundos
+            rate_limiter: Agendador de limites (padrão: compartilhado por token)
+            cache: Cache de GETs condicionais (padrão: memória, ou SQLite em
+                GH_CACHE_DB se definido)
+            retry_policy: Retries de falhas transitórias (5xx, reset, timeout)
+            base_url: URL da API (padrão: GH_API_URL ou BASE_URL; ex: GitHub
+                Enterprise ou o simulador local github_simulator.py)
+            transport: Adapter HTTP a montar nas sessões (ex: CassetteAdapter;
+                padrão: pool próprio, ou cassete se GH_CASSETTE estiver definido)
+            sinks: Destinos dos RequestEvent de cada requisição (objetos com
+                emit/close: MetricsSummary, JsonlSink, TracingSink; GH_METRICS_JSONL
+                acrescenta um JsonlSink)
         """
         self.token = token or os.getenv("GH_TOKEN")
         if not self.token:
@@ -54,57 +1458,250 @@ class GitHubRepoManager:
                 "GH_TOKEN não encontrado. Configure a variável de ambiente ou passe o token."
             )
 
+        base_url = base_url or os.getenv("GH_API_URL") or self.BASE_URL
+        self.base_url = base_url.rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
         }
+        self.timeout = timeout
+
+        # Pool de conexões compartilhado; cada thread usa sua própria Session
+        # sobre o mesmo adapter (o pool do urllib3 é thread-safe)
+        adapter_options = dict(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            # Leitura/5xx ficam com a RetryPolicy, que conhece a idempotência
+            max_retries=Retry(
+                total=max_retries,
+                connect=max_retries,
+                read=0,
+                status=0,
+                backoff_factor=0.3,
+                raise_on_status=False,
+            ),
+        )
+        cassette = os.getenv("GH_CASSETTE")
+        if transport is not None:
+            self._adapter = transport
+        elif cassette:
+            # Gravação/replay offline (ver CassetteAdapter)
+            self._adapter = CassetteAdapter(
+                cassette,
+                mode=os.getenv("GH_CASSETTE_MODE", "replay"),
+                time_scale=float(os.getenv("GH_CASSETTE_SPEED", "1")),
+                **adapter_options,
+            )
+        else:
+            self._adapter = HTTPAdapter(**adapter_options)
+        self._local = threading.local()
+        self.rate_limiter = rate_limiter or RateLimiter.for_token(self.token)
+        self.graphql_limiter = RateLimiter.for_token(self.token, "graphql")
+        self.cache = cache or ResponseCache(os.getenv("GH_CACHE_DB"))
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.sinks = list(sinks or [])
+        if os.getenv("GH_METRICS_JSONL"):
+            self.sinks.append(JsonlSink(os.environ["GH_METRICS_JSONL"]))
+
+        # Usuário autenticado resolvido só no primeiro acesso a self.user
+        self._user: Optional[str] = None
+        # Donos já identificados como "org" ou "user" (ver iter_owner_repos)
+        self._owner_kinds: Dict[str, str] = {}
+
+    # ==================== SESSÃO HTTP ====================
+
+    @property
+    def session(self) -> requests.Session:
+        """Session da thread atual, ligada ao pool de conexões compartilhado"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            self._local.session = session
+        return session
+
+    def close(self):
+        """Fecha as conexões keep-alive do pool, o cache em disco e os sinks"""
+        self._adapter.close()
+        self.cache.close()
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self) -> "GitHubRepoManager":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def user(self) -> str:
+        """
+        Login do usuário autenticado
 
-        # Valida token e obtém usuário autenticado
-        self.user = self._get_authenticated_user()
+        Resolvido no primeiro acesso (valida o token via /user) e guardado em
+        disco por hash do token, por AUTH_TTL segundos: execuções seguintes
+        não fazem a chamada.
+        """
+        if self._user is None:
+            self._user = load_cached_login(self.token)
+        if self._user is None:
+            self._user = self._get_authenticated_user()
+            store_cached_login(self.token, self._user)
+        return self._user
 
     def _get_authenticated_user(self) -> str:
         """Obtém o usuário autenticado"""
-        response = requests.get(
-            f"{self.BASE_URL}/user", headers=self.headers, timeout=10
-        )
+        response = self._make_request("GET", "/user")
         response.raise_for_status()
         return response.json()["login"]
 
+    def transport_stats(self) -> Optional[Dict[str, Any]]:
+        """Estatísticas do cassete em uso (None sem gravação/replay)"""
+        stats = getattr(self._adapter, "stats", None)
+        return stats() if stats else None
+
+    def _emit(self, event: RequestEvent):
+        """Entrega o evento da requisição a todos os sinks"""
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def rate_limit_budget(self, resource: str = "core") -> Dict[str, Any]:
+        """Orçamento de rate limit conhecido (limit, remaining, reset_at, ...)"""
+        limiter = self.graphql_limiter if resource == "graphql" else self.rate_limiter
+        return limiter.budget()
+
     def _make_request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
+        stream: bool = False,
     ) -> requests.Response:
         """
         Faz requisição à API do GitHub
 
         Args:
             method: Método HTTP (GET, POST, PATCH, DELETE)
-            endpoint: Endpoint da API (ex: /repos/owner/repo)
+            endpoint: Endpoint da API (ex: /repos/owner/repo) ou URL absoluta
             data: Dados JSON para enviar
             params: Parâmetros de query string
+            stream: Não ler o corpo (downloads; sem cache; o chamador fecha)
 
         Returns:
-            Response object
+            Response object (com o atributo `retries`)
+        """
+        flow = _RequestFlow(self, method, endpoint, data, params, stream)
+        while True:
+            while wait := flow.wait():
+                time.sleep(wait)
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=flow.url,
+                    json=data,
+                    params=params,
+                    headers=flow.headers,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+            except requests.RequestException as e:
+                delay = flow.failed(e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            delay = flow.retry_after(response)
+            if delay is None:
+                return flow.finish()
+            response.close()
+            time.sleep(delay)
+
+    def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        items_key: Optional[str] = None,
+    ) -> Iterator[Dict]:
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        Itera sobre todos os itens de um endpoint paginado
 
-        response = requests.request(
-            method=method,
-            url=url,
-            headers=self.headers,
-            json=data,
-            params=params,
-            timeout=10,
-        )
+        Segue o header Link (rel="next") e busca a próxima página em
+        background enquanto o chamador processa a atual.
 
-        return response
+        Args:
+            endpoint: Endpoint da API (ex: /user/repos)
+            params: Parâmetros da primeira página
+            items_key: Chave da lista no JSON (None = resposta já é a lista)
+
+        Yields:
+            Itens de cada página, à medida que chegam
+        """
+        prefetch = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = prefetch.submit(self._make_request, "GET", endpoint, None, params)
+            while future is not None:
+                response = future.result()
+                response.raise_for_status()
+
+                next_url = response.links.get("next", {}).get("url")
+                future = (
+                    prefetch.submit(self._make_request, "GET", next_url)
+                    if next_url
+                    else None
+                )
+
+                page = response.json()
+                yield from page[items_key] if items_key else page
+        finally:
+            prefetch.shutdown(wait=False, cancel_futures=True)
+
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """
+        Executa uma consulta GraphQL
+
+        Args:
+            query: Documento GraphQL
+            variables: Variáveis da consulta
+
+        Returns:
+            Campo "data" da resposta
+
+        Raises:
+            requests.HTTPError: Erro HTTP ou erros GraphQL na resposta
+        """
+        response = self._make_request(
+            "POST", "/graphql", data={"query": query, "variables": variables or {}}
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(e.get("message", "") for e in payload["errors"])
+            raise requests.HTTPError(f"GraphQL: {messages}", response=response)
+        return payload["data"]
 
     # ==================== OPERAÇÕES DE LEITURA ====================
 
+    def _repos_query(
+        self, username: Optional[str], type_filter: str, sort: str, per_page: int
+    ) -> tuple[str, Dict]:
+        """Monta endpoint e parâmetros da listagem de repositórios"""
+        if username:
+            endpoint = f"/users/{username}/repos"
+            params = {"type": type_filter, "sort": sort, "per_page": per_page}
+        else:
+            endpoint = "/user/repos"
+            # Affiliation/Visibility mapping for /user/repos
+            if type_filter in ["all", "public", "private"]:
+                params = {"visibility": type_filter, "sort": sort, "per_page": per_page}
+            else:
+                params = {"type": type_filter, "sort": sort, "per_page": per_page}
+        return endpoint, params
+
     def list_repos(
         self,
         username: Optional[str] = None,
@@ -122,23 +1719,186 @@ class GitHubRepoManager:
             per_page: Resultados por página
 
         Returns:
-            Lista de repositórios
+            Lista de repositórios (apenas a primeira página)
         """
-        if username:
-            endpoint = f"/users/{username}/repos"
-            params = {"type": type_filter, "sort": sort, "per_page": per_page}
-        else:
-            endpoint = "/user/repos"
-            # Affiliation/Visibility mapping for /user/repos
-            if type_filter in ["all", "public", "private"]:
-                params = {"visibility": type_filter, "sort": sort, "per_page": per_page}
-            else:
-                params = {"type": type_filter, "sort": sort, "per_page": per_page}
-
+        endpoint, params = self._repos_query(username, type_filter, sort, per_page)
         response = self._make_request("GET", endpoint, params=params)
         response.raise_for_status()
         return response.json()
 
+    def iter_repos(
+        self,
+        username: Optional[str] = None,
+        type_filter: str = "all",
+        sort: str = "updated",
+        per_page: int = 100,
+    ) -> Iterator[Dict]:
+        """
+        Itera sobre todos os repositórios, página a página
+
+        Args:
+            username: Usuário (None = usuário autenticado)
+            type_filter: Filtro (all, owner, public, private, member)
+            sort: Ordenação (created, updated, pushed, full_name)
+            per_page: Resultados por página (máx 100)
+
+        Yields:
+            Repositórios à medida que as páginas chegam
+        """
+        endpoint, params = self._repos_query(username, type_filter, sort, per_page)
+        return self.paginate(endpoint, params)
+
+    def iter_repos_graphql(
+        self, owner: Optional[str] = None, page_size: int = 100
+    ) -> Iterator[Dict]:
+        """
+        Itera sobre repositórios com topics via GraphQL (100 por requisição)
+
+        Substitui a listagem REST + uma chamada /topics por repositório. Os
+        itens têm o mesmo formato da API REST (name, full_name, archived,
+        private, stargazers_count, forks_count, language, pushed_at,
+        updated_at, ...) e incluem "topics".
+
+        Args:
+            owner: Usuário ou organização (None = repos do usuário autenticado,
+                como em /user/repos)
+            page_size: Repositórios por página (máx 100)
+
+        Yields:
+            Repositórios no formato REST
+        """
+        if owner:
+            query = _GRAPHQL_OWNER_REPOS
+            path = ("repositoryOwner", "repositories")
+        else:
+            query = _GRAPHQL_VIEWER_REPOS
+            path = ("viewer", "repositories")
+
+        variables = {"first": page_size, "after": None}
+        if owner:
+            variables["login"] = owner
+        while True:
+            data = self.graphql(query, variables)
+            if data.get(path[0]) is None:
+                raise requests.HTTPError(f"GraphQL: owner '{owner}' não encontrado")
+            connection = data[path[0]][path[1]]
+
+            for node in connection["nodes"]:
+                yield _graphql_repo_to_rest(node)
+
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            variables["after"] = connection["pageInfo"]["endCursor"]
+
+    def iter_org_repos(
+        self,
+        org: str,
+        type_filter: str = "all",
+        sort: str = "updated",
+        per_page: int = 100,
+    ) -> Iterator[Dict]:
+        """
+        Itera sobre todos os repositórios de uma organização
+
+        Args:
+            org: Organização
+            type_filter: Filtro (all, public, private, forks, sources, member)
+            sort: Ordenação (created, updated, pushed, full_name)
+            per_page: Resultados por página (máx 100)
+
+        Yields:
+            Repositórios à medida que as páginas chegam
+        """
+        params = {"type": type_filter, "sort": sort, "per_page": per_page}
+        return self.paginate(f"/orgs/{org}/repos", params)
+
+    def iter_owner_repos(
+        self,
+        owner: str,
+        type_filter: str = "all",
+        sort: str = "updated",
+        per_page: int = 100,
+    ) -> Iterator[Dict]:
+        """
+        Itera sobre os repositórios de um usuário ou organização
+
+        Tenta /orgs/{owner}/repos (que inclui os privados da org) e, se o
+        dono não for uma organização (404), usa /users/{owner}/repos. O tipo
+        descoberto fica guardado: o 404 é pago uma vez por dono.
+        """
+        if self._owner_kinds.get(owner) != "user":
+            try:
+                started = False
+                for repo in self.iter_org_repos(owner, type_filter, sort, per_page):
+                    started = True
+                    yield repo
+                self._owner_kinds[owner] = "org"
+                return
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if started or status != 404:
+                    raise
+                self._owner_kinds[owner] = "user"
+
+        yield from self.iter_repos(owner, type_filter, sort, per_page)
+
+    def scan_owners(
+        self,
+        owners: List[str],
+        type_filter: str = "all",
+        use_graphql: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lista os repositórios de vários usuários/organizações em paralelo
+
+        Todas as listagens passam pelo mesmo RateLimiter do token (orçamento
+        global compartilhado). Cada dono é entregue assim que termina, sem
+        esperar o mais lento.
+
+        Args:
+            owners: Usuários e/ou organizações
+            type_filter: Filtro de tipo (listagem REST)
+            use_graphql: Listar via GraphQL (100 repos com topics por requisição)
+            max_workers: Donos listados ao mesmo tempo (padrão: BATCH_WORKERS)
+
+        Yields:
+            Dict com owner, repos, seconds e error (None ou a mensagem), na
+            ordem em que os donos terminam
+        """
+
+        def scan(owner: str) -> tuple[List[Dict], float]:
+            start = time.perf_counter()
+            if use_graphql:
+                repos = list(self.iter_repos_graphql(owner))
+            else:
+                repos = list(self.iter_owner_repos(owner, type_filter))
+            return repos, time.perf_counter() - start
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or self.BATCH_WORKERS)
+        futures = {executor.submit(scan, owner): owner for owner in owners}
+        try:
+            for future in as_completed(futures):
+                owner = futures[future]
+                try:
+                    repos, seconds = future.result()
+                except Exception as e:
+                    yield {
+                        "owner": owner,
+                        "repos": [],
+                        "seconds": None,
+                        "error": str(e),
+                    }
+                else:
+                    yield {
+                        "owner": owner,
+                        "repos": repos,
+                        "seconds": seconds,
+                        "error": None,
+                    }
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def get_repo(self, owner: str, repo: str) -> Dict:
         """
         Obtém detalhes de um repositório
@@ -213,12 +1973,120 @@ class GitHubRepoManager:
 
         response = self._make_request("DELETE", f"/repos/{owner}/{repo}")
 
-        if response.status_code == 204:
+        # 404 após retry: a tentativa anterior apagou, mas a resposta se perdeu
+        if response.status_code == 204 or (
+            response.status_code == 404 and response.retries
+        ):
             return True
 
         response.raise_for_status()
         return False
 
+    def download_archive(
+        self,
+        owner: str,
+        repo: str,
+        dest_dir: str,
+        archive_format: str = "tarball",
+        ref: Optional[str] = None,
+        bandwidth: Optional[BandwidthLimiter] = None,
+        chunk_size: int = 1 << 16,
+        pushed_at: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Baixa o arquivo (tarball/zipball) de um repositório, em blocos
+
+        O corpo vai direto para disco (nunca inteiro em memória) e é validado
+        antes de ganhar o nome final: tamanho contra o Content-Length,
+        assinatura do formato e SHA-256 relido do disco. Ao lado fica um
+        <arquivo>.sha256 (formato do sha256sum); um backup já existente só é
+        reaproveitado se confere com ele e foi gravado depois do último push.
+
+        Args:
+            owner: Dono do repositório
+            repo: Nome do repositório
+            dest_dir: Diretório dos backups (arquivo em <dest_dir>/<owner>/)
+            archive_format: tarball (.tar.gz) ou zipball (.zip)
+            ref: Branch, tag ou commit (padrão: branch padrão)
+            bandwidth: Limite de banda compartilhado entre downloads
+            chunk_size: Tamanho dos blocos lidos da rede
+            pushed_at: Último push do repo (padrão: consultado só se já
+                houver um backup verificado)
+
+        Returns:
+            Dict com path, bytes, sha256 e reused
+
+        Raises:
+            BackupError: Download incompleto ou arquivo inválido
+            requests.HTTPError: Erro HTTP (ex: 404 de repositório vazio)
+        """
+        path, endpoint = _archive_target(dest_dir, owner, repo, archive_format, ref)
+
+        checksum = verify_archive(path)
+        if checksum is not None:
+            if pushed_at is None:
+                pushed_at = self.get_repo(owner, repo).get("pushed_at")
+            if archive_is_current(path, pushed_at):
+                return _archive_result(path, checksum, os.path.getsize(path), True)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+
+        # Rate limit e 5xx já são tratados por _make_request; aqui só a
+        # conexão que cai no meio do corpo (recomeça: GET é idempotente)
+        retries = 0
+        while True:
+            try:
+                digest, size = self._stream_to_file(
+                    endpoint, part, bandwidth, chunk_size
+                )
+                break
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self.retry_policy.next_delay(retries)
+                if delay is None:
+                    _discard(part)
+                    raise BackupError(f"{owner}/{repo}: download interrompido ({e})")
+                retries += 1
+                time.sleep(delay)
+            except BaseException:
+                _discard(part)
+                raise
+
+        return _store_archive(
+            part, path, archive_format, digest, size, f"{owner}/{repo}"
+        )
+
+    def _stream_to_file(
+        self,
+        endpoint: str,
+        path: str,
+        bandwidth: Optional[BandwidthLimiter],
+        chunk_size: int,
+    ) -> tuple[str, int]:
+        """Grava o corpo de um GET em `path`; devolve (SHA-256, bytes)"""
+        digest = hashlib.sha256()
+        size = 0
+        response = self._make_request("GET", endpoint, stream=True)
+        try:
+            response.raise_for_status()
+            with open(path, "wb") as f:
+                for chunk in response.iter_content(chunk_size):
+                    if bandwidth is not None:
+                        bandwidth.consume(len(chunk))
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except requests.exceptions.ChunkedEncodingError as e:
+            # Conexão caiu no meio do corpo (urllib3 IncompleteRead): repetível
+            raise requests.ConnectionError(str(e)) from e
+        finally:
+            response.close()
+
+        _check_download(response.headers, size, endpoint)
+        return digest.hexdigest(), size
+
     # ==================== ATUALIZAÇÃO ====================
 
     def update_repo(
@@ -322,16 +2190,21 @@ class GitHubRepoManager:
         Returns:
             Lista de topics atualizada
         """
-        # Normaliza topics
-        normalized_topics = [t.lower().strip() for t in topics[:20]]
-
         response = self._make_request(
-            "PUT", f"/repos/{owner}/{repo}/topics", data={"names": normalized_topics}
+            "PUT",
+            f"/repos/{owner}/{repo}/topics",
+            data={"names": normalize_topics(topics)},
         )
         response.raise_for_status()
         return response.json()["names"]
 
-    def add_topics(self, owner: str, repo: str, topics: List[str]) -> List[str]:
+    def add_topics(
+        self,
+        owner: str,
+        repo: str,
+        topics: List[str],
+        current: Optional[List[str]] = None,
+    ) -> List[str]:
         """
         Adiciona topics ao repositório (mantém existentes)
 
@@ -339,14 +2212,78 @@ class GitHubRepoManager:
             owner: Dono do repositório
             repo: Nome do repositório
             topics: Lista de topics para adicionar
+            current: Topics atuais, se já conhecidos (ex: da listagem); evita
+                o GET. Se nada mudar, nenhum PUT é feito.
 
         Returns:
             Lista completa de topics
         """
-        current = self.get_topics(owner, repo)
-        new_topics = list(set(current + topics))
+        if current is None:
+            current = self.get_topics(owner, repo)
+        new_topics = normalize_topics(current + topics)
+        if set(new_topics) == set(current):
+            return current
         return self.set_topics(owner, repo, new_topics)
 
+    def reconcile_topics(
+        self,
+        repos: List[Dict],
+        target: TopicTarget,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Leva os topics de muitos repositórios ao estado desejado
+
+        O alvo de cada repo é calculado localmente a partir dos "topics" da
+        listagem; só os repos que mudam recebem um PUT, em paralelo. Repos
+        sem mudança não custam requisição; repos sem "topics" no objeto
+        custam um GET antes.
+
+        Args:
+            repos: Repositórios da listagem (iter_repos/iter_repos_graphql)
+            target: Função repo -> topics desejados
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
+
+        Returns:
+            Dict do lote (sucessos, falhas, ...) mais "topics" (novas listas
+            por "owner/repo") e "unchanged" (repos que não precisaram de PUT)
+        """
+        changes = topic_changes(repos, target)
+        unknown = {
+            r["full_name"]: r
+            for r in repos
+            if r.get("topics") is None and not r.get("archived")
+        }
+        unchanged = sum(1 for r in repos if not r.get("archived")) - len(changes)
+        unchanged -= len(unknown)
+        lock = threading.Lock()
+
+        def reconcile(owner: str, repo: str):
+            nonlocal unchanged
+            full_name = f"{owner}/{repo}"
+            if full_name in unknown:
+                current = self.get_topics(owner, repo)
+                wanted = normalize_topics(
+                    target({**unknown[full_name], "topics": current})
+                )
+                if set(wanted) == set(current):
+                    with lock:
+                        unchanged += 1
+                    return current
+                with lock:
+                    changes[full_name] = wanted
+            return self.set_topics(owner, repo, changes[full_name])
+
+        items = [tuple(name.split("/", 1)) for name in [*changes, *unknown]]
+        results = self.run_batch(reconcile, items, max_workers, progress, cancel)
+        results["topics"] = changes
+        results["unchanged"] = unchanged
+        return results
+
     # ==================== CRIAÇÃO ====================
 
     def create_repo(self, config: RepoConfig) -> Dict:
@@ -391,60 +2328,208 @@ class GitHubRepoManager:
 
     # ==================== OPERAÇÕES EM LOTE ====================
 
-    def archive_multiple(self, repos: List[tuple[str, str]]) -> Dict[str, Any]:
+    def run_batch(
+        self,
+        operation: Callable[[str, str], Any],
+        repos: List[tuple[str, str]],
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
         """
-        Arquiva múltiplos repositórios
+        Executa uma operação por repositório em um pool limitado de threads
+
+        Ctrl-C (ou cancel.set()) interrompe de forma cooperativa: itens ainda
+        não iniciados são cancelados e os que estão em andamento terminam.
+        Falhas transitórias são repetidas dentro de um orçamento de retries
+        compartilhado pelo lote (ver RetryPolicy.batch_budget).
 
         Args:
+            operation: Função (owner, repo) executada para cada item
             repos: Lista de tuplas (owner, repo)
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote a partir de outra thread
 
         Returns:
-            Dict com sucessos e falhas
+            Dict com sucessos, falhas, cancelados, retries por item
+            ("owner/repo" -> n) e uso do orçamento de retries
         """
-        results = {"success": [], "failed": []}
-
-        for owner, repo in repos:
+        batch = _BatchTracker(self.retry_policy, len(repos), progress)
+        stop = cancel or threading.Event()
+
+        def run(owner: str, repo: str):
+            if stop.is_set():
+                return _CANCELLED
+            scope = batch.scope()
+            token = _retry_scope.set(scope)
             try:
-                self.archive_repo(owner, repo)
-                results["success"].append(f"{owner}/{repo}")
-            except Exception as e:
-                results["failed"].append({"repo": f"{owner}/{repo}", "error": str(e)})
+                return operation(owner, repo)
+            finally:
+                _retry_scope.reset(token)
+                batch.retried(f"{owner}/{repo}", scope)
+
+        def collect(future, name: str):
+            if future.cancelled():
+                batch.record(name, _CANCELLED)
+                return
+            error = future.exception()
+            batch.record(name, None if error else future.result(), error)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or self.BATCH_WORKERS)
+        futures = {
+            executor.submit(run, owner, repo): f"{owner}/{repo}"
+            for owner, repo in repos
+        }
+        pending = set(futures)
+        try:
+            for future in as_completed(futures):
+                pending.discard(future)
+                collect(future, futures[future])
+        except KeyboardInterrupt:
+            stop.set()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        for future in pending:
+            collect(future, futures[future])
+
+        return batch.finish()
+
+    def archive_multiple(
+        self,
+        repos: List[tuple[str, str]],
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Arquiva múltiplos repositórios em paralelo
 
-        return results
+        Args:
+            repos: Lista de tuplas (owner, repo)
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
 
-    def unarchive_multiple(self, repos: List[tuple[str, str]]) -> Dict[str, Any]:
+        Returns:
+            Dict com sucessos, falhas, cancelados e retries
+        """
+        return self.run_batch(self.archive_repo, repos, max_workers, progress, cancel)
+
+    def unarchive_multiple(
+        self,
+        repos: List[tuple[str, str]],
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
         """
-        Desarquiva múltiplos repositórios
+        Desarquiva múltiplos repositórios em paralelo
 
         Args:
             repos: Lista de tuplas (owner, repo)
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
 
         Returns:
-            Dict com sucessos e falhas
+            Dict com sucessos, falhas, cancelados e retries
         """
-        results = {"success": [], "failed": []}
+        return self.run_batch(self.unarchive_repo, repos, max_workers, progress, cancel)
 
-        for owner, repo in repos:
-            try:
-                self.unarchive_repo(owner, repo)
-                results["success"].append(f"{owner}/{repo}")
-            except Exception as e:
-                results["failed"].append({"repo": f"{owner}/{repo}", "error": str(e)})
+    def backup_stage(
+        self,
+        dest_dir: str,
+        archive_format: str = "tarball",
+        max_downloads: Optional[int] = None,
+        bandwidth: Optional[float] = None,
+    ) -> Callable[[str, str], Dict[str, Any]]:
+        """
+        Etapa de backup para lotes: função (owner, repo) -> download_archive
 
+        As chamadas de todas as threads dividem um limite de downloads
+        simultâneos e um limite de banda.
+
+        Args:
+            dest_dir: Diretório dos backups
+            archive_format: tarball ou zipball
+            max_downloads: Downloads simultâneos (padrão: BACKUP_WORKERS)
+            bandwidth: Limite de banda total em bytes/s (None = sem limite)
+        """
+        slots = threading.Semaphore(max_downloads or self.BACKUP_WORKERS)
+        limiter = BandwidthLimiter(bandwidth) if bandwidth else None
+
+        def backup(owner: str, repo: str) -> Dict[str, Any]:
+            with slots:
+                return self.download_archive(
+                    owner, repo, dest_dir, archive_format, bandwidth=limiter
+                )
+
+        return backup
+
+    def backup_repos(
+        self,
+        repos: List[tuple[str, str]],
+        dest_dir: str,
+        archive_format: str = "tarball",
+        max_downloads: Optional[int] = None,
+        bandwidth: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Baixa o arquivo de vários repositórios em paralelo (ver download_archive)
+
+        Returns:
+            Dict com sucessos, falhas, cancelados, retries e backups
+            ("owner/repo" -> dict de download_archive, como em delete_multiple)
+        """
+        backups: Dict[str, Dict[str, Any]] = {}
+        stage = self.backup_stage(dest_dir, archive_format, max_downloads, bandwidth)
+
+        def backup(owner: str, repo: str):
+            backups[f"{owner}/{repo}"] = stage(owner, repo)
+
+        results = self.run_batch(
+            backup, repos, max_downloads or self.BACKUP_WORKERS, progress, cancel
+        )
+        results["backups"] = backups
         return results
 
     def delete_multiple(
-        self, repos: List[tuple[str, str]], confirm: bool = False
+        self,
+        repos: List[tuple[str, str]],
+        confirm: bool = False,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None,
+        backup_dir: Optional[str] = None,
+        archive_format: str = "tarball",
+        max_downloads: Optional[int] = None,
+        bandwidth: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
-        Deleta múltiplos repositórios
+        Deleta múltiplos repositórios em paralelo
+
+        Com backup_dir, cada repo só é deletado depois que o seu backup foi
+        baixado e verificado; um backup que falha conta como falha do repo,
+        que é mantido. Backups e deleções de repos diferentes se sobrepõem.
 
         Args:
             repos: Lista de tuplas (owner, repo)
             confirm: Confirmação de exclusão (segurança)
+            max_workers: Paralelismo máximo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            cancel: Evento para cancelar o lote
+            backup_dir: Baixar o arquivo de cada repo antes de deletá-lo
+            archive_format: tarball ou zipball
+            max_downloads: Downloads simultâneos (padrão: BACKUP_WORKERS)
+            bandwidth: Limite de banda dos backups em bytes/s
 
         Returns:
-            Dict com sucessos e falhas
+            Dict com sucessos, falhas, cancelados, retries e backups
+            ("owner/repo" -> dict de download_archive)
         """
         if not confirm:
             raise ValueError(
@@ -452,15 +2537,24 @@ class GitHubRepoManager:
                 "Para deletar múltiplos repos, passe confirm=True"
             )
 
-        results = {"success": [], "failed": []}
-
-        for owner, repo in repos:
-            try:
-                self.delete_repo(owner, repo, confirm=True)
-                results["success"].append(f"{owner}/{repo}")
-            except Exception as e:
-                results["failed"].append({"repo": f"{owner}/{repo}", "error": str(e)})
-
+        backups: Dict[str, Dict[str, Any]] = {}
+        backup = None
+        if backup_dir:
+            backup = self.backup_stage(
+                backup_dir, archive_format, max_downloads, bandwidth
+            )
+        stop = cancel or threading.Event()  # Ctrl-C no lote também o aciona
+
+        def delete(owner: str, repo: str) -> Any:
+            if backup is not None:
+                backups[f"{owner}/{repo}"] = backup(owner, repo)
+                # Cancelado durante o download: o backup fica, o repo também
+                if stop.is_set():
+                    return _CANCELLED
+            return self.delete_repo(owner, repo, confirm=True)
+
+        results = self.run_batch(delete, repos, max_workers, progress, stop)
+        results["backups"] = backups
         return results
 
 
@@ -468,16 +2562,16 @@ def main():
     """Exemplo de uso"""
     try:
         # Inicializa gerenciador
-        gh = GitHubRepoManager()
-        print(f"✓ Autenticado como: {gh.user}\n")
-
-        # Lista repositórios
-        print("Seus repositórios:")
-        repos = gh.list_repos(per_page=5)
-        for repo in repos:
-            status = "🔒 ARQUIVADO" if repo["archived"] else "✓ Ativo"
-            visibility = "🔐 Privado" if repo["private"] else "🌐 Público"
-            print(f"  {status} {visibility} - {repo['full_name']}")
+        with GitHubRepoManager() as gh:
+            print(f"✓ Autenticado como: {gh.user}\n")
+
+            # Lista repositórios
+            print("Seus repositórios:")
+            repos = gh.list_repos(per_page=5)
+            for repo in repos:
+                status = "🔒 ARQUIVADO" if repo["archived"] else "✓ Ativo"
+                visibility = "🔐 Privado" if repo["private"] else "🌐 Público"
+                print(f"  {status} {visibility} - {repo['full_name']}")
 
     except Exception as e:
         print(f"❌ Erro: {e}", file=sys.stderr)
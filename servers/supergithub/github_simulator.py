@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+"""
+Simulador local da API do GitHub
+Servidor HTTP offline com contas sintéticas (10k+ repos) para testes de carga
+e benchmarks do GitHubRepoManager e do RepoOrganizer, sem GH_TOKEN real
+
+Cobre os endpoints usados pelo gerenciador: /user, /user/repos,
+/users/{u}/repos, /orgs/{org}/repos, /repos/{o}/{r}, /repos/{o}/{r}/topics,
+/repos/{o}/{r}/tarball|zipball (302 para um download sintético), POST
+/user/repos e a consulta GraphQL de listagem. Emite paginação via Link,
+ETags (304 não consome rate limit), headers X-RateLimit-* e injeta latência
+e erros 5xx.
+
+Uso:
+    python3 github_simulator.py --repos 10000 --latency 0.02 --error-rate 0.01
+    GH_API_URL=http://127.0.0.1:8765 GH_TOKEN=qualquer python3 gh_cli.py list
+"""
+
+import re
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+LANGUAGES = [
+    "Python",
+    "JavaScript",
+    "TypeScript",
+    "Go",
+    "Rust",
+    "Java",
+    "Shell",
+    "HTML",
+    None,
+]
+TEMP_PREFIXES = ["temp-", "test-", "demo-", "experiment-"]
+
+# Ordenação das listagens REST: campo e direção padrão (como na API)
+SORT_FIELDS = {
+    "created": ("created_at", True),
+    "updated": ("updated_at", True),
+    "pushed": ("pushed_at", True),
+    "full_name": ("full_name", False),
+}
+
+
+@dataclass
+class SimulatorConfig:
+    """Configuração do simulador"""
+
+    # Contas sintéticas: login -> quantidade de repositórios
+    accounts: Dict[str, int] = field(default_factory=lambda: {"octocat": 10000})
+    # Login do dono do token (qualquer token autentica como este usuário)
+    viewer: str = "octocat"
+    # Contas (de accounts) que são organizações: respondem em /orgs/{org}/repos
+    orgs: List[str] = field(default_factory=list)
+    # Bytes do tarball/zipball por KB do campo "size" do repositório
+    archive_bytes_per_kb: int = 64
+    # Latência injetada por requisição (s) e variação aleatória máxima (s)
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Fração das requisições respondidas com 502/503
+    error_rate: float = 0.0
+    # Limite primário por token e recurso, por janela de 1 hora
+    rate_limit: int = 5000
+    seed: int = 42
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def generate_repos(owner: str, count: int, rng: random.Random) -> List[Dict]:
+    """
+    Gera repositórios sintéticos no formato da API REST
+
+    A distribuição imita uma conta real: ~5% temporários (temp-/test-/...),
+    ~30% sem descrição, ~10% arquivados, maioria sem stars, atividade
+    espalhada pelos últimos 4 anos.
+    """
+    now = datetime.now(timezone.utc)
+    repos = []
+    for i in range(count):
+        prefix = rng.choice(TEMP_PREFIXES) if rng.random() < 0.05 else ""
+        name = f"{prefix}project-{i:05d}"
+        created = now - timedelta(days=rng.randint(30, 2000))
+        updated = created + (now - created) * rng.random()
+        language = rng.choice(LANGUAGES)
+        private = rng.random() < 0.4
+        stars = 0 if rng.random() < 0.7 else rng.randint(1, 500)
+        topics = sorted({t for t in (language,) if t and rng.random() < 0.5})
+        repos.append(
+            {
+                "id": rng.randint(1, 2**31),
+                "name": name,
+                "full_name": f"{owner}/{name}",
+                "owner": {"login": owner, "type": "User"},
+                "private": private,
+                "visibility": "private" if private else "public",
+                "html_url": f"https://github.com/{owner}/{name}",
+                "description": None if rng.random() < 0.3 else f"Projeto {name}",
+                "fork": rng.random() < 0.1,
+                "homepage": None,
+                "size": rng.randint(0, 50000),
+                "stargazers_count": stars,
+                "watchers_count": stars,
+                "forks_count": 0 if stars == 0 else rng.randint(0, stars),
+                "open_issues_count": rng.randint(0, 20),
+                "language": language,
+                "archived": rng.random() < 0.1,
+                "default_branch": "main",
+                "has_issues": True,
+                "has_projects": True,
+                "has_wiki": True,
+                "topics": [t.lower() for t in topics],
+                "created_at": _iso(created),
+                "updated_at": _iso(updated),
+                "pushed_at": _iso(updated),
+            }
+        )
+    return repos
+
+
+class _SimulatorState:
+    """Contas, repositórios e contadores (compartilhados entre as threads)"""
+
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.repos: Dict[str, Dict[str, Dict]] = {
+            owner: {r["name"]: r for r in generate_repos(owner, count, self.rng)}
+            for owner, count in config.accounts.items()
+        }
+        self.repos.setdefault(config.viewer, {})
+        self._sorted: Dict[Tuple[str, str, bool], List[Dict]] = {}
+        self.budgets: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.requests: Counter = Counter()
+        self.statuses: Counter = Counter()
+
+    def touch(self, owner: str):
+        """Invalida as listagens ordenadas do dono após uma mutação"""
+        for key in [k for k in self._sorted if k[0] == owner]:
+            del self._sorted[key]
+
+    def listing(self, owner: str, sort: str, descending: bool) -> List[Dict]:
+        """Repos do dono ordenados (cache até a próxima mutação)"""
+        key = (owner, sort, descending)
+        if key not in self._sorted:
+            field_name = SORT_FIELDS[sort][0]
+            self._sorted[key] = sorted(
+                self.repos.get(owner, {}).values(),
+                key=lambda r: r[field_name] or "",
+                reverse=descending,
+            )
+        return self._sorted[key]
+
+    def consume(self, token: str, resource: str, cost: int = 1) -> Dict[str, int]:
+        """Debita a requisição do orçamento (token, recurso) da janela atual"""
+        now = int(time.time())
+        budget = self.budgets.get((token, resource))
+        if budget is None or budget["reset"] <= now:
+            budget = {"used": 0, "reset": now + 3600}
+            self.budgets[(token, resource)] = budget
+        budget["limited"] = int(budget["used"] + cost > self.config.rate_limit)
+        if not budget["limited"]:
+            budget["used"] += cost
+        return budget
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Roteia as requisições para o estado do simulador"""
+
+    protocol_version = "HTTP/1.1"
+    state: _SimulatorState  # definido por GitHubSimulator
+
+    ROUTES = [
+        ("GET", re.compile(r"^/user$"), "user"),
+        ("GET", re.compile(r"^/user/repos$"), "user_repos"),
+        ("POST", re.compile(r"^/user/repos$"), "create_repo"),
+        ("GET", re.compile(r"^/users/([^/]+)/repos$"), "owner_repos"),
+        ("GET", re.compile(r"^/orgs/([^/]+)/repos$"), "org_repos"),
+        ("GET", re.compile(r"^/repos/([^/]+)/([^/]+)$"), "get_repo"),
+        ("PATCH", re.compile(r"^/repos/([^/]+)/([^/]+)$"), "update_repo"),
+        ("DELETE", re.compile(r"^/repos/([^/]+)/([^/]+)$"), "delete_repo"),
+        ("GET", re.compile(r"^/repos/([^/]+)/([^/]+)/topics$"), "get_topics"),
+        ("PUT", re.compile(r"^/repos/([^/]+)/([^/]+)/topics$"), "set_topics"),
+        (
+            "GET",
+            re.compile(r"^/repos/([^/]+)/([^/]+)/(tarball|zipball)(?:/(.+))?$"),
+            "archive",
+        ),
+        (
+            "GET",
+            re.compile(r"^/_codeload/([^/]+)/([^/]+)/(tarball|zipball)$"),
+            "codeload",
+        ),
+        ("POST", re.compile(r"^/graphql$"), "graphql"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    # ==================== DESPACHO ====================
+
+    def _dispatch(self):
+        state, config = self.state, self.state.config
+        url = urlparse(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        self.body = json.loads(raw) if raw else {}
+
+        route = next(
+            (
+                (name, match.groups())
+                for method, pattern, name in self.ROUTES
+                if method == self.command and (match := pattern.match(url.path))
+            ),
+            None,
+        )
+        with state.lock:
+            state.requests[f"{self.command} {route[0] if route else url.path}"] += 1
+
+        if config.latency or config.jitter:
+            time.sleep(config.latency + state.rng.random() * config.jitter)
+
+        if route is None:
+            return self._send(404, {"message": "Not Found"})
+        if not self.headers.get("Authorization", "").startswith(("Bearer ", "token ")):
+            return self._send(401, {"message": "Requires authentication"})
+        if config.error_rate and state.rng.random() < config.error_rate:
+            status = state.rng.choice([502, 503])
+            return self._send(status, {"message": "Server Error (simulado)"})
+
+        name, args = route
+        getattr(self, f"_route_{name}")(*args)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+    def _send(
+        self,
+        status: int,
+        payload: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        budget: Optional[Dict[str, int]] = None,
+    ):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        headers = dict(headers or {})
+        if budget is not None:
+            limit = self.state.config.rate_limit
+            headers.update(
+                {
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": str(max(limit - budget["used"], 0)),
+                    "X-RateLimit-Used": str(budget["used"]),
+                    "X-RateLimit-Reset": str(budget["reset"]),
+                }
+            )
+
+        with self.state.lock:
+            self.state.statuses[status] += 1
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _respond(
+        self,
+        status: int,
+        payload: Any = None,
+        resource: str = "core",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Resposta com ETag e rate limit aplicados"""
+        state = self.state
+        token = self.headers.get("Authorization", "")
+        headers = dict(headers or {}, **{"X-RateLimit-Resource": resource})
+
+        # GET condicional: 304 sem corpo e sem consumir rate limit
+        if status == 200 and self.command == "GET":
+            body = json.dumps(payload).encode()
+            headers["ETag"] = f'W/"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                with state.lock:
+                    budget = dict(state.consume(token, resource, cost=0))
+                return self._send(304, None, headers, budget)
+
+        with state.lock:
+            budget = dict(state.consume(token, resource))
+        if budget["limited"]:
+            headers.pop("ETag", None)
+            message = {"message": "API rate limit exceeded (simulado)"}
+            return self._send(403, message, headers, budget)
+        self._send(status, payload, headers, budget)
+
+    # ==================== ROTAS ====================
+
+    def _route_user(self):
+        self._respond(200, {"login": self.state.config.viewer, "id": 1, "type": "User"})
+
+    def _page(self, owner: str):
+        state = self.state
+        sort = self.query.get("sort", "full_name")
+        if sort not in SORT_FIELDS:
+            return self._respond(422, {"message": f"sort inválido: {sort}"})
+        direction = self.query.get("direction")
+        descending = SORT_FIELDS[sort][1] if direction is None else direction == "desc"
+        per_page = max(1, min(int(self.query.get("per_page", 30)), 100))
+        page = max(1, int(self.query.get("page", 1)))
+
+        with state.lock:
+            repos = state.listing(owner, sort, descending)
+            visibility = self.query.get("visibility", self.query.get("type", "all"))
+            if visibility in ("public", "private"):
+                repos = [r for r in repos if r["visibility"] == visibility]
+            items = repos[(page - 1) * per_page : page * per_page]
+            last = max(1, -(-len(repos) // per_page))
+
+        links = []
+        base = f"http://{self.headers['Host']}{urlparse(self.path).path}"
+        for rel, number in (
+            ("prev", page - 1),
+            ("next", page + 1),
+            ("first", 1),
+            ("last", last),
+        ):
+            if (rel == "prev" and page == 1) or (rel == "next" and page >= last):
+                continue
+            params = dict(self.query, page=number, per_page=per_page)
+            links.append(f'<{base}?{urlencode(params)}>; rel="{rel}"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        self._respond(200, items, headers=headers)
+
+    def _route_user_repos(self):
+        self._page(self.state.config.viewer)
+
+    def _route_owner_repos(self, owner: str):
+        if owner not in self.state.repos:
+            return self._respond(404, {"message": "Not Found"})
+        self._page(owner)
+
+    def _route_org_repos(self, org: str):
+        if org not in self.state.config.orgs or org not in self.state.repos:
+            return self._respond(404, {"message": "Not Found"})
+        self._page(org)
+
+    def _find(self, owner: str, name: str) -> Optional[Dict]:
+        return self.state.repos.get(owner, {}).get(name)
+
+    def _route_get_repo(self, owner: str, name: str):
+        with self.state.lock:
+            repo = self._find(owner, name)
+            repo = dict(repo) if repo else None
+        if repo is None:
+            return self._respond(404, {"message": "Not Found"})
+        self._respond(200, repo)
+
+    def _route_update_repo(self, owner: str, name: str):
+        state = self.state
+        with state.lock:
+            repo = self._find(owner, name)
+            if repo is None:
+                status, payload = 404, {"message": "Not Found"}
+            elif repo["archived"] and set(self.body) - {"archived"}:
+                status = 403
+                payload = {"message": "Repository was archived so is read-only."}
+            else:
+                for key, value in self.body.items():
+                    if key in repo:
+                        repo[key] = value
+                if "private" in self.body:
+                    repo["visibility"] = "private" if repo["private"] else "public"
+                if repo["name"] != name:
+                    del state.repos[owner][name]
+                    repo["full_name"] = f"{owner}/{repo['name']}"
+                    state.repos[owner][repo["name"]] = repo
+                repo["updated_at"] = _iso(datetime.now(timezone.utc))
+                state.touch(owner)
+                status, payload = 200, dict(repo)
+        self._respond(status, payload)
+
+    def _route_delete_repo(self, owner: str, name: str):
+        state = self.state
+        with state.lock:
+            repo = state.repos.get(owner, {}).pop(name, None)
+            state.touch(owner)
+        if repo is None:
+            return self._respond(404, {"message": "Not Found"})
+        self._respond(204)
+
+    def _route_archive(self, owner: str, name: str, fmt: str, ref: Optional[str]):
+        with self.state.lock:
+            repo = self._find(owner, name)
+        # Como no GitHub: repositório vazio (size 0) não tem arquivo
+        if repo is None or not repo["size"]:
+            return self._respond(404, {"message": "Not Found"})
+        location = f"/_codeload/{owner}/{name}/{fmt}"
+        self._respond(302, None, headers={"Location": location})
+
+    def _route_codeload(self, owner: str, name: str, fmt: str):
+        with self.state.lock:
+            repo = self._find(owner, name)
+            size = repo["size"] * self.state.config.archive_bytes_per_kb if repo else 0
+        if not size:
+            return self._send(404, {"message": "Not Found"})
+
+        # Corpo determinístico, gerado em blocos (sem montar o arquivo inteiro)
+        magic = b"\x1f\x8b" if fmt == "tarball" else b"PK"
+        block = hashlib.sha256(f"{owner}/{name}".encode()).digest() * 2048
+        self.send_response(200)
+        self.send_header("Content-Type", f"application/x-{fmt}")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        self.wfile.write(magic)
+        sent = len(magic)
+        while sent < size:
+            chunk = block[: size - sent]
+            self.wfile.write(chunk)
+            sent += len(chunk)
+        with self.state.lock:
+            self.state.statuses[200] += 1
+
+    def _route_get_topics(self, owner: str, name: str):
+        with self.state.lock:
+            repo = self._find(owner, name)
+            topics = list(repo["topics"]) if repo else None
+        if topics is None:
+            return self._respond(404, {"message": "Not Found"})
+        self._respond(200, {"names": topics})
+
+    def _route_set_topics(self, owner: str, name: str):
+        state = self.state
+        names = self.body.get("names", [])
+        with state.lock:
+            repo = self._find(owner, name)
+            if repo is None:
+                status, payload = 404, {"message": "Not Found"}
+            elif repo["archived"]:
+                status = 403
+                payload = {"message": "Repository was archived so is read-only."}
+            elif len(names) > 20:
+                status, payload = 422, {"message": "Máximo de 20 topics"}
+            else:
+                repo["topics"] = sorted(set(names))
+                status, payload = 200, {"names": repo["topics"]}
+        self._respond(status, payload)
+
+    def _route_create_repo(self):
+        state = self.state
+        owner = state.config.viewer
+        name = self.body.get("name", "")
+        with state.lock:
+            if not name or name in state.repos[owner]:
+                status = 422
+                payload = {"message": "name already exists on this account"}
+            else:
+                now = _iso(datetime.now(timezone.utc))
+                private = bool(self.body.get("private"))
+                repo = {
+                    "id": state.rng.randint(1, 2**31),
+                    "name": name,
+                    "full_name": f"{owner}/{name}",
+                    "owner": {"login": owner, "type": "User"},
+                    "private": private,
+                    "visibility": "private" if private else "public",
+                    "html_url": f"https://github.com/{owner}/{name}",
+                    "description": self.body.get("description"),
+                    "fork": False,
+                    "homepage": self.body.get("homepage"),
+                    "size": 0,
+                    "stargazers_count": 0,
+                    "watchers_count": 0,
+                    "forks_count": 0,
+                    "open_issues_count": 0,
+                    "language": None,
+                    "archived": False,
+                    "default_branch": "main",
+                    "has_issues": self.body.get("has_issues", True),
+                    "has_projects": self.body.get("has_projects", True),
+                    "has_wiki": self.body.get("has_wiki", True),
+                    "topics": [],
+                    "created_at": now,
+                    "updated_at": now,
+                    "pushed_at": now,
+                }
+                state.repos[owner][name] = repo
+                state.touch(owner)
+                status, payload = 201, dict(repo)
+        self._respond(status, payload)
+
+    def _route_graphql(self):
+        """Listagem GraphQL (viewer/repositoryOwner.repositories) por cursor"""
+        state = self.state
+        query = self.body.get("query", "")
+        variables = self.body.get("variables") or {}
+        if "repositories(" not in query:
+            return self._respond(
+                200,
+                {"errors": [{"message": "Consulta não suportada pelo simulador"}]},
+                resource="graphql",
+            )
+
+        owner = variables.get("login") or state.config.viewer
+        root = "repositoryOwner" if "repositoryOwner" in query else "viewer"
+        if owner not in state.repos:
+            return self._respond(200, {"data": {root: None}}, resource="graphql")
+
+        first = max(1, min(int(variables.get("first", 100)), 100))
+        after = variables.get("after")
+        offset = int(base64.b64decode(after).decode()) if after else 0
+        with state.lock:
+            repos = state.listing(owner, "updated", True)
+            items = repos[offset : offset + first]
+            has_next = offset + first < len(repos)
+
+        nodes = [
+            {
+                "name": r["name"],
+                "nameWithOwner": r["full_name"],
+                "owner": {"login": r["owner"]["login"]},
+                "description": r["description"],
+                "url": r["html_url"],
+                "homepageUrl": r["homepage"],
+                "isArchived": r["archived"],
+                "isFork": r["fork"],
+                "visibility": r["visibility"].upper(),
+                "stargazerCount": r["stargazers_count"],
+                "forkCount": r["forks_count"],
+                "primaryLanguage": {"name": r["language"]} if r["language"] else None,
+                "defaultBranchRef": {"name": r["default_branch"]},
+                "createdAt": r["created_at"],
+                "updatedAt": r["updated_at"],
+                "pushedAt": r["pushed_at"],
+                "repositoryTopics": {
+                    "nodes": [{"topic": {"name": t}} for t in r["topics"]]
+                },
+            }
+            for r in items
+        ]
+        cursor = base64.b64encode(str(offset + len(items)).encode()).decode()
+        connection = {
+            "nodes": nodes,
+            "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+        }
+        payload = {"data": {root: {"repositories": connection}}}
+        self._respond(200, payload, resource="graphql")
+
+
+class GitHubSimulator:
+    """
+    Servidor local que imita a API REST/GraphQL do GitHub
+
+    Uso:
+        with GitHubSimulator(SimulatorConfig(accounts={"octocat": 10000})) as sim:
+            gh = GitHubRepoManager(token="qualquer", base_url=sim.url)
+            repos = list(gh.iter_repos())
+            print(sim.stats())
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimulatorConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            config: Contas, latência, erros e rate limit simulados
+            host: Interface de escuta
+            port: Porta (0 = escolhida pelo sistema)
+        """
+        self.config = config or SimulatorConfig()
+        self.state = _SimulatorState(self.config)
+        handler = type("Handler", (_Handler,), {"state": self.state})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL base a usar como base_url/GH_API_URL"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "GitHubSimulator":
+        """Sobe o servidor em uma thread de fundo"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Para o servidor"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "GitHubSimulator":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def repos(self, owner: Optional[str] = None) -> List[Dict]:
+        """Estado atual dos repositórios de uma conta (padrão: viewer)"""
+        with self.state.lock:
+            return [
+                dict(r)
+                for r in self.state.repos.get(owner or self.config.viewer, {}).values()
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Requisições por rota e por status desde o início (ou reset_stats)"""
+        with self.state.lock:
+            return {
+                "requests": sum(self.state.requests.values()),
+                "by_route": dict(self.state.requests),
+                "by_status": dict(self.state.statuses),
+            }
+
+    def reset_stats(self):
+        """Zera os contadores de requisições"""
+        with self.state.lock:
+            self.state.requests.clear()
+            self.state.statuses.clear()
+
+
+def main():
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(description="Simulador local da API do GitHub")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface de escuta")
+    parser.add_argument("--port", type=int, default=8765, help="Porta")
+    parser.add_argument("--user", default="octocat", help="Login do usuário do token")
+    parser.add_argument(
+        "--repos", type=int, default=10000, help="Repositórios do usuário"
+    )
+    parser.add_argument(
+        "--account",
+        action="append",
+        default=[],
+        metavar="LOGIN=N",
+        help="Conta extra com N repositórios (repetível)",
+    )
+    parser.add_argument(
+        "--org",
+        action="append",
+        default=[],
+        metavar="LOGIN=N",
+        help="Organização com N repositórios (repetível)",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Latência por requisição (s)"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Variação máxima da latência (s)"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fração de respostas 502/503"
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, default=5000, help="Requisições por hora por token"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos dados")
+    args = parser.parse_args()
+
+    accounts = {args.user: args.repos}
+    for spec in args.account:
+        login, _, count = spec.partition("=")
+        accounts[login] = int(count or 100)
+    orgs = []
+    for spec in args.org:
+        login, _, count = spec.partition("=")
+        accounts[login] = int(count or 100)
+        orgs.append(login)
+
+    config = SimulatorConfig(
+        accounts=accounts,
+        viewer=args.user,
+        orgs=orgs,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    simulator = GitHubSimulator(config, args.host, args.port)
+    print(f"✓ Simulador em {simulator.url} ({sum(accounts.values())} repos)")
+    print(f"  export GH_API_URL={simulator.url} GH_TOKEN=simulado")
+
+    try:
+        simulator.server.serve_forever()
+    except KeyboardInterrupt:
+        stats = simulator.stats()
+        print(f"\nRequisições: {stats['requests']}")
+        for route, count in sorted(stats["by_route"].items()):
+            print(f"  {route}: {count}")
+    finally:
+        simulator.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
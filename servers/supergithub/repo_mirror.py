@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Espelho local de metadados de repositórios GitHub
+Mantém uma cópia em SQLite da listagem de repositórios, sincronizada de forma
+incremental (sort=updated + parada antecipada), para consultas locais rápidas
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Any
+from github_repo_manager import GitHubRepoManager
+
+DEFAULT_MIRROR_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "supergithub", "repos.db"
+)
+
+# A sync incremental não enxerga repos removidos: depois deste intervalo desde
+# a última leitura completa, a próxima sync relê tudo e poda o espelho
+FULL_SYNC_INTERVAL = 24 * 3600
+
+# Colunas de ordenação aceitas por query() (mesmas opções do `gh_cli.py list`)
+SORT_COLUMNS = {
+    "created": "created_at DESC",
+    "updated": "updated_at DESC",
+    "pushed": "pushed_at DESC",
+    "full_name": "full_name ASC",
+}
+
+_EPOCH = datetime.fromtimestamp(0, timezone.utc).isoformat()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    scope TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    name TEXT NOT NULL,
+    private INTEGER NOT NULL,
+    archived INTEGER NOT NULL,
+    fork INTEGER NOT NULL,
+    language TEXT,
+    stargazers_count INTEGER NOT NULL DEFAULT 0,
+    forks_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT,
+    pushed_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, full_name)
+);
+CREATE INDEX IF NOT EXISTS idx_repos_archived ON repos (scope, archived, updated_at);
+CREATE INDEX IF NOT EXISTS idx_repos_private ON repos (scope, private, updated_at);
+CREATE INDEX IF NOT EXISTS idx_repos_updated ON repos (scope, updated_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT NOT NULL,
+    full_synced_at TEXT
+);
+"""
+
+
+class RepoMirror:
+    """Espelho SQLite da listagem de repositórios, com sync incremental"""
+
+    def __init__(
+        self, gh: Optional[GitHubRepoManager] = None, path: Optional[str] = None
+    ):
+        """
+        Inicializa o espelho
+
+        Args:
+            gh: Gerenciador usado para sincronizar (opcional para só consultar)
+            path: Arquivo SQLite (padrão: GH_MIRROR_DB ou ~/.cache/supergithub/repos.db)
+        """
+        self.gh = gh
+        self.path = path or os.getenv("GH_MIRROR_DB") or DEFAULT_MIRROR_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(_SCHEMA)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(sync_state)")}
+        if "full_synced_at" not in columns:
+            self.db.execute("ALTER TABLE sync_state ADD COLUMN full_synced_at TEXT")
+
+    @staticmethod
+    def scope_for(username: Optional[str] = None, type_filter: str = "all") -> str:
+        """Identifica a listagem espelhada (usuário + filtro de tipo)"""
+        return f"{username or '@me'}:{type_filter}"
+
+    def close(self):
+        """Fecha o banco"""
+        self.db.close()
+
+    def __enter__(self) -> "RepoMirror":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ==================== SINCRONIZAÇÃO ====================
+
+    def last_sync(self, scope: str) -> Optional[datetime]:
+        """Momento da última sincronização do escopo (None = nunca)"""
+        row = self.db.execute(
+            "SELECT synced_at FROM sync_state WHERE scope = ?", (scope,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def is_stale(self, scope: str, ttl: float) -> bool:
+        """True se o escopo nunca foi sincronizado ou a última sync passou do TTL"""
+        synced = self.last_sync(scope)
+        if synced is None:
+            return True
+        return (datetime.now(timezone.utc) - synced).total_seconds() > ttl
+
+    def sync(
+        self,
+        username: Optional[str] = None,
+        type_filter: str = "all",
+        full: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Sincroniza o espelho com a API
+
+        A listagem vem ordenada por updated_at (mais recentes primeiro); a
+        sync incremental para no primeiro repo mais antigo que a última marca
+        d'água. A sync completa (a primeira, a forçada ou a que vence
+        FULL_SYNC_INTERVAL desde a anterior) relê tudo e remove do espelho os
+        repos que não existem mais.
+
+        Args:
+            username: Usuário (None = usuário autenticado)
+            type_filter: Filtro (all, owner, public, private, member)
+            full: Forçar leitura completa
+
+        Returns:
+            Dict com escopo, modo, repos gravados e removidos
+        """
+        if self.gh is None:
+            raise ValueError(
+                "RepoMirror precisa de um GitHubRepoManager para sincronizar"
+            )
+
+        scope = self.scope_for(username, type_filter)
+        row = self.db.execute(
+            "SELECT watermark, full_synced_at FROM sync_state WHERE scope = ?",
+            (scope,),
+        ).fetchone()
+        now = datetime.now(timezone.utc)
+        if row and row[1]:
+            age = (now - datetime.fromisoformat(row[1])).total_seconds()
+            full = full or age > FULL_SYNC_INTERVAL
+        watermark = row[0] if row and row[1] and not full else None
+
+        seen, upserted, newest = set(), 0, watermark
+        with self.db:
+            for repo in self.gh.iter_repos(
+                username=username, type_filter=type_filter, sort="updated"
+            ):
+                updated = repo.get("updated_at") or ""
+                if watermark and updated < watermark:
+                    break
+
+                self._upsert(scope, repo)
+                seen.add(repo["full_name"])
+                upserted += 1
+                if newest is None or updated > newest:
+                    newest = updated
+
+            removed = 0
+            if watermark is None:
+                stale = [
+                    name
+                    for (name,) in self.db.execute(
+                        "SELECT full_name FROM repos WHERE scope = ?", (scope,)
+                    )
+                    if name not in seen
+                ]
+                self.db.executemany(
+                    "DELETE FROM repos WHERE scope = ? AND full_name = ?",
+                    [(scope, name) for name in stale],
+                )
+                removed = len(stale)
+
+            synced_at = now.isoformat()
+            self.db.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "(scope, watermark, synced_at, full_synced_at) VALUES (?, ?, ?, ?)",
+                (
+                    scope,
+                    newest,
+                    synced_at,
+                    synced_at if watermark is None else row[1],
+                ),
+            )
+
+        return {
+            "scope": scope,
+            "mode": "full" if watermark is None else "incremental",
+            "upserted": upserted,
+            "removed": removed,
+        }
+
+    def _upsert(self, scope: str, repo: Dict):
+        """Grava (ou substitui) um repositório no espelho"""
+        self.db.execute(
+            "INSERT OR REPLACE INTO repos (scope, full_name, owner, name, private, "
+            "archived, fork, language, stargazers_count, forks_count, created_at, "
+            "updated_at, pushed_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                scope,
+                repo["full_name"],
+                repo.get("owner", {}).get("login", repo["full_name"].split("/")[0]),
+                repo["name"],
+                int(bool(repo.get("private"))),
+                int(bool(repo.get("archived"))),
+                int(bool(repo.get("fork"))),
+                repo.get("language"),
+                repo.get("stargazers_count") or 0,
+                repo.get("forks_count") or 0,
+                repo.get("created_at"),
+                repo.get("updated_at"),
+                repo.get("pushed_at"),
+                json.dumps(repo),
+            ),
+        )
+
+    # ==================== MUDANÇAS LOCAIS ====================
+
+    def forget(self, full_names: Iterable[str]) -> int:
+        """
+        Remove repositórios de todas as listagens espelhadas
+
+        Usado depois de deleções feitas pela API, para que o espelho não
+        continue listando o que já não existe até a próxima sync completa.
+
+        Args:
+            full_names: Nomes "owner/repo" (comparação sem caixa)
+
+        Returns:
+            Número de linhas removidas
+        """
+        with self.db:
+            return sum(
+                self.db.execute(
+                    "DELETE FROM repos WHERE full_name = ? COLLATE NOCASE", (name,)
+                ).rowcount
+                for name in full_names
+            )
+
+    def patch(self, full_name: str, changes: Dict) -> int:
+        """
+        Aplica campos alterados pela API às cópias espelhadas de um repositório
+
+        Args:
+            full_name: Nome "owner/repo" atual no espelho (comparação sem caixa)
+            changes: Campos novos (ex.: {"archived": True}, {"topics": [...]} ou
+                o repositório devolvido pela API, inclusive após renomear)
+
+        Returns:
+            Número de listagens atualizadas
+        """
+        rows = self.db.execute(
+            "SELECT scope, full_name, data FROM repos "
+            "WHERE full_name = ? COLLATE NOCASE",
+            (full_name,),
+        ).fetchall()
+        with self.db:
+            for scope, name, data in rows:
+                repo = {**json.loads(data), **changes}
+                if repo["full_name"] != name:
+                    self.db.execute(
+                        "DELETE FROM repos WHERE scope = ? AND full_name = ?",
+                        (scope, name),
+                    )
+                self._upsert(scope, repo)
+        return len(rows)
+
+    def expire(self):
+        """
+        Marca todas as listagens como vencidas (próxima leitura sincroniza)
+
+        Para mudanças que o espelho não sabe posicionar sozinho, como um repo
+        recém-criado: a sync incremental seguinte o traz em uma requisição.
+        """
+        with self.db:
+            self.db.execute("UPDATE sync_state SET synced_at = ?", (_EPOCH,))
+
+    # ==================== CONSULTAS ====================
+
+    def names(self) -> List[tuple]:
+        """Pares (dono, nome) espelhados, de todas as listagens"""
+        sql = "SELECT DISTINCT owner, name FROM repos ORDER BY owner, name"
+        return self.db.execute(sql).fetchall()
+
+    def query(
+        self,
+        username: Optional[str] = None,
+        type_filter: str = "all",
+        archived: Optional[bool] = None,
+        private: Optional[bool] = None,
+        sort: str = "updated",
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Consulta repositórios espelhados (ver iter_query), em uma lista"""
+        return list(
+            self.iter_query(username, type_filter, archived, private, sort, limit)
+        )
+
+    def iter_query(
+        self,
+        username: Optional[str] = None,
+        type_filter: str = "all",
+        archived: Optional[bool] = None,
+        private: Optional[bool] = None,
+        sort: str = "updated",
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Consulta repositórios espelhados (índices por arquivado/privado/data)
+
+        As linhas são lidas do cursor à medida que o chamador consome.
+
+        Args:
+            username: Usuário (None = usuário autenticado)
+            type_filter: Filtro de tipo usado na sincronização
+            archived: True/False para filtrar por arquivamento (None = todos)
+            private: True/False para filtrar por visibilidade (None = todos)
+            sort: Ordenação (created, updated, pushed, full_name)
+            limit: Máximo de resultados (None = todos)
+
+        Yields:
+            Repositórios no formato da API REST
+        """
+        sql = "SELECT data FROM repos WHERE scope = ?"
+        params: List[Any] = [self.scope_for(username, type_filter)]
+
+        if archived is not None:
+            sql += " AND archived = ?"
+            params.append(int(archived))
+        if private is not None:
+            sql += " AND private = ?"
+            params.append(int(private))
+
+        sql += f" ORDER BY {SORT_COLUMNS.get(sort, SORT_COLUMNS['updated'])}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        for (data,) in self.db.execute(sql, params):
+            yield json.loads(data)
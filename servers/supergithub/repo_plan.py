@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Planos de organização de repositórios GitHub
+Separa o que fazer (Plan: lista serializável de operações) de como fazer
+(PlanExecutor: execução paralela com diário em disco, retomável)
+"""
+
+import os
+import json
+import hashlib
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from github_repo_manager import GitHubRepoManager, ProgressCallback, _CANCELLED
+
+DEFAULT_PLAN_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "supergithub", "plans"
+)
+
+# Ordem das operações de um mesmo repositório: arquivado é read-only e
+# deletado não existe mais, então edições vêm antes
+OP_KINDS = ("update", "topics", "archive", "delete")
+
+
+@dataclass
+class PlanOp:
+    """Operação planejada sobre um repositório"""
+
+    kind: str  # update, topics, archive, delete
+    owner: str
+    repo: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    reason: str = ""
+    # Estado do repo na listagem que gerou o plano (None = não conferir)
+    updated_at: Optional[str] = None
+    pushed_at: Optional[str] = None
+
+    @property
+    def id(self) -> str:
+        """Identificador estável da operação no plano (e no diário)"""
+        return f"{self.kind}:{self.owner}/{self.repo}"
+
+
+def _op_dict(op: PlanOp) -> Dict[str, Any]:
+    """Operação serializada; campos None omitidos (planos antigos mantêm o hash)"""
+    return {key: value for key, value in asdict(op).items() if value is not None}
+
+
+@dataclass
+class Plan:
+    """Plano serializável: operações + resumo da listagem que o gerou"""
+
+    ops: List[PlanOp] = field(default_factory=list)
+    summary: Dict[str, int] = field(default_factory=dict)
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash das operações (associa as entradas do diário a este plano)"""
+        payload = json.dumps([_op_dict(op) for op in self.ops], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def count(self, kind: str) -> int:
+        """Número de operações de um tipo"""
+        return sum(1 for op in self.ops if op.kind == kind)
+
+    def save(self, path: str):
+        """Grava o plano em JSON (escrita atômica)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": 1,
+                    "created_at": self.created_at,
+                    "fingerprint": self.fingerprint,
+                    "summary": self.summary,
+                    "ops": [_op_dict(op) for op in self.ops],
+                },
+                f,
+                ensure_ascii=False,
+                indent=1,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Plan":
+        """Lê um plano gravado por save()"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            ops=[PlanOp(**op) for op in data["ops"]],
+            summary=data.get("summary", {}),
+            created_at=data["created_at"],
+        )
+
+
+class Journal:
+    """
+    Diário append-only (JSONL) dos resultados de cada operação
+
+    Cada linha é gravada com fsync antes de a próxima operação do mesmo
+    repositório começar: após uma queda, as operações concluídas são
+    conhecidas e a retomada as pula.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Arquivo do diário (criado se não existir)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell():
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Última linha truncada por uma queda: não emendar nela
+                    self._file.write("\n")
+
+    def completed(self, plan: Plan) -> Set[str]:
+        """Ids das operações do plano já concluídas com sucesso"""
+        done = set()
+        fingerprint = plan.fingerprint
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # última linha truncada por uma queda
+                if entry.get("plan") == fingerprint and entry["status"] == "done":
+                    done.add(entry["op"])
+        return done
+
+    def record(self, plan: Plan, op: PlanOp, status: str, error: Optional[str] = None):
+        """Acrescenta o resultado de uma operação (done, failed ou stale)"""
+        line = json.dumps(
+            {
+                "plan": plan.fingerprint,
+                "op": op.id,
+                "status": status,
+                "error": error,
+                "at": datetime.now(timezone.utc).isoformat(),
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _apply_update(gh: GitHubRepoManager, op: PlanOp):
+    gh.update_repo(op.owner, op.repo, **op.params)
+
+
+def _apply_topics(gh: GitHubRepoManager, op: PlanOp):
+    gh.set_topics(op.owner, op.repo, op.params["topics"])
+
+
+def _apply_archive(gh: GitHubRepoManager, op: PlanOp):
+    gh.archive_repo(op.owner, op.repo)
+
+
+def _apply_delete(gh: GitHubRepoManager, op: PlanOp):
+    gh.delete_repo(op.owner, op.repo, confirm=True)
+
+
+_OPERATIONS: Dict[str, Callable[[GitHubRepoManager, PlanOp], Any]] = {
+    "update": _apply_update,
+    "topics": _apply_topics,
+    "archive": _apply_archive,
+    "delete": _apply_delete,
+}
+
+
+class PlanExecutor:
+    """Aplica um Plan em paralelo (um item por repositório), registrando no diário"""
+
+    def __init__(
+        self,
+        gh: GitHubRepoManager,
+        journal: Journal,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        backup: Optional[Callable[[str, str], Dict[str, Any]]] = None,
+        verify: bool = True,
+    ):
+        """
+        Args:
+            gh: Gerenciador usado nas operações
+            journal: Diário onde cada resultado é gravado
+            max_workers: Repositórios processados em paralelo (padrão: BATCH_WORKERS)
+            progress: Callback (concluídos, total, "owner/repo", erro ou None)
+            backup: Etapa executada antes de cada delete (ex: gh.backup_stage);
+                se falhar, o delete falha e o repositório é mantido
+            verify: Reler cada repo (um GET) e pular suas operações se ele
+                mudou desde o plano (updated_at/pushed_at das PlanOps)
+        """
+        self.gh = gh
+        self.journal = journal
+        self.max_workers = max_workers
+        self.progress = progress
+        self.backup = backup
+        self.verify = verify
+
+    def drift(self, ops: List[PlanOp], resumed: bool = False) -> Optional[str]:
+        """
+        Motivo para não aplicar as operações de um repo (None = nada mudou)
+
+        Compara o repo atual com o estado gravado no plano. Numa retomada, as
+        operações já feitas mudaram o updated_at; só o pushed_at é comparado.
+        """
+        snapshot = next((op for op in ops if op.updated_at or op.pushed_at), None)
+        if snapshot is None:
+            return None
+        current = self.gh.get_repo(snapshot.owner, snapshot.repo)
+        for key in ("pushed_at",) if resumed else ("updated_at", "pushed_at"):
+            planned = getattr(snapshot, key)
+            if planned and current.get(key) != planned:
+                return f"{key} mudou desde o plano ({planned} -> {current.get(key)})"
+        return None
+
+    def apply(
+        self,
+        plan: Plan,
+        kinds: Optional[Iterable[str]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Executa as operações pendentes do plano
+
+        Operações de repositórios diferentes rodam em paralelo; as de um mesmo
+        repositório rodam em sequência (ordem de OP_KINDS) e param na primeira
+        falha. Operações já concluídas segundo o diário são puladas, e as de
+        repos que mudaram desde o plano (ver drift) não são aplicadas.
+
+        Args:
+            plan: Plano a aplicar
+            kinds: Tipos de operação a executar (padrão: todos)
+            cancel: Evento para cancelar a execução a partir de outra thread
+
+        Returns:
+            Dict com concluídas por tipo, puladas (já no diário), desatualizadas
+            ({"op", "reason"}), falhas ({"op", "error"}), repositórios
+            cancelados, retries do lote e backups ("owner/repo" -> resultado
+            da etapa de backup)
+        """
+        allowed = set(OP_KINDS if kinds is None else kinds)
+        done = self.journal.completed(plan)
+        # Repos com operações já feitas: o updated_at mudou por nossa causa
+        resumed = {(op.owner, op.repo) for op in plan.ops if op.id in done}
+
+        by_repo: Dict[tuple, List[PlanOp]] = {}
+        skipped = 0
+        for op in plan.ops:
+            if op.kind not in allowed:
+                continue
+            if op.id in done:
+                skipped += 1
+                continue
+            by_repo.setdefault((op.owner, op.repo), []).append(op)
+        for ops in by_repo.values():
+            ops.sort(key=lambda op: OP_KINDS.index(op.kind))
+
+        results: Dict[str, Any] = {
+            "done": {kind: 0 for kind in OP_KINDS},
+            "skipped": skipped,
+            "stale": [],
+            "failed": [],
+            "backups": {},
+        }
+        lock = threading.Lock()
+        stop = cancel or threading.Event()  # Ctrl-C no lote também o aciona
+
+        def run(owner: str, repo: str):
+            ops = by_repo[(owner, repo)]
+            try:
+                reason = self.verify and self.drift(ops, (owner, repo) in resumed)
+            except Exception as e:
+                self.journal.record(plan, ops[0], "failed", str(e))
+                with lock:
+                    results["failed"].append({"op": ops[0].id, "error": str(e)})
+                raise
+            if reason:
+                for op in ops:
+                    self.journal.record(plan, op, "stale", reason)
+                    with lock:
+                        results["stale"].append({"op": op.id, "reason": reason})
+                return
+
+            for op in ops:
+                try:
+                    if op.kind == "delete" and self.backup is not None:
+                        backup = self.backup(owner, repo)
+                        with lock:
+                            results["backups"][f"{owner}/{repo}"] = backup
+                        # Cancelado durante o download: o backup fica, o repo
+                        # também (o delete continua pendente no diário)
+                        if stop.is_set():
+                            return _CANCELLED
+                    _OPERATIONS[op.kind](self.gh, op)
+                except Exception as e:
+                    self.journal.record(plan, op, "failed", str(e))
+                    with lock:
+                        results["failed"].append({"op": op.id, "error": str(e)})
+                    raise
+                self.journal.record(plan, op, "done")
+                with lock:
+                    results["done"][op.kind] += 1
+
+        batch = self.gh.run_batch(
+            run, list(by_repo), self.max_workers, self.progress, stop
+        )
+        results["cancelled"] = batch["cancelled"]
+        results["retries"] = batch["retries"]
+        results["retry_budget"] = batch["retry_budget"]
+        return results
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Regras declarativas de organização de repositórios GitHub
+Carrega políticas de um arquivo JSON e as avalia de uma vez sobre todos os
+repositórios: datas são convertidas uma única vez para uma tabela colunar e
+cada condição vira uma máscara de bits (int) sobre a coluna inteira
+"""
+
+import os
+import re
+import json
+import operator
+from datetime import datetime, timezone
+from itertools import compress, repeat
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Equivalente às regras fixas originais do workflow_organizer.py
+DEFAULT_RULES: Dict[str, Any] = {
+    "default": "active",
+    "rules": [
+        {
+            "category": "to_delete",
+            "reason": "temporário/teste",
+            "when": {
+                "name": {"prefix": ["temp-", "test-", "demo-", "experiment-"]},
+                "age_days": {">": 90},
+            },
+        },
+        {
+            "category": "to_archive",
+            "reason": "{age_days} dias sem atualização",
+            "when": {
+                "archived": False,
+                "age_days": {">": 365},
+                "stars": 0,
+                "forks": 0,
+            },
+        },
+        {"category": "to_update", "when": {"has_description": False}},
+    ],
+}
+
+
+def _days_since(field: str) -> Callable[[List[Dict], datetime], List[int]]:
+    """Coluna de idade em dias de uma data ISO 8601 do GitHub (-1 sem data)"""
+
+    def build(repos: List[Dict], now: datetime) -> List[int]:
+        # Formato ISO 8601 do GitHub: 2024-01-14T05:25:19Z
+        parse = datetime.fromisoformat
+        return [
+            (now - parse(value.replace("Z", "+00:00"))).days if value else -1
+            for value in [repo.get(field) for repo in repos]
+        ]
+
+    return build
+
+
+def _owner(repo: Dict) -> str:
+    return repo.get("owner", {}).get("login") or repo["full_name"].split("/")[0]
+
+
+# Colunas disponíveis nas regras: nome -> construtor (repos, agora) -> valores
+_COLUMNS: Dict[str, Callable[[List[Dict], datetime], List[Any]]] = {
+    "name": lambda repos, now: [r["name"].lower() for r in repos],
+    "owner": lambda repos, now: [_owner(r) for r in repos],
+    "language": lambda repos, now: [(r.get("language") or "").lower() for r in repos],
+    "topics": lambda repos, now: [r.get("topics") or [] for r in repos],
+    "archived": lambda repos, now: [bool(r.get("archived")) for r in repos],
+    "fork": lambda repos, now: [bool(r.get("fork")) for r in repos],
+    "private": lambda repos, now: [bool(r.get("private")) for r in repos],
+    "has_description": lambda repos, now: [bool(r.get("description")) for r in repos],
+    "stars": lambda repos, now: [r.get("stargazers_count") or 0 for r in repos],
+    "forks": lambda repos, now: [r.get("forks_count") or 0 for r in repos],
+    "age_days": _days_since("updated_at"),
+    "pushed_days": _days_since("pushed_at"),
+    "created_days": _days_since("created_at"),
+}
+
+
+class _Columns(dict):
+    """Colunas construídas no primeiro acesso (só as usadas pelas regras)"""
+
+    def __init__(self, repos: List[Dict], now: datetime):
+        super().__init__()
+        self.repos = repos
+        self.now = now
+
+    def __missing__(self, name: str) -> List[Any]:
+        if name not in _COLUMNS:
+            raise ValueError(f"Coluna desconhecida nas regras: {name}")
+        self[name] = values = _COLUMNS[name](self.repos, self.now)
+        return values
+
+
+class _Row:
+    """Uma linha da tabela como mapeamento (para str.format_map)"""
+
+    def __init__(self, columns: _Columns, index: int):
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name][self.index]
+
+
+class RepoTable:
+    """
+    Repositórios em colunas (uma lista por campo), com datas já convertidas
+
+    Cada coluna é montada uma vez, no primeiro uso: as datas de cada repo
+    são convertidas uma única vez, não a cada regra que as consulta.
+    """
+
+    def __init__(self, repos: List[Dict], now: Optional[datetime] = None):
+        """
+        Args:
+            repos: Repositórios no formato da API REST (ou _graphql_repo_to_rest)
+            now: Referência para as idades (padrão: agora, UTC)
+        """
+        self.repos = repos
+        self.size = len(repos)
+        self.all = (1 << self.size) - 1
+        self.columns = _Columns(repos, now or datetime.now(timezone.utc))
+        self._masks: Dict[str, int] = {}
+
+    def format(self, template: str, index: int) -> str:
+        """Formata um texto com os valores de uma linha (ex: "{age_days} dias")"""
+        return template.format_map(_Row(self.columns, index))
+
+    @staticmethod
+    def indices(mask: int) -> List[int]:
+        """Linhas presentes na máscara, em ordem"""
+        flags = bin(mask)[:1:-1].encode().translate(_FLAGS)  # bit 0 primeiro
+        return list(compress(range(len(flags)), flags))
+
+    def mask(self, column: str, op: str, value: Any) -> int:
+        """
+        Máscara das linhas em que `coluna <op> valor` é verdadeiro
+
+        Cada condição distinta é avaliada uma vez sobre a coluna inteira e
+        guardada: regras que a repetem só combinam bits.
+        """
+        key = f"{column}\0{op}\0{json.dumps(value, sort_keys=True)}"
+        cached = self._masks.get(key)
+        if cached is not None:
+            return cached
+
+        if op not in _OPS:
+            raise ValueError(f"Operador desconhecido nas regras: {op}")
+        # Um byte 0/1 por linha (map em C, sem laço Python) -> dígitos -> int
+        flags = bytes(_OPS[op](self.columns[column], value))
+        self._masks[key] = result = int(flags[::-1].translate(_BITS) or b"0", 2)
+        return result
+
+
+def _strings(value: Any) -> tuple:
+    return (value,) if isinstance(value, str) else tuple(value)
+
+
+def _compare(op: Callable[[Any, Any], bool]) -> Callable[[List, Any], Iterable]:
+    return lambda column, value: map(op, column, repeat(value))
+
+
+# Operadores: (coluna, valor da regra) -> um bool por linha
+_OPS: Dict[str, Callable[[List[Any], Any], Iterable[bool]]] = {
+    "==": _compare(operator.eq),
+    "!=": _compare(operator.ne),
+    ">": _compare(operator.gt),
+    ">=": _compare(operator.ge),
+    "<": _compare(operator.lt),
+    "<=": _compare(operator.le),
+    "in": lambda column, value: map(set(value).__contains__, column),
+    "not_in": lambda column, value: map(
+        operator.not_, map(set(value).__contains__, column)
+    ),
+    "prefix": lambda column, value: map(
+        str.startswith, column, repeat(_strings(value))
+    ),
+    "suffix": lambda column, value: map(str.endswith, column, repeat(_strings(value))),
+    "contains": _compare(operator.contains),
+    "regex": lambda column, value: map(bool, map(re.compile(value).search, column)),
+}
+
+# Tipo de cada coluna e operadores que fazem sentido para ele (conferidos ao
+# montar o RuleSet: um par inválido falharia só no meio da avaliação)
+_COLUMN_TYPES: Dict[str, type] = {
+    "name": str,
+    "owner": str,
+    "language": str,
+    "topics": list,
+    "archived": bool,
+    "fork": bool,
+    "private": bool,
+    "has_description": bool,
+    "stars": int,
+    "forks": int,
+    "age_days": int,
+    "pushed_days": int,
+    "created_days": int,
+}
+_TYPE_OPS: Dict[type, frozenset] = {
+    str: frozenset(_OPS),
+    int: frozenset({"==", "!=", ">", ">=", "<", "<=", "in", "not_in"}),
+    bool: frozenset({"==", "!=", "in", "not_in"}),
+    # Lista de topics: igualdade com uma lista ou `contains` de um topic
+    list: frozenset({"==", "!=", "contains"}),
+}
+_TYPE_NAMES = {str: "texto", int: "número", bool: "booleano", list: "lista"}
+
+
+def _is_type(kind: type, value: Any) -> bool:
+    """True se o valor da regra é comparável com uma coluna do tipo `kind`"""
+    if kind is int:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if kind is list:
+        return isinstance(value, list) and all(isinstance(v, str) for v in value)
+    return isinstance(value, kind)
+
+
+def _check_condition(column: str, op: str, value: Any) -> Optional[str]:
+    """Problema de uma condição `coluna <op> valor` (None = válida)"""
+    kind = _COLUMN_TYPES.get(column)
+    if kind is None:
+        return f"coluna desconhecida: {column}"
+    if op not in _OPS:
+        return f"operador desconhecido: {op}"
+    if op not in _TYPE_OPS[kind]:
+        accepted = ", ".join(sorted(_TYPE_OPS[kind]))
+        return (
+            f"'{op}' não se aplica a {column} ({_TYPE_NAMES[kind]}); "
+            f"operadores aceitos: {accepted}"
+        )
+    if op in ("==", "!="):
+        if not _is_type(kind, value):
+            return f"'{op}' em {column} espera {_TYPE_NAMES[kind]}"
+    elif op in ("in", "not_in"):
+        if not isinstance(value, list) or not all(_is_type(kind, v) for v in value):
+            return f"'{op}' em {column} espera uma lista de {_TYPE_NAMES[kind]}"
+    elif op in ("prefix", "suffix", "contains"):
+        values = value if isinstance(value, list) and op != "contains" else [value]
+        if not all(isinstance(v, str) for v in values):
+            return f"'{op}' em {column} espera texto"
+    elif op == "regex":
+        try:
+            re.compile(value)
+        except (re.error, TypeError) as e:
+            return f"regex inválida em {column}: {e}"
+    elif op in (">", ">=", "<", "<="):
+        if not _is_type(kind, value):
+            return f"'{op}' em {column} espera {_TYPE_NAMES[kind]}"
+    return None
+
+
+# Tradução entre bytes 0/1 e dígitos binários ASCII
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class RuleSet:
+    """
+    Políticas de categorização (primeira regra que casa define a categoria)
+
+    Formato (JSON):
+        {
+          "default": "active",
+          "rules": [
+            {"category": "to_archive",
+             "reason": "{age_days} dias sem atualização",
+             "when": {"archived": false, "age_days": {">": 365}}},
+            {"category": "to_update",
+             "when": {"any": [{"has_description": false}, {"topics": {"==": []}}]}}
+          ]
+        }
+
+    Condições em `when` são combinadas com E; `any` recebe uma lista de
+    blocos combinados com OU. Um valor simples é igualdade; um dict mapeia
+    operador -> valor (==, !=, >, >=, <, <=, in, not_in, prefix, suffix,
+    contains, regex). Colunas: ver _COLUMNS (name e language em
+    minúsculas; idades em dias, -1 sem data). Cada operador só vale para
+    alguns tipos de coluna (ver _TYPE_OPS): em topics, use `contains`.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: Políticas no formato acima (None = DEFAULT_RULES; {} = sem
+                regras, tudo na categoria padrão)
+
+        Raises:
+            ValueError: Regra sem categoria, coluna ou operador desconhecido,
+                ou operador/valor incompatível com o tipo da coluna
+        """
+        if config is None:
+            config = DEFAULT_RULES
+        self.default = config.get("default", "active")
+        self.rules: List[Dict[str, Any]] = config.get("rules", [])
+        for n, rule in enumerate(self.rules, 1):
+            category = rule.get("category") if isinstance(rule, dict) else None
+            if not category or not isinstance(category, str):
+                raise ValueError(f"Regras, regra {n}: 'category' (texto) é obrigatório")
+            self._validate(rule.get("when", {}), f"regra {n} ({category})")
+        self.categories = [r["category"] for r in self.rules]
+        if self.default not in self.categories:
+            self.categories.append(self.default)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "RuleSet":
+        """Carrega regras de um arquivo JSON (padrão: GH_ORGANIZER_RULES)"""
+        path = path or os.getenv("GH_ORGANIZER_RULES")
+        if not path:
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _validate(self, when: Dict[str, Any], where: str):
+        """Confere as condições de um bloco `when` antes de qualquer avaliação"""
+        if not isinstance(when, dict):
+            raise ValueError(f"Regras, {where}: condições devem ser um objeto")
+        for column, condition in when.items():
+            if column == "any":
+                if not isinstance(condition, list):
+                    raise ValueError(f"Regras, {where}: 'any' espera uma lista")
+                for block in condition:
+                    self._validate(block, where)
+                continue
+            ops = condition if isinstance(condition, dict) else {"==": condition}
+            for op, value in ops.items():
+                problem = _check_condition(column, op, value)
+                if problem:
+                    raise ValueError(f"Regras, {where}: {problem}")
+
+    def _match(self, table: RepoTable, when: Dict[str, Any]) -> int:
+        """Máscara das linhas que satisfazem um bloco `when`"""
+        mask = table.all
+        for column, condition in when.items():
+            if column == "any":
+                alternatives = 0
+                for block in condition:
+                    alternatives |= self._match(table, block)
+                mask &= alternatives
+            elif isinstance(condition, dict):
+                for op, value in condition.items():
+                    mask &= table.mask(column, op, value)
+            else:
+                mask &= table.mask(column, "==", condition)
+            if not mask:
+                break
+        return mask
+
+    def assign(self, table: RepoTable) -> Dict[str, List[int]]:
+        """
+        Categoria de cada linha da tabela
+
+        Returns:
+            Dict categoria -> índices das linhas (ordem original)
+        """
+        remaining = table.all
+        masks = {category: 0 for category in self.categories}
+        for rule in self.rules:
+            hit = self._match(table, rule.get("when", {})) & remaining
+            masks[rule["category"]] |= hit
+            remaining &= ~hit
+        masks[self.default] |= remaining
+        return {category: table.indices(mask) for category, mask in masks.items()}
+
+    def reason(self, table: RepoTable, index: int, category: str) -> str:
+        """Motivo legível da categoria (campo `reason` da regra, formatado)"""
+        for rule in self.rules:
+            if rule["category"] == category and rule.get("reason"):
+                return table.format(rule["reason"], index)
+        return ""
@@ -32,9 +32,11 @@ source .venv/bin/activate
 echo -e "${BLUE}Atualizando pip...${NC}"
 python3 -m pip install --upgrade pip
 
-# Instalar dependências
+# Instalar dependências (--async inclui o aiohttp do cliente assíncrono)
 echo -e "${BLUE}Instalando dependências...${NC}"
-if [ -f "requirements.txt" ]; then
+if [ "${1:-}" = "--async" ] && [ -f "requirements-async.txt" ]; then
+    python3 -m pip install -r requirements-async.txt
+elif [ -f "requirements.txt" ]; then
     python3 -m pip install -r requirements.txt
 else
     echo -e "${YELLOW}Aviso: requirements.txt não encontrado. Instalando requests padrão...${NC}"
@@ -0,0 +1,815 @@
+#!/usr/bin/env python3
+"""
+Testes contra o simulador local (github_simulator.py)
+
+Rodam sem token nem rede: cada teste sobe um GitHubSimulator em uma porta
+livre e aponta o gerenciador para ele.
+
+Uso:
+    pytest test_simulator.py
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+import gh_cli
+import repo_mirror
+from github_repo_manager import (
+    CassetteAdapter,
+    CassetteMiss,
+    GitHubRepoManager,
+    MetricsSummary,
+    RateLimiter,
+    ResponseCache,
+    RetryPolicy,
+    verify_archive,
+)
+from github_simulator import GitHubSimulator, SimulatorConfig
+from repo_mirror import FULL_SYNC_INTERVAL, RepoMirror
+from repo_plan import Journal, Plan, PlanExecutor, PlanOp
+from repo_rules import RepoTable, RuleSet
+from workflow_organizer import RepoOrganizer
+
+# Retries sem pausas reais: os testes medem contagens, não tempo
+FAST_RETRIES = dict(backoff=0.001, max_backoff=0.01)
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(tmp_path, monkeypatch):
+    """Caches e destinos de métricas fora do HOME do usuário"""
+    monkeypatch.setenv("GH_AUTH_CACHE", str(tmp_path / "auth.json"))
+    for var in (
+        "GH_API_URL",
+        "GH_CACHE_DB",
+        "GH_CASSETTE",
+        "GH_METRICS_JSONL",
+        "GH_ORGANIZER_RULES",
+    ):
+        monkeypatch.delenv(var, raising=False)
+
+
+@pytest.fixture
+def simulator():
+    """Fábrica de simuladores: simulator(**SimulatorConfig) -> servidor no ar"""
+    running = []
+
+    def start(**config) -> GitHubSimulator:
+        sim = GitHubSimulator(SimulatorConfig(**config), port=0).start()
+        running.append(sim)
+        return sim
+
+    yield start
+    for sim in running:
+        sim.stop()
+
+
+def manager(sim: GitHubSimulator, tmp_path, **kwargs) -> GitHubRepoManager:
+    """Gerenciador ligado ao simulador (token próprio: limites não vazam)"""
+    kwargs.setdefault("retry_policy", RetryPolicy(**FAST_RETRIES))
+    return GitHubRepoManager(
+        token=f"simulado-{tmp_path.name}", base_url=sim.url, **kwargs
+    )
+
+
+def async_manager(sim: GitHubSimulator, tmp_path, **kwargs):
+    """AsyncGitHubRepoManager ligado ao simulador (pula o teste sem aiohttp)"""
+    pytest.importorskip("aiohttp")
+    from async_github_repo_manager import AsyncGitHubRepoManager
+
+    kwargs.setdefault("retry_policy", RetryPolicy(**FAST_RETRIES))
+    return AsyncGitHubRepoManager(
+        token=f"simulado-{tmp_path.name}", base_url=sim.url, **kwargs
+    )
+
+
+def cli_env(monkeypatch, sim: GitHubSimulator, tmp_path):
+    """Aponta o gh_cli para o simulador, com espelho e backups do teste"""
+    monkeypatch.setenv("GH_TOKEN", f"simulado-{tmp_path.name}")
+    monkeypatch.setenv("GH_API_URL", sim.url)
+    monkeypatch.setenv("GH_MIRROR_DB", str(tmp_path / "mirror.db"))
+    monkeypatch.setenv("GH_BACKUP_DIR", str(tmp_path / "backups"))
+    monkeypatch.setattr(gh_cli, "_manager", None)
+    monkeypatch.setattr(gh_cli, "_sinks", [])
+
+
+def cli(monkeypatch, sim: GitHubSimulator, tmp_path, *argv: str):
+    """Roda gh_cli.main com o simulador e um espelho próprio do teste"""
+    cli_env(monkeypatch, sim, tmp_path)
+    monkeypatch.setattr(sys, "argv", ["gh_cli.py", *argv])
+    try:
+        gh_cli.main()
+    finally:
+        if gh_cli._manager is not None:
+            gh_cli._manager.close()
+
+
+def repo_pairs(sim: GitHubSimulator, owner: str = "octocat") -> list:
+    return sorted((owner, r["name"]) for r in sim.repos(owner))
+
+
+# ==================== PAGINAÇÃO ====================
+
+
+def test_paginate_follows_link_header(simulator, tmp_path):
+    """Todas as páginas chegam pelo Link rel="next", sem repetir itens"""
+    sim = simulator(accounts={"octocat": 250})
+    with manager(sim, tmp_path) as gh:
+        repos = list(gh.iter_repos(per_page=100))
+
+    names = [r["full_name"] for r in repos]
+    assert len(names) == 250
+    assert len(set(names)) == 250
+    updated = [r["updated_at"] for r in repos]
+    assert updated == sorted(updated, reverse=True)
+    assert sim.stats()["by_route"]["GET user_repos"] == 3
+
+
+def test_paginate_prefetches_next_page(simulator, tmp_path):
+    """A página seguinte é pedida enquanto o chamador ainda está na primeira"""
+    sim = simulator(accounts={"octocat": 250})
+    with manager(sim, tmp_path) as gh:
+        pages = gh.iter_repos(per_page=100)
+        next(pages)
+
+        deadline = time.monotonic() + 5
+        while sim.stats()["by_route"].get("GET user_repos", 0) < 2:
+            assert time.monotonic() < deadline, "segunda página não foi pedida"
+            time.sleep(0.01)
+        pages.close()
+
+
+def test_async_paginate_follows_link_header(simulator, tmp_path):
+    """O cliente assíncrono pagina (com prefetch) como o síncrono"""
+    sim = simulator(accounts={"octocat": 250})
+
+    async def collect():
+        async with async_manager(sim, tmp_path) as gh:
+            return [r["full_name"] async for r in gh.iter_repos(per_page=100)]
+
+    names = asyncio.run(collect())
+    assert len(set(names)) == 250
+    assert sim.stats()["by_route"]["GET user_repos"] == 3
+
+
+# ==================== LOTES ====================
+
+
+def test_run_batch_cancel_skips_pending_items(simulator, tmp_path):
+    """Itens ainda não iniciados viram "cancelled" e não são executados"""
+    sim = simulator(accounts={"octocat": 10})
+    repos = repo_pairs(sim)
+    cancel = threading.Event()
+    calls = []
+
+    def operation(owner: str, repo: str):
+        calls.append(repo)
+        if len(calls) == 3:
+            cancel.set()
+
+    with manager(sim, tmp_path) as gh:
+        results = gh.run_batch(operation, repos, max_workers=1, cancel=cancel)
+
+    assert len(calls) == 3
+    assert len(results["success"]) == 3
+    assert len(results["cancelled"]) == 7
+    assert results["failed"] == []
+
+
+def test_delete_multiple_cancel_keeps_remaining_repos(simulator, tmp_path):
+    """Cancelar um lote de deleção mantém os repos que não foram processados"""
+    sim = simulator(accounts={"octocat": 5})
+    repos = repo_pairs(sim)
+    cancel = threading.Event()
+
+    with manager(sim, tmp_path) as gh:
+        delete_repo = gh.delete_repo
+
+        def delete_then_cancel(*args, **kwargs):
+            try:
+                return delete_repo(*args, **kwargs)
+            finally:
+                cancel.set()
+
+        gh.delete_repo = delete_then_cancel
+        results = gh.delete_multiple(repos, confirm=True, max_workers=1, cancel=cancel)
+
+    assert len(results["success"]) == 1
+    assert len(results["cancelled"]) == 4
+    remaining = {f"octocat/{name}" for _, name in repo_pairs(sim)}
+    assert remaining == set(results["cancelled"])
+
+
+def test_async_cancel_lets_started_items_finish(simulator, tmp_path):
+    """Cancelar o lote assíncrono não corta as deleções já em andamento"""
+    sim = simulator(accounts={"octocat": 6}, latency=0.3)
+    repos = repo_pairs(sim)
+    finished = []
+
+    def progress(done, total, name, error):
+        finished.append((name, error))
+
+    async def scenario():
+        async with async_manager(sim, tmp_path) as gh:
+            batch = asyncio.create_task(
+                gh.delete_multiple(
+                    repos, confirm=True, max_workers=2, progress=progress
+                )
+            )
+            await asyncio.sleep(0.1)
+            batch.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await batch
+
+    asyncio.run(scenario())
+    assert [error for _, error in finished] == [None, None]
+    remaining = {f"octocat/{name}" for _, name in repo_pairs(sim)}
+    assert len(remaining) == 4
+    assert not remaining & {name for name, _ in finished}
+
+
+def test_retry_budget_caps_batch_retries(simulator, tmp_path):
+    """Com a API fora do ar, o lote para de repetir quando o orçamento acaba"""
+    sim = simulator(accounts={"octocat": 20}, error_rate=1.0)
+    repos = repo_pairs(sim)
+    policy = RetryPolicy(
+        max_attempts=4, batch_ratio=0, min_batch_budget=5, **FAST_RETRIES
+    )
+
+    with manager(sim, tmp_path, retry_policy=policy) as gh:
+        results = gh.run_batch(gh.get_repo, repos, max_workers=4)
+
+    assert len(results["failed"]) == 20
+    assert results["retry_budget"] == {"limit": 5, "used": 5}
+    assert sum(results["retries"].values()) == 5
+    assert sim.stats()["by_route"]["GET get_repo"] == 20 + 5
+
+
+def test_single_request_retries_transient_errors(simulator, tmp_path):
+    """Fora de lote, cada requisição tem suas próprias tentativas"""
+    sim = simulator(accounts={"octocat": 1}, error_rate=1.0)
+    ((owner, name),) = repo_pairs(sim)
+
+    with manager(sim, tmp_path) as gh:
+        with pytest.raises(Exception):
+            gh.get_repo(owner, name)
+
+    assert sim.stats()["by_route"]["GET get_repo"] == RetryPolicy().max_attempts
+
+
+# ==================== VÁRIOS DONOS ====================
+
+
+def test_scan_owners_lists_users_and_orgs(simulator, tmp_path):
+    """Usuários e orgs em paralelo; o 404 de /orgs é pago uma vez por dono"""
+    sim = simulator(accounts={"octocat": 120, "acme": 250, "alice": 30}, orgs=["acme"])
+    owners = ["octocat", "acme", "alice", "fantasma"]
+
+    with manager(sim, tmp_path) as gh:
+        results = {r["owner"]: r for r in gh.scan_owners(owners, max_workers=4)}
+        assert set(results) == set(owners)
+        for owner in ("octocat", "acme", "alice"):
+            listed = sorted(r["full_name"] for r in results[owner]["repos"])
+            assert listed == sorted(r["full_name"] for r in sim.repos(owner))
+            assert results[owner]["error"] is None
+        assert "404" in results["fantasma"]["error"]
+        assert sim.stats()["by_route"] == {
+            "GET org_repos": 3 + 3,  # acme (3 páginas) + 404 de cada não-org
+            "GET owner_repos": 2 + 1 + 1,  # octocat, alice, fantasma (404)
+        }
+
+        sim.reset_stats()
+        list(gh.scan_owners(owners))
+        assert sim.stats()["by_route"] == {"GET org_repos": 3, "GET owner_repos": 4}
+
+
+# ==================== RATE LIMIT ====================
+
+
+def test_rate_limiter_holds_requests_when_budget_runs_out(simulator, tmp_path):
+    """Com X-RateLimit-Remaining = 0 o limiter segura o token até o reset"""
+    sim = simulator(accounts={"octocat": 8}, rate_limit=5)
+    pairs = repo_pairs(sim)
+    limiter = RateLimiter()
+
+    with manager(sim, tmp_path, rate_limiter=limiter) as gh:
+        for pair in pairs[:5]:
+            gh.get_repo(*pair)
+    budget = limiter.budget()
+    assert (budget["limit"], budget["remaining"]) == (5, 0)
+    assert budget["reset_at"] > time.time()
+    # Espera até o reset (uma hora no simulador), limitada a max_wait
+    assert limiter.try_acquire() == limiter.max_wait
+    assert 403 not in sim.stats()["by_status"]
+
+
+def test_rate_limit_403_is_returned_when_reset_exceeds_max_wait(simulator, tmp_path):
+    """Sem orçamento conhecido, o 403 do servidor atualiza o limiter e volta"""
+    sim = simulator(accounts={"octocat": 2}, rate_limit=1)
+    first, second = repo_pairs(sim)
+    limiter = RateLimiter(max_wait=0)
+
+    with manager(sim, tmp_path, rate_limiter=RateLimiter()) as gh:
+        gh.get_repo(*first)
+    with manager(sim, tmp_path, rate_limiter=limiter) as gh:
+        with pytest.raises(requests.HTTPError) as error:
+            gh.get_repo(*second)
+    assert error.value.response.status_code == 403
+    assert limiter.budget()["remaining"] == 0
+    assert sim.stats()["by_status"] == {200: 1, 403: 1}
+
+
+# ==================== CACHE HTTP ====================
+
+
+def test_conditional_get_serves_304_from_cache(simulator, tmp_path):
+    """2º GET volta 304 (servido do cache); mudança no repo traz um 200 novo"""
+    sim = simulator(accounts={"octocat": 3})
+    (owner, name), *_ = repo_pairs(sim)
+
+    with manager(sim, tmp_path) as gh:
+        first = gh.get_repo(owner, name)
+        assert gh.get_repo(owner, name) == first
+        assert sim.stats()["by_status"] == {200: 1, 304: 1}
+        assert gh.cache.stats()["hits"] == 1
+
+        gh.update_repo(owner, name, description="nova")
+        assert gh.get_repo(owner, name)["description"] == "nova"
+        assert gh.cache.stats()["hits"] == 1
+
+
+def test_response_cache_memory_is_bounded(simulator, tmp_path):
+    """O LRU guarda max_entries respostas; as que saem voltam do SQLite"""
+    sim = simulator(accounts={"octocat": 3})
+    a, b, c = repo_pairs(sim)
+
+    with manager(sim, tmp_path, cache=ResponseCache(max_entries=2)) as gh:
+        for pair in (a, b, c, c, a):
+            gh.get_repo(*pair)
+        assert gh.cache.stats()["entries"] == 2
+        assert gh.cache.stats()["hits"] == 1  # c; a já tinha saído do LRU
+
+    cache = ResponseCache(str(tmp_path / "http.db"), max_entries=1)
+    with manager(sim, tmp_path, cache=cache) as gh:
+        sim.reset_stats()
+        for pair in (a, b, a):
+            gh.get_repo(*pair)
+        assert gh.cache.stats()["entries"] == 1
+        assert sim.stats()["by_status"] == {200: 2, 304: 1}
+
+
+# ==================== MÉTRICAS ====================
+
+
+def test_metrics_sinks_aggregate_by_endpoint_template(simulator, tmp_path, monkeypatch):
+    """Um evento por requisição, agregado pelo template do endpoint"""
+    sim = simulator(accounts={"octocat": 5})
+    a, b, *_ = repo_pairs(sim)
+    events = tmp_path / "events.jsonl"
+    monkeypatch.setenv("GH_METRICS_JSONL", str(events))
+    summary = MetricsSummary()
+
+    with manager(sim, tmp_path, sinks=[summary]) as gh:
+        gh.list_repos(per_page=5)
+        for pair in (a, a, b):
+            gh.get_repo(*pair)
+        with pytest.raises(requests.HTTPError):
+            gh.get_repo("octocat", "nao-existe")
+
+    rows = {(r["method"], r["endpoint"]): r for r in summary.summary()}
+    assert set(rows) == {("GET", "/user/repos"), ("GET", "/repos/{owner}/{repo}")}
+    repo = rows["GET", "/repos/{owner}/{repo}"]
+    assert (repo["count"], repo["errors"], repo["cached"]) == (4, 1, 1)
+
+    lines = [json.loads(line) for line in events.read_text().splitlines()]
+    assert len(lines) == sim.stats()["requests"] == 5
+    # O 304 chega aos sinks como o 200 servido do cache, sem bytes recebidos
+    assert [e["status"] for e in lines[1:]] == [200, 200, 200, 404]
+    assert [e["cached"] for e in lines[1:]] == [False, True, False, False]
+    assert lines[2]["bytes"] == 0 and lines[1]["bytes"] > 0
+
+
+# ==================== TOPICS ====================
+
+
+def test_reconcile_topics_only_puts_repos_that_change(simulator, tmp_path):
+    """PUT só onde o alvo difere; sem "topics" na listagem custa um GET antes"""
+    sim = simulator(accounts={"octocat": 60})
+
+    def target(repo: dict) -> list:
+        extra = ["Tooling"] if repo["language"] == "Python" else []
+        return repo["topics"] + extra
+
+    with manager(sim, tmp_path) as gh:
+        repos = gh.list_repos(per_page=100)
+        active = [r for r in repos if not r["archived"]]
+        python = {r["full_name"] for r in active if r["language"] == "Python"}
+        other = next(r for r in active if r["language"] != "Python")
+        listed = next(r for r in active if r["full_name"] in python)
+        blind = next(
+            r for r in active if r["full_name"] in python - {listed["full_name"]}
+        )
+        for repo in (other, blind):
+            del repo["topics"]
+
+        sim.reset_stats()
+        results = gh.reconcile_topics(repos, target)
+        routes = sim.stats()["by_route"]
+        assert routes == {"GET get_topics": 2, "PUT set_topics": len(python)}
+        assert set(results["topics"]) == python
+        assert results["unchanged"] == len(active) - len(python)
+        assert "tooling" in sim.state.repos["octocat"][blind["name"]]["topics"]
+
+        sim.reset_stats()
+        again = gh.reconcile_topics(gh.list_repos(per_page=100), target)
+        assert sim.stats()["by_route"] == {"GET user_repos": 1}
+        assert (again["topics"], again["unchanged"]) == ({}, len(active))
+
+
+# ==================== CASSETE ====================
+
+
+def test_cassette_replays_recorded_session_offline(simulator, tmp_path):
+    """Grava contra o simulador e reproduz com ele desligado"""
+    sim = simulator(accounts={"octocat": 40})
+    (owner, name), *_ = repo_pairs(sim)
+    path = str(tmp_path / "sessao.json.gz")
+
+    recorder = CassetteAdapter(path, mode="record")
+    with manager(sim, tmp_path, transport=recorder) as gh:
+        recorded = (gh.list_repos(per_page=15), gh.get_repo(owner, name))
+    url, requests_made = sim.url, sim.stats()["requests"]
+    sim.stop()
+
+    player = CassetteAdapter(path, mode="replay", time_scale=0)
+    with GitHubRepoManager(
+        token=f"simulado-{tmp_path.name}", base_url=url, transport=player
+    ) as gh:
+        assert (gh.list_repos(per_page=15), gh.get_repo(owner, name)) == recorded
+        with pytest.raises(CassetteMiss):
+            gh.get_repo(owner, "nao-gravado")
+
+    stats = player.stats()
+    assert stats["requests"] == stats["recorded"] == requests_made
+    assert stats["unused"] == 0 and len(stats["misses"]) == 1
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert f"simulado-{tmp_path.name}" not in f.read()
+
+
+# ==================== ESPELHO ====================
+
+
+def test_mirror_incremental_sync_and_full_prune(simulator, tmp_path):
+    """Sync incremental traz mudanças; só a completa remove repos deletados"""
+    sim = simulator(accounts={"octocat": 50})
+    (_, changed), (_, deleted), *_ = repo_pairs(sim)
+
+    with manager(sim, tmp_path) as gh, RepoMirror(gh, str(tmp_path / "m.db")) as m:
+        first = m.sync()
+        assert (first["mode"], first["upserted"]) == ("full", 50)
+
+        gh.update_repo("octocat", changed, description="alterado")
+        gh.delete_repo("octocat", deleted, confirm=True)
+        sim.reset_stats()
+
+        second = m.sync()
+        assert second["mode"] == "incremental"
+        assert second["removed"] == 0
+        assert sim.stats()["by_route"]["GET user_repos"] == 1
+        mirrored = {r["name"]: r for r in m.query()}
+        assert mirrored[changed]["description"] == "alterado"
+        assert deleted in mirrored
+
+        # Vence o intervalo da sync completa: a próxima relê tudo e poda
+        expired = datetime.now(timezone.utc) - timedelta(seconds=FULL_SYNC_INTERVAL)
+        with m.db:
+            m.db.execute(
+                "UPDATE sync_state SET full_synced_at = ?", (expired.isoformat(),)
+            )
+        third = m.sync()
+        assert (third["mode"], third["removed"]) == ("full", 1)
+        assert deleted not in {r["name"] for r in m.query()}
+        assert len(m.query()) == 49
+
+
+def test_list_streams_filtered_rows_from_mirror(
+    simulator, tmp_path, monkeypatch, capfd
+):
+    """list filtra no SQLite e escreve as linhas do cursor; 2ª vez sem API"""
+    sim = simulator(accounts={"octocat": 300})
+    archived = {r["full_name"] for r in sim.repos() if r["archived"]}
+
+    cli(monkeypatch, sim, tmp_path, "list", "-f", "jsonl", "--archived-only")
+    out, err = capfd.readouterr()
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert 0 < len(archived) < 30
+    assert {r["full_name"] for r in rows} == archived and len(rows) == len(archived)
+    assert "Espelho sincronizado (full)" in err
+
+    sim.reset_stats()
+    cli(monkeypatch, sim, tmp_path, "list", "-f", "jsonl", "-l", "5", "-s", "pushed")
+    out, err = capfd.readouterr()
+    pushed = [json.loads(line)["pushed_at"] for line in out.splitlines()]
+    assert len(pushed) == 5 and pushed == sorted(pushed, reverse=True)
+    assert "GET user_repos" not in sim.stats()["by_route"]
+
+    decoded = []
+    monkeypatch.setattr(
+        repo_mirror, "json", type("J", (), {"loads": staticmethod(decoded.append)})
+    )
+    with RepoMirror(path=str(tmp_path / "mirror.db")) as m:
+        rows = m.iter_query()
+        next(rows)
+        assert len(decoded) == 1
+        rows.close()
+
+
+def test_shell_session_drops_deleted_repo_from_list_and_completion(
+    simulator, tmp_path, monkeypatch, capfd
+):
+    """Um gerenciador por sessão; o repo deletado some de list e do Tab"""
+    sim = simulator(accounts={"octocat": 12})
+    cli_env(monkeypatch, sim, tmp_path)
+    shell = gh_cli.GhShell(gh_cli.build_parser())
+
+    def listed() -> set:
+        capfd.readouterr()
+        shell.onecmd("list -f jsonl -l 100")
+        out, _ = capfd.readouterr()
+        return {json.loads(line)["name"] for line in out.splitlines()}
+
+    def complete(text: str) -> list:
+        line = f"delete octocat {text}"
+        return shell.completedefault(text, line, len(line) - len(text), len(line))
+
+    try:
+        names = listed()
+        assert names == {r["name"] for r in sim.repos()}
+        victim, prefix = sorted(names)[0], sorted(names)[0][:-1]
+        assert victim in complete(prefix)
+        gh = gh_cli._manager
+
+        shell.onecmd("delete octocat")  # erro do argparse: o shell continua
+        shell.onecmd(f"delete octocat {victim} --yes")
+        assert victim not in {r["name"] for r in sim.repos()}
+        remaining = names - {victim}
+        assert set(complete(prefix)) == {n for n in remaining if n.startswith(prefix)}
+        assert set(complete("")) == remaining
+
+        sim.reset_stats()
+        assert listed() == names - {victim}
+        assert sim.stats()["requests"] == 0  # espelho corrigido, sem nova sync
+        assert gh_cli._manager is gh
+    finally:
+        if gh_cli._manager is not None:
+            gh_cli._manager.close()
+
+
+def test_mirror_forget_and_patch(simulator, tmp_path):
+    """forget e patch refletem mutações sem esperar a próxima sync"""
+    sim = simulator(accounts={"octocat": 5})
+    (_, gone), (_, renamed), (_, archived), *_ = repo_pairs(sim)
+
+    with manager(sim, tmp_path) as gh, RepoMirror(gh, str(tmp_path / "m.db")) as m:
+        m.sync()
+        assert m.forget([f"OctoCat/{gone}"]) == 1
+        m.patch(f"octocat/{archived}", {"archived": True})
+        m.patch(
+            f"octocat/{renamed}",
+            {"name": "novo-nome", "full_name": "octocat/novo-nome"},
+        )
+
+        names = {r["name"] for r in m.query()}
+        assert gone not in names and renamed not in names
+        assert "novo-nome" in names
+        assert archived in {r["name"] for r in m.query(archived=True)}
+
+
+# ==================== BACKUP ====================
+
+
+def test_delete_with_backup_keeps_repo_without_archive(simulator, tmp_path):
+    """Repo só é deletado com backup verificado; repo vazio (sem arquivo) fica"""
+    sim = simulator(accounts={"octocat": 3}, archive_bytes_per_kb=1)
+    repos = repo_pairs(sim)
+    empty = repos[0][1]
+    with sim.state.lock:
+        for name, repo in sim.state.repos["octocat"].items():
+            repo["size"] = 0 if name == empty else max(repo["size"], 1)
+
+    backup_dir = tmp_path / "backups"
+    with manager(sim, tmp_path) as gh:
+        results = gh.delete_multiple(repos, confirm=True, backup_dir=str(backup_dir))
+
+    assert [f["repo"] for f in results["failed"]] == [f"octocat/{empty}"]
+    assert sorted(results["success"]) == [f"octocat/{name}" for _, name in repos[1:]]
+    assert [name for _, name in repo_pairs(sim)] == [empty]
+    for name in results["success"]:
+        backup = results["backups"][name]
+        assert os.path.getsize(backup["path"]) == backup["bytes"]
+        assert verify_archive(backup["path"]) == backup["sha256"]
+
+
+def test_async_delete_with_backup_keeps_repo_without_archive(simulator, tmp_path):
+    """O cliente assíncrono também só deleta repos com backup verificado"""
+    sim = simulator(accounts={"octocat": 3}, archive_bytes_per_kb=1)
+    repos = repo_pairs(sim)
+    empty = repos[0][1]
+    with sim.state.lock:
+        for name, repo in sim.state.repos["octocat"].items():
+            repo["size"] = 0 if name == empty else max(repo["size"], 1)
+
+    async def scenario():
+        async with async_manager(sim, tmp_path) as gh:
+            kept = await gh.backup_repos(repos[1:], str(tmp_path / "antes"))
+            deleted = await gh.delete_multiple(
+                repos, confirm=True, backup_dir=str(tmp_path / "backups")
+            )
+            return kept, deleted
+
+    kept, results = asyncio.run(scenario())
+    assert sorted(kept["backups"]) == [f"octocat/{name}" for _, name in repos[1:]]
+    assert [f["repo"] for f in results["failed"]] == [f"octocat/{empty}"]
+    assert [name for _, name in repo_pairs(sim)] == [empty]
+    for name in results["success"]:
+        backup = results["backups"][name]
+        assert verify_archive(backup["path"]) == backup["sha256"]
+
+
+# ==================== PLANOS ====================
+
+
+def test_organizer_ctrl_c_during_backup_keeps_repo(simulator, tmp_path):
+    """Ctrl-C durante o backup de um delete do plano mantém o repo"""
+    sim = simulator(accounts={"octocat": 1}, archive_bytes_per_kb=1)
+    ((owner, name),) = repo_pairs(sim)
+    with sim.state.lock:
+        sim.state.repos[owner][name]["size"] = max(
+            sim.state.repos[owner][name]["size"], 1
+        )
+    plan = Plan(ops=[PlanOp("delete", owner, name)])
+    journal = tmp_path / "journal.jsonl"
+
+    with manager(sim, tmp_path) as gh:
+        backup_stage = gh.backup_stage
+
+        def interrupted_stage(*args, **kwargs):
+            stage = backup_stage(*args, **kwargs)
+
+            def backup(owner: str, repo: str):
+                result = stage(owner, repo)
+                # Ctrl-C enquanto o worker ainda roda
+                signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+                time.sleep(0.5)
+                return result
+
+            return backup
+
+        gh.backup_stage = interrupted_stage
+        organizer = RepoOrganizer(
+            dry_run=False, force=True, gh=gh, backup_dir=str(tmp_path / "backups")
+        )
+        organizer.apply_plan(plan, str(journal), verify=False)
+
+    assert organizer.stats["deleted"] == 0
+    assert [r["name"] for r in sim.repos(owner)] == [name]
+    assert list((tmp_path / "backups" / owner).glob("*.tar.gz"))
+    entries = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert not [e for e in entries if e["status"] == "done"]
+
+
+def test_plan_resume_skips_done_ops_and_marks_changed_repos_stale(simulator, tmp_path):
+    """Retomada: pula o que o diário tem, pula repos alterados, aplica o resto"""
+    sim = simulator(accounts={"octocat": 3})
+    (_, resumed), (_, changed), (_, pending) = repo_pairs(sim)
+    snapshot = {r["name"]: r for r in sim.repos()}
+
+    def op(kind: str, name: str, **params) -> PlanOp:
+        return PlanOp(
+            kind,
+            "octocat",
+            name,
+            params=params,
+            updated_at=snapshot[name]["updated_at"],
+            pushed_at=snapshot[name]["pushed_at"],
+        )
+
+    plan = Plan(
+        ops=[
+            op("update", resumed, description="a"),
+            op("topics", resumed, topics=["python"]),
+            op("update", changed, description="b"),
+            op("update", pending, description="c"),
+        ]
+    )
+    journal_path = str(tmp_path / "journal.jsonl")
+
+    with manager(sim, tmp_path) as gh:
+        # Primeira execução "cai" depois do update de um repo
+        gh.update_repo("octocat", resumed, description="a")
+        with Journal(journal_path) as journal:
+            journal.record(plan, plan.ops[0], "done")
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('{"plan": "' + plan.fingerprint + '", "op": "topi')
+        # Alguém mexe em outro repo antes da retomada
+        gh.update_repo("octocat", changed, description="mudou")
+        sim.reset_stats()
+
+        with Journal(journal_path) as journal:
+            results = PlanExecutor(gh, journal).apply(plan)
+
+    assert results["skipped"] == 1
+    assert results["done"]["update"] == 1
+    assert results["done"]["topics"] == 1
+    assert [s["op"] for s in results["stale"]] == [f"update:octocat/{changed}"]
+    assert "updated_at" in results["stale"][0]["reason"]
+    assert sim.stats()["by_route"]["PATCH update_repo"] == 1
+    repos = {r["name"]: r for r in sim.repos()}
+    assert repos[changed]["description"] == "mudou"
+    assert repos[pending]["description"] == "c"
+    assert repos[resumed]["topics"] == ["python"]
+
+    with Journal(journal_path) as journal:
+        assert len(journal.completed(plan)) == 3
+    with open(journal_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    # Só a linha truncada da "queda" fica ilegível; nenhuma entrada emendada
+    assert len(lines) == 1 + 1 + 3
+    assert sum(1 for line in lines if line.endswith("}")) == 4
+
+
+# ==================== REGRAS ====================
+
+
+def test_ruleset_matches_per_repo_evaluation(simulator, tmp_path):
+    """Máscaras sobre a tabela colunar = avaliar repo a repo em Python"""
+    sim = simulator(accounts={"octocat": 300})
+    rules = RuleSet(
+        {
+            "default": "keep",
+            "rules": [
+                {
+                    "category": "popular",
+                    "when": {"stars": {">=": 500}, "archived": False},
+                },
+                {
+                    "category": "stale",
+                    "reason": "{age_days} dias",
+                    "when": {
+                        "any": [{"age_days": {">": 365}}, {"fork": True}],
+                        "language": {"in": ["python", "go", ""]},
+                    },
+                },
+            ],
+        }
+    )
+    with manager(sim, tmp_path) as gh:
+        repos = list(gh.iter_repos())
+    now = datetime.now(timezone.utc)
+    table = RepoTable(repos, now)
+
+    def expected(repo) -> str:
+        if repo["stargazers_count"] >= 500 and not repo["archived"]:
+            return "popular"
+        updated = datetime.fromisoformat(repo["updated_at"].replace("Z", "+00:00"))
+        old = (now - updated).days > 365
+        language = (repo.get("language") or "").lower()
+        if (old or repo["fork"]) and language in ("python", "go", ""):
+            return "stale"
+        return "keep"
+
+    categories = rules.assign(table)
+    assert sum(map(len, categories.values())) == len(repos)
+    for category, indices in categories.items():
+        assert all(expected(repos[i]) == category for i in indices)
+    assert all(categories.values())
+    i = categories["stale"][0]
+    assert rules.reason(table, i, "stale") == f"{table.columns['age_days'][i]} dias"
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"when": {"stars": 0}},
+        {"category": "x", "when": {"stars": "0"}},
+        {"category": "x", "when": {"archived": "false"}},
+        {"category": "x", "when": {"language": {"in": ["python", 3]}}},
+        {"category": "x", "when": {"topics": {"in": ["python"]}}},
+        {"category": "x", "when": {"age_days": {">": "10"}}},
+        {"category": "x", "when": {"any": ["fork"]}},
+        {"category": "x", "when": {"size": 0}},
+    ],
+)
+def test_ruleset_rejects_invalid_rules_up_front(rule):
+    """Regra inválida falha ao montar o RuleSet, com ValueError"""
+    with pytest.raises(ValueError, match="^Regras, regra 1"):
+        RuleSet({"rules": [rule]})
@@ -4,31 +4,63 @@ Workflow Completo de Gerenciamento de Repositórios GitHub
 Exemplo de uso real: limpeza e organização de repositórios
 """
 
+import os
 import sys
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict
-from github_repo_manager import GitHubRepoManager
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from github_repo_manager import (
+    DEFAULT_BACKUP_DIR,
+    GitHubRepoManager,
+    MetricsSummary,
+    topic_changes,
+)
+from repo_rules import RepoTable, RuleSet
+from repo_plan import DEFAULT_PLAN_DIR, OP_KINDS, Journal, Plan, PlanExecutor, PlanOp
 
 
 class RepoOrganizer:
     """Organizador automático de repositórios"""
 
-    def __init__(self, dry_run: bool = True, force: bool = False):
+    def __init__(
+        self,
+        dry_run: bool = True,
+        force: bool = False,
+        use_graphql: bool = True,
+        gh: Optional[GitHubRepoManager] = None,
+        rules: Optional[RuleSet] = None,
+        owners: Optional[List[str]] = None,
+        backup_dir: Optional[str] = None,
+    ):
         """
         Inicializa organizador
 
         Args:
             dry_run: Se True, apenas simula as ações sem executar
             force: Se True, ignora confirmações interativas
+            use_graphql: Listar repos com topics via GraphQL (100 por requisição)
+            gh: Gerenciador a usar (padrão: um novo, com GH_TOKEN/GH_API_URL)
+            rules: Políticas de categorização (padrão: GH_ORGANIZER_RULES ou
+                DEFAULT_RULES)
+            owners: Usuários/organizações a organizar, listados em paralelo
+                (padrão: apenas os repos do usuário autenticado)
+            backup_dir: Baixar o tarball de cada repo antes de deletá-lo (a
+                deleção só acontece com o backup verificado; None = sem backup)
         """
-        self.gh = GitHubRepoManager()
+        self.gh = gh or GitHubRepoManager()
+        self.rules = rules or RuleSet.load()
         self.dry_run = dry_run
         self.force = force
+        self.use_graphql = use_graphql
+        self.owners = owners or []
+        self.backup_dir = backup_dir
+        # Dono -> categorias (ou None em caso de erro), na ordem de conclusão
+        self.owner_summary: Dict[str, Optional[Dict[str, int]]] = {}
         self.stats = {
             "total": 0,
             "archived": 0,
             "deleted": 0,
             "updated": 0,
+            "topics": 0,
             "skipped": 0,
         }
 
@@ -46,212 +78,236 @@ class RepoOrganizer:
 
     def get_all_repos(self) -> List[Dict]:
         """Obtém todos os repositórios do usuário com paginação"""
-        self.log("Carregando repositórios...")
-        all_repos = []
-        page = 1
+        if self.owners:
+            return self.scan_owners()
 
-        while True:
-            repos = self.gh.list_repos(per_page=100, sort="updated")
-            if not repos:
-                break
-            all_repos.extend(repos)
-            if len(repos) < 100:
-                break
-            page += 1
-            # Para evitar loops infinitos acidentais
-            if page > 50:
-                break
+        self.log("Carregando repositórios...")
+        if self.use_graphql:
+            all_repos = list(self.gh.iter_repos_graphql())
+        else:
+            all_repos = list(self.gh.iter_repos(per_page=100, sort="updated"))
 
         self.stats["total"] = len(all_repos)
         self.log(f"Encontrados {len(all_repos)} repositórios", "SUCCESS")
         return all_repos
 
-    def analyze_repo_age(self, repo: Dict) -> int:
-        """Calcula idade do repositório em dias (UTC aware)"""
-        # Formato ISO 8601 do GitHub: 2024-01-14T05:25:19Z
-        updated_str = repo["updated_at"].replace("Z", "+00:00")
-        updated = datetime.fromisoformat(updated_str)
-        now = datetime.now(timezone.utc)
-        return (now - updated).days
-
-    def should_archive(self, repo: Dict) -> bool:
-        """Determina se repositório deve ser arquivado"""
-        # Já arquivado
-        if repo["archived"]:
-            return False
-
-        # Idade maior que 1 ano
-        age = self.analyze_repo_age(repo)
-        if age > 365:
-            # Sem stars ou forks
-            if repo["stargazers_count"] == 0 and repo["forks_count"] == 0:
-                return True
-
-        return False
-
-    def should_delete(self, repo: Dict) -> bool:
-        """Determina se repositório deve ser deletado"""
-        # Repositórios temporários ou de teste
-        temp_keywords = ["temp-", "test-", "demo-", "experiment-"]
-
-        for keyword in temp_keywords:
-            if repo["name"].lower().startswith(keyword):
-                # Sem atividade há mais de 3 meses
-                age = self.analyze_repo_age(repo)
-                if age > 90:
-                    return True
+    def scan_owners(self) -> List[Dict]:
+        """
+        Lista todos os donos em paralelo (orçamento de rate limit compartilhado)
 
-        return False
+        Cada dono é categorizado e reportado assim que termina; o resultado é
+        a listagem mesclada de todos.
+        """
+        self.log(f"Carregando repositórios de {len(self.owners)} donos...")
+        all_repos: List[Dict] = []
+        for result in self.gh.scan_owners(self.owners, use_graphql=self.use_graphql):
+            owner = result["owner"]
+            if result["error"]:
+                self.owner_summary[owner] = None
+                self.log(f"{owner}: {result['error']}", "ERROR")
+                continue
 
-    def categorize_repos(self, repos: List[Dict]) -> Dict[str, List[Dict]]:
-        """Categoriza repositórios por ação recomendada"""
-        categories = {"to_archive": [], "to_delete": [], "to_update": [], "active": []}
-
-        for repo in repos:
-            if self.should_delete(repo):
-                categories["to_delete"].append(repo)
-            elif self.should_archive(repo):
-                categories["to_archive"].append(repo)
-            elif not repo.get("description"):
-                categories["to_update"].append(repo)
-            else:
-                categories["active"].append(repo)
-
-        return categories
-
-    def archive_old_repos(self, repos: List[Dict]):
-        """Arquiva repositórios antigos"""
-        if not repos:
-            self.log("Nenhum repositório para arquivar", "INFO")
-            return
-
-        self.log(f"Repositórios para arquivar: {len(repos)}", "WARNING")
-
-        for repo in repos:
-            age = self.analyze_repo_age(repo)
-            self.log(
-                f"  {repo['name']} - {age} dias sem atualização",
-                "DRY_RUN" if self.dry_run else "INFO",
+            repos = result["repos"]
+            all_repos.extend(repos)
+            categories = self.rules.assign(RepoTable(repos))
+            self.owner_summary[owner] = {
+                "total": len(repos),
+                **{name: len(rows) for name, rows in categories.items()},
+            }
+            counts = ", ".join(
+                f"{name}: {len(rows)}" for name, rows in categories.items()
             )
-
-        if self.dry_run:
-            self.log("DRY RUN: Arquivamento não executado", "DRY_RUN")
-            return
-
-        # Executar arquivamento
-        repo_tuples = [(self.gh.user, r["name"]) for r in repos]
-        results = self.gh.archive_multiple(repo_tuples)
-
-        self.stats["archived"] = len(results["success"])
-        self.log(f"Arquivados: {len(results['success'])}", "SUCCESS")
-
-        if results["failed"]:
-            self.log(f"Falhas: {len(results['failed'])}", "ERROR")
-
-    def delete_temp_repos(self, repos: List[Dict]):
-        """Deleta repositórios temporários"""
-        if not repos:
-            self.log("Nenhum repositório para deletar", "INFO")
-            return
-
-        self.log(f"Repositórios para deletar: {len(repos)}", "WARNING")
-
-        for repo in repos:
             self.log(
-                f"  {repo['name']} - temporário/teste",
-                "DRY_RUN" if self.dry_run else "INFO",
+                f"{owner}: {len(repos)} repos em {result['seconds']:.1f}s ({counts})",
+                "SUCCESS",
             )
 
-        if self.dry_run:
-            self.log("DRY RUN: Deleção não executada", "DRY_RUN")
-            return
-
-        # Confirmação adicional
-        if not self.force:
-            print("\n⚠️  ATENÇÃO: Você está prestes a DELETAR repositórios!")
-            print("Esta ação é IRREVERSÍVEL!")
-            response = input("Digite 'DELETE ALL' para confirmar: ")
-
-            if response != "DELETE ALL":
-                self.log("Deleção cancelada pelo usuário", "WARNING")
-                return
-
-        # Executar deleção
-        repo_tuples = [(self.gh.user, r["name"]) for r in repos]
-        results = self.gh.delete_multiple(repo_tuples, confirm=True)
-
-        self.stats["deleted"] = len(results["success"])
-        self.log(f"Deletados: {len(results['success'])}", "SUCCESS")
-
-        if results["failed"]:
-            self.log(f"Falhas: {len(results['failed'])}", "ERROR")
-
-    def update_descriptions(self, repos: List[Dict]):
-        """Adiciona descrição padrão em repos sem descrição"""
-        if not repos:
-            self.log("Nenhum repositório para atualizar", "INFO")
-            return
+        self.stats["total"] = len(all_repos)
+        self.log(f"Encontrados {len(all_repos)} repositórios", "SUCCESS")
+        return all_repos
 
-        self.log(f"Repositórios sem descrição: {len(repos)}", "WARNING")
+    def categorize_repos(self, repos: List[Dict]) -> Dict[str, List[Dict]]:
+        """Categoriza repositórios por ação recomendada (ver self.rules)"""
+        table = RepoTable(repos)
+        return {
+            category: [repos[i] for i in rows]
+            for category, rows in self.rules.assign(table).items()
+        }
 
-        for repo in repos:
-            # Gera descrição baseada no nome
-            name = repo["name"].replace("-", " ").replace("_", " ").title()
-            description = f"Projeto: {name}"
+    def build_plan(
+        self,
+        repos: List[Dict],
+        archive: bool = True,
+        delete: bool = False,
+        update: bool = True,
+        organize_topics: bool = True,
+    ) -> Plan:
+        """
+        Monta o plano de operações a partir da listagem (sem chamar a API)
 
-            self.log(
-                f"  {repo['name']} -> '{description}'",
-                "DRY_RUN" if self.dry_run else "INFO",
+        Repos a deletar não recebem outras operações; os topics vêm da
+        listagem (GraphQL/REST), então só repos alterados geram operação.
+        """
+        table = RepoTable(repos)
+        categories = self.rules.assign(table)
+        plan = Plan(
+            summary={
+                "total": len(repos),
+                **{name: len(rows) for name, rows in categories.items()},
+            }
+        )
+        # Dono de cada repo (a listagem pode misturar usuário e organizações)
+        owners = table.columns["owner"]
+        names = [repo["name"] for repo in repos]
+        archived = table.columns["archived"]
+
+        def op(kind: str, i: int, **kwargs) -> PlanOp:
+            # Estado do repo na listagem: a execução pula o que mudou depois
+            return PlanOp(
+                kind,
+                owners[i],
+                names[i],
+                updated_at=repos[i].get("updated_at"),
+                pushed_at=repos[i].get("pushed_at"),
+                **kwargs,
             )
 
-            if not self.dry_run:
-                try:
-                    self.gh.update_repo(
-                        owner=self.gh.user, repo=repo["name"], description=description
-                    )
-                    self.stats["updated"] += 1
-                except Exception as e:
-                    self.log(f"Erro ao atualizar {repo['name']}: {e}", "ERROR")
-
-        if self.dry_run:
-            self.log("DRY RUN: Atualização não executada", "DRY_RUN")
-        else:
-            self.log(f"Atualizados: {self.stats['updated']}", "SUCCESS")
-
-    def organize_by_topics(self, repos: List[Dict]):
-        """Organiza repositórios por linguagem usando topics"""
-        self.log("Organizando por topics...")
-
-        for repo in repos:
-            if repo["archived"]:
+        for kind, category, enabled in (
+            ("delete", "to_delete", delete),
+            ("archive", "to_archive", archive),
+        ):
+            if not enabled:
                 continue
+            for i in categories.get(category, []):
+                reason = self.rules.reason(table, i, category)
+                plan.ops.append(op(kind, i, reason=reason))
 
-            language = repo.get("language", "").lower()
-            if not language:
-                continue
-
-            # No modo DRY_RUN, assumimos que precisamos adicionar se a linguagem
-            # não for um tópico óbvio (simplificação para evitar chamadas de API)
-            if self.dry_run:
-                self.log(f"  {repo['name']} -> adicionar topic '{language}'", "DRY_RUN")
+        if update:
+            for i in categories.get("to_update", []):
+                if archived[i]:
+                    continue  # read-only: o PATCH seria recusado com 403
+                # Gera descrição baseada no nome
+                name = names[i].replace("-", " ").replace("_", " ").title()
+                plan.ops.append(
+                    op("update", i, params={"description": f"Projeto: {name}"})
+                )
+        if organize_topics:
+            doomed = set(categories.get("to_delete", [])) if delete else set()
+            languages = table.columns["language"]
+            candidates = {}
+            for i, language in enumerate(languages):
+                if archived[i] or not language or i in doomed:
+                    continue
+                repo = repos[i]
+                # Sem topics na listagem (ex: API antiga): só a conferência custa GET
+                if repo.get("topics") is None:
+                    repo = {**repo, "topics": self.gh.get_topics(owners[i], names[i])}
+                candidates[repo["full_name"]] = (i, repo)
+
+            # Alvo calculado localmente: só repos que mudam viram operação (PUT)
+            changes = topic_changes(
+                (repo for _, repo in candidates.values()),
+                lambda repo: repo["topics"] + [repo["language"]],
+            )
+            for full_name, topics in changes.items():
+                i = candidates[full_name][0]
+                plan.ops.append(
+                    op(
+                        "topics",
+                        i,
+                        params={"topics": topics},
+                        reason=f"adicionar '{languages[i]}'",
+                    )
+                )
+
+        return plan
+
+    def print_plan(self, plan: Plan):
+        """Mostra as operações do plano, agrupadas por tipo"""
+        level = "DRY_RUN" if self.dry_run else "INFO"
+        sections = [
+            ("archive", "📦 ARQUIVAMENTO"),
+            ("delete", "🗑️  DELEÇÃO"),
+            ("update", "📝 ATUALIZAÇÃO"),
+            ("topics", "🏷️  ORGANIZAÇÃO POR TOPICS"),
+        ]
+        for kind, title in sections:
+            ops = [op for op in plan.ops if op.kind == kind]
+            print(f"\n{title}")
+            print("-" * 60)
+            if not ops:
+                self.log("Nenhuma operação", "INFO")
                 continue
+            self.log(f"Operações: {len(ops)}", "WARNING")
+            for op in ops:
+                detail = (
+                    op.params.get("description") and f"'{op.params['description']}'"
+                )
+                name = f"{op.owner}/{op.repo}" if self.owners else op.repo
+                self.log(f"  {name} - {detail or op.reason}", level)
+
+    def confirm_delete(self, plan: Plan) -> bool:
+        """Pede confirmação explícita antes de deleções (exceto com force)"""
+        if not plan.count("delete") or self.force:
+            return True
+
+        print("\n⚠️  ATENÇÃO: Você está prestes a DELETAR repositórios!")
+        print("Esta ação é IRREVERSÍVEL!")
+        response = input("Digite 'DELETE ALL' para confirmar: ")
+        if response != "DELETE ALL":
+            self.log("Deleção cancelada pelo usuário", "WARNING")
+            return False
+        return True
 
-            # Adiciona topic da linguagem se não existir
-            try:
-                current_topics = self.gh.get_topics(self.gh.user, repo["name"])
+    def apply_plan(self, plan: Plan, journal_path: str, verify: bool = True):
+        """
+        Executa o plano em paralelo, gravando cada resultado no diário
 
-                if language not in current_topics:
-                    self.log(
-                        f"  {repo['name']} -> adicionando topic '{language}'", "INFO"
-                    )
-                    self.gh.add_topics(
-                        owner=self.gh.user, repo=repo["name"], topics=[language]
-                    )
-            except Exception as e:
-                self.log(f"Erro ao adicionar topic em {repo['name']}: {e}", "ERROR")
+        Rodar de novo com o mesmo plano e diário retoma de onde parou. Com
+        verify, cada repo é relido e suas operações são puladas se ele mudou
+        desde o plano (um plano recém-montado pode dispensar a conferência).
+        """
+        kinds = [k for k in OP_KINDS if k != "delete" or self.confirm_delete(plan)]
+
+        backup = None
+        if self.backup_dir and "delete" in kinds and plan.count("delete"):
+            self.log(f"Backups antes das deleções em {self.backup_dir}")
+            backup = self.gh.backup_stage(self.backup_dir)
+
+        with Journal(journal_path) as journal:
+            executor = PlanExecutor(self.gh, journal, backup=backup, verify=verify)
+            results = executor.apply(plan, kinds=kinds)
+
+        self.stats["archived"] = results["done"]["archive"]
+        self.stats["deleted"] = results["done"]["delete"]
+        self.stats["updated"] = results["done"]["update"]
+        self.stats["topics"] = results["done"]["topics"]
+        self.stats["skipped"] = results["skipped"]
+
+        done = sum(results["done"].values())
+        self.log(f"Operações concluídas: {done}", "SUCCESS")
+        if results["skipped"]:
+            self.log(f"Já concluídas (diário): {results['skipped']}", "INFO")
+        if results["backups"]:
+            size = sum(b["bytes"] for b in results["backups"].values())
+            self.log(
+                f"Backups verificados: {len(results['backups'])} "
+                f"({size / 1024 / 1024:.1f} MB)",
+                "SUCCESS",
+            )
+        for stale in results["stale"]:
+            self.log(f"Pulada {stale['op']}: {stale['reason']}", "WARNING")
+        for failure in results["failed"]:
+            self.log(f"Falha em {failure['op']}: {failure['error']}", "ERROR")
+        if results["cancelled"]:
+            self.log(
+                f"Canceladas: {len(results['cancelled'])} repos (rode de novo "
+                f"com --plan para retomar)",
+                "WARNING",
+            )
 
-    def print_report(self, categories: Dict[str, List[Dict]]):
-        """Imprime relatório detalhado"""
+    def print_report(self, summary: Dict[str, int]):
+        """Imprime relatório detalhado (summary: contagens de Plan.summary)"""
         print("\n" + "=" * 60)
         print("RELATÓRIO DE ORGANIZAÇÃO DE REPOSITÓRIOS")
         print("=" * 60 + "\n")
@@ -259,16 +315,51 @@ class RepoOrganizer:
         print(f"Total de repositórios: {self.stats['total']}\n")
 
         print(f"📊 Categorias:")
-        print(f"  🔒 Para arquivar: {len(categories['to_archive'])}")
-        print(f"  🗑️  Para deletar: {len(categories['to_delete'])}")
-        print(f"  📝 Sem descrição: {len(categories['to_update'])}")
-        print(f"  ✅ Ativos e organizados: {len(categories['active'])}\n")
+        print(f"  🔒 Para arquivar: {summary.get('to_archive', 0)}")
+        print(f"  🗑️  Para deletar: {summary.get('to_delete', 0)}")
+        print(f"  📝 Sem descrição: {summary.get('to_update', 0)}")
+        print(f"  ✅ Ativos e organizados: {summary.get('active', 0)}\n")
+
+        if self.owner_summary:
+            print("🏢 Por dono:")
+            for owner, counts in self.owner_summary.items():
+                if counts is None:
+                    print(f"  {owner}: erro na listagem")
+                    continue
+                print(
+                    f"  {owner}: {counts['total']} repos, "
+                    f"{counts.get('to_archive', 0)} p/ arquivar, "
+                    f"{counts.get('to_delete', 0)} p/ deletar, "
+                    f"{counts.get('to_update', 0)} sem descrição"
+                )
+            print()
 
         if not self.dry_run:
             print(f"📈 Ações executadas:")
             print(f"  Arquivados: {self.stats['archived']}")
             print(f"  Deletados: {self.stats['deleted']}")
-            print(f"  Atualizados: {self.stats['updated']}\n")
+            print(f"  Atualizados: {self.stats['updated']}")
+            print(f"  Topics: {self.stats['topics']}")
+            print(f"  Já concluídos (diário): {self.stats['skipped']}\n")
+
+        budget = self.gh.rate_limit_budget()
+        if budget["remaining"] is not None:
+            print(f"⏱️  Rate limit restante: {budget['remaining']}/{budget['limit']}\n")
+
+        cache = self.gh.cache.stats()
+        if cache["hits"] or cache["misses"]:
+            print(
+                f"💾 Cache HTTP: {cache['hits']} hits / {cache['misses']} misses "
+                f"({cache['hit_ratio']:.0%})\n"
+            )
+
+        cassette = self.gh.transport_stats()
+        if cassette:
+            print(
+                f"🎞️  Cassete ({cassette['mode']}): {cassette['requests']} requisições, "
+                f"{len(cassette['misses'])} fora da gravação, "
+                f"{cassette['unused']} gravadas não usadas\n"
+            )
 
         print("=" * 60)
 
@@ -278,6 +369,9 @@ class RepoOrganizer:
         delete: bool = False,
         update: bool = True,
         organize_topics: bool = True,
+        plan_path: Optional[str] = None,
+        save_plan: Optional[str] = None,
+        journal_path: Optional[str] = None,
     ):
         """
         Executa workflow completo
@@ -287,6 +381,9 @@ class RepoOrganizer:
             delete: Deletar repos temporários
             update: Atualizar descrições
             organize_topics: Organizar por topics
+            plan_path: Aplicar um plano gravado (sem listar os repositórios)
+            save_plan: Gravar o plano montado neste arquivo
+            journal_path: Diário de execução (padrão: <plano>.journal.jsonl)
         """
         print("\n" + "=" * 60)
         print(f"WORKFLOW DE ORGANIZAÇÃO - {'DRY RUN' if self.dry_run else 'MODO REAL'}")
@@ -295,39 +392,46 @@ class RepoOrganizer:
         if self.dry_run:
             self.log("Modo DRY RUN ativo - nenhuma mudança será feita", "WARNING")
 
-        # 1. Carregar repositórios
-        repos = self.get_all_repos()
-
-        # 2. Categorizar
-        self.log("Categorizando repositórios...")
-        categories = self.categorize_repos(repos)
-
-        # 3. Arquivar
-        if archive:
-            print("\n📦 ARQUIVAMENTO")
-            print("-" * 60)
-            self.archive_old_repos(categories["to_archive"])
-
-        # 4. Deletar
-        if delete:
-            print("\n🗑️  DELEÇÃO")
-            print("-" * 60)
-            self.delete_temp_repos(categories["to_delete"])
-
-        # 5. Atualizar
-        if update:
-            print("\n📝 ATUALIZAÇÃO")
-            print("-" * 60)
-            self.update_descriptions(categories["to_update"])
-
-        # 6. Organizar por topics
-        if organize_topics:
-            print("\n🏷️  ORGANIZAÇÃO POR TOPICS")
+        loaded = bool(plan_path)
+        if loaded:
+            # 1. Plano gravado (ex: por um dry-run anterior)
+            plan = Plan.load(plan_path)
+            self.stats["total"] = plan.summary.get("total", 0)
+            self.log(f"Plano carregado: {plan_path} ({len(plan.ops)} operações)")
+        else:
+            # 1. Carregar repositórios
+            repos = self.get_all_repos()
+
+            # 2. Categorizar e planejar
+            self.log("Categorizando repositórios...")
+            plan = self.build_plan(repos, archive, delete, update, organize_topics)
+
+            # Em modo real o plano sempre vai para disco: permite retomar
+            if save_plan is None and not self.dry_run:
+                stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+                plan_dir = os.getenv("GH_PLAN_DIR") or DEFAULT_PLAN_DIR
+                save_plan = os.path.join(plan_dir, f"plan-{stamp}.json")
+            if save_plan:
+                plan.save(save_plan)
+                plan_path = save_plan
+                self.log(f"Plano gravado em {save_plan}", "SUCCESS")
+
+        # 3. Operações planejadas
+        self.print_plan(plan)
+
+        # 4. Execução
+        if self.dry_run:
+            self.log("DRY RUN: operações não executadas", "DRY_RUN")
+        else:
+            print("\n⚙️  EXECUÇÃO")
             print("-" * 60)
-            self.organize_by_topics(repos)
+            # Plano gravado pode estar velho: confere cada repo antes de mexer
+            self.apply_plan(
+                plan, journal_path or f"{plan_path}.journal.jsonl", verify=loaded
+            )
 
-        # 7. Relatório final
-        self.print_report(categories)
+        # 5. Relatório final
+        self.print_report(plan.summary)
 
 
 def main():
@@ -352,11 +456,60 @@ def main():
     parser.add_argument(
         "--force", action="store_true", help="Ignorar confirmações extras (perigoso)"
     )
+    parser.add_argument(
+        "--no-topics", action="store_true", help="Não organizar por topics"
+    )
+    parser.add_argument(
+        "--rest", action="store_true", help="Listar via REST em vez de GraphQL"
+    )
+    parser.add_argument(
+        "--rules", help="Políticas de categorização (JSON; ver repo_rules.py)"
+    )
+    parser.add_argument(
+        "--backup-dir",
+        help="Backups antes de deletar (padrão: GH_BACKUP_DIR ou "
+        "~/.local/share/supergithub/backups)",
+    )
+    parser.add_argument(
+        "--no-backup",
+        action="store_true",
+        help="Deletar sem baixar o tarball antes (PERIGOSO!)",
+    )
+    parser.add_argument(
+        "--owners",
+        help="Usuários/organizações separados por vírgula, listados em paralelo",
+    )
+    parser.add_argument("--save-plan", help="Gravar o plano (JSON) neste arquivo")
+    parser.add_argument(
+        "--plan", help="Aplicar/retomar um plano gravado, sem listar os repos"
+    )
+    parser.add_argument(
+        "--journal", help="Diário de execução (padrão: <plano>.journal.jsonl)"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Imprimir latência/percentis por endpoint ao final",
+    )
 
     args = parser.parse_args()
 
+    # Backup antes de deletar (padrão): sem backup verificado, o repo fica
+    backup_dir = None
+    if not args.no_backup:
+        backup_dir = args.backup_dir or os.getenv("GH_BACKUP_DIR") or DEFAULT_BACKUP_DIR
+
     # Inicializar organizador
-    organizer = RepoOrganizer(dry_run=not args.execute, force=args.force)
+    summary = MetricsSummary() if args.stats else None
+    organizer = RepoOrganizer(
+        dry_run=not args.execute,
+        force=args.force,
+        use_graphql=not args.rest,
+        rules=RuleSet.load(args.rules),
+        owners=[o.strip() for o in (args.owners or "").split(",") if o.strip()],
+        backup_dir=backup_dir,
+        gh=GitHubRepoManager(sinks=[summary] if summary else None),
+    )
 
     try:
         # Executar workflow
@@ -365,6 +518,9 @@ def main():
             delete=args.delete,
             update=not args.no_update,
             organize_topics=not args.no_topics,
+            plan_path=args.plan,
+            save_plan=args.save_plan,
+            journal_path=args.journal,
         )
 
         print("\n✓ Workflow concluído com sucesso!")
@@ -378,6 +534,10 @@ def main():
     except Exception as e:
         print(f"\n❌ Erro: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        organizer.gh.close()
+        if summary is not None:
+            print(f"\n📈 Requisições por endpoint:\n{summary.format_table()}")
 
 
 if __name__ == "__main__":
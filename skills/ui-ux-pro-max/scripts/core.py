@@ -4,15 +4,21 @@
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
+import asyncio
 import csv
+import heapq
+import json
 import re
 from pathlib import Path
-from math import log
+from math import log, sqrt
 from collections import defaultdict
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
+DIVERSITY = 0.0  # MMR trade-off: 0 = pure relevance (default), 1 = pure novelty
+MMR_POOL = 10  # Candidates considered per result slot during re-ranking
+BM25_PARAMS_FILE = DATA_DIR / "bm25_params.json"  # Per-corpus k1/b (evaluate.py)
 
 CSV_CONFIG = {
     "style": {
@@ -185,6 +191,16 @@ _STACK_COLS = {
 
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
+# Palette roles with hex values in colors.csv, and WCAG pairs checked per palette
+PALETTE_COLS = [c for c in CSV_CONFIG["color"]["output_cols"] if c.endswith("(Hex)")]
+CONTRAST_PAIRS = [
+    ("Text (Hex)", "Background (Hex)"),
+    ("Primary (Hex)", "Background (Hex)"),
+    ("CTA (Hex)", "Background (Hex)"),
+    ("Secondary (Hex)", "Background (Hex)"),
+]
+NEAREST_PALETTES = 5
+
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
@@ -199,6 +215,7 @@ class BM25:
         self.idf = {}
         self.doc_freqs = defaultdict(int)
         self.doc_term_freqs = []  # List of dicts: {word: count}
+        self.doc_norms = []  # L2 norm of each doc's tf-idf vector
         self.N = 0
 
     def tokenize(self, text):
@@ -228,6 +245,32 @@ class BM25:
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
+        # Precompute tf-idf norms so similarity() is a sparse dot product
+        self.doc_norms = [
+            sqrt(sum((tf * self.idf[word]) ** 2 for word, tf in term_freqs.items()))
+            for term_freqs in self.doc_term_freqs
+        ]
+
+    def similarity(self, i, j, other=None):
+        """Cosine similarity between two indexed documents (tf-idf weighted)
+
+        j indexes other (default: this index); each side uses its own idf.
+        """
+        other = other or self
+        norm = self.doc_norms[i] * other.doc_norms[j]
+        if not norm:
+            return 0.0
+        a, b = self.doc_term_freqs[i], other.doc_term_freqs[j]
+        idf_a, idf_b = self.idf, other.idf
+        if len(a) > len(b):
+            a, b, idf_a, idf_b = b, a, idf_b, idf_a
+        dot = sum(
+            tf * idf_a[word] * b[word] * idf_b[word]
+            for word, tf in a.items()
+            if word in b
+        )
+        return dot / norm
+
     def score(self, query):
         """Score all documents against query"""
         query_tokens = self.tokenize(query)
@@ -266,33 +309,331 @@ def _load_csv(filepath):
         return []
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
+def _mmr_rerank(bm25, ranked, max_results, diversity):
+    """Maximal marginal relevance: trade BM25 relevance against redundancy"""
+    candidates = [(idx, score) for idx, score in ranked if score > 0]
+    if max_results <= 0 or not candidates:
         return []
+    if diversity <= 0 or len(candidates) <= 1:
+        return [idx for idx, _ in candidates[:max_results]]
+
+    pool = candidates[: max_results * MMR_POOL]
+    top_score = pool[0][1]
+    selected = []
+
+    while pool and len(selected) < max_results:
+
+        def mmr_score(candidate):
+            idx, score = candidate
+            redundancy = max((bm25.similarity(idx, s) for s in selected), default=0.0)
+            return (1 - diversity) * score / top_score - diversity * redundancy
+
+        best = max(pool, key=mmr_score)
+        pool.remove(best)
+        selected.append(best[0])
+
+    return selected
+
+
+def _build_documents(data, search_cols):
+    """Build one BM25 document per row from its search columns"""
+    return [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+
+
+def corpus_key(filepath):
+    """Corpus name used in bm25_params.json, e.g. 'styles.csv', 'stacks/react.csv'"""
+    try:
+        return Path(filepath).relative_to(DATA_DIR).as_posix()
+    except ValueError:
+        return Path(filepath).name
+
+
+_bm25_params = None
+
+
+def _get_bm25_params(corpus):
+    """Tuned BM25 keyword arguments for a corpus key ({} = class defaults)"""
+    global _bm25_params
+    if _bm25_params is None:
+        try:
+            with open(BM25_PARAMS_FILE, "r", encoding="utf-8") as f:
+                _bm25_params = json.load(f)
+        except FileNotFoundError:
+            _bm25_params = {}
+        except Exception as e:
+            print(f"Error loading {BM25_PARAMS_FILE}: {e}")
+            _bm25_params = {}
+    return _bm25_params.get(corpus, {})
+
+
+# Fitted indexes stay resident for the life of the process
+_index_cache = {}
+
 
-    data = _load_csv(filepath)
+def _index_key(filepath, search_cols):
+    return (str(filepath), tuple(search_cols))
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
+def _get_index(filepath, search_cols):
+    """Load a CSV and fit its BM25 index once; returns (rows, bm25)"""
+    key = _index_key(filepath, search_cols)
+    if key not in _index_cache:
+        data = _load_csv(filepath)
+        bm25 = BM25(**_get_bm25_params(corpus_key(filepath)))
+        bm25.fit(_build_documents(data, search_cols))
+        _index_cache[key] = (data, bm25)
+
+    return _index_cache[key]
+
+
+def _search_csv(
+    filepath, search_cols, output_cols, query, max_results, diversity=DIVERSITY
+):
+    """Core search function using BM25 with MMR diversification"""
+    if not filepath.exists():
+        return []
+
+    data, bm25 = _get_index(filepath, search_cols)
     ranked = bm25.score(query)
 
-    # Get top results with score > 0
+    # Top results with score > 0, re-ranked to avoid near-duplicates
+    return [
+        {col: data[idx].get(col, "") for col in output_cols if col in data[idx]}
+        for idx in _mmr_rerank(bm25, ranked, max_results, diversity)
+    ]
+
+
+def _dedup_key(row):
+    """Category + title; stack rows carry a Guideline, ux rows an Issue"""
+    title = row.get("Guideline") or row.get("Issue") or ""
+    return (row.get("Category", "").strip().lower(), title.strip().lower())
+
+
+class _JointIndex:
+    """Resident per-corpus indexes searched together; docs are (part, row) keys"""
+
+    def __init__(self, indexes):
+        self.indexes = indexes  # [(rows, bm25), ...]
+
+    def score(self, query):
+        """Merge each corpus' BM25 scores (tuned k1/b per corpus), best first"""
+        scored = [
+            ((part_id, idx), score)
+            for part_id, (_, bm25) in enumerate(self.indexes)
+            for idx, score in bm25.score(query)
+            if score > 0
+        ]
+        return sorted(scored, key=lambda x: x[1], reverse=True)
+
+    def similarity(self, a, b):
+        (part_a, i), (part_b, j) = a, b
+        return self.indexes[part_a][1].similarity(i, j, self.indexes[part_b][1])
+
+
+def _search_joint(parts, labels, query, max_results, diversity=DIVERSITY):
+    """Search several CSVs in one pass, deduplicated by Category/title
+
+    parts: list of (filepath, search_cols, output_cols)
+    """
+    joint = _JointIndex(
+        [_get_index(filepath, search_cols) for filepath, search_cols, _ in parts]
+    )
+
+    seen, ranked = set(), []
+    for key, score in joint.score(query):
+        part_id, idx = key
+        dedup = _dedup_key(joint.indexes[part_id][0][idx])
+        if dedup not in seen:
+            seen.add(dedup)
+            ranked.append((key, score))
+
     results = []
-    for idx, score in ranked:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-            if len(results) >= max_results:
-                break
+    for part_id, idx in _mmr_rerank(joint, ranked, max_results, diversity):
+        row = joint.indexes[part_id][0][idx]
+        output_cols = parts[part_id][2]
+        result = {"Source": labels[part_id]}
+        result.update({col: row.get(col, "") for col in output_cols if col in row})
+        results.append(result)
 
     return results
 
 
+def _stack_with_ux_parts(filepath):
+    """Search parts for a stack CSV plus the generic ux guidelines"""
+    ux = CSV_CONFIG["ux"]
+    return [
+        (filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]),
+        (DATA_DIR / ux["file"], ux["search_cols"], ux["output_cols"]),
+    ]
+
+
+# ============ COLOR INDEX ============
+_HEX_RE = re.compile(r"^#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
+
+
+def parse_hex(value):
+    """Parse '#RRGGBB' / '#RGB' into an (r, g, b) tuple of 0-255 ints, or None"""
+    match = _HEX_RE.match(str(value).strip())
+    if not match:
+        return None
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    return tuple(int(digits[i : i + 2], 16) for i in (0, 2, 4))
+
+
+def _linear(channel):
+    """sRGB channel (0-255) to linear light"""
+    c = channel / 255
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def relative_luminance(rgb):
+    """WCAG relative luminance of an sRGB color"""
+    r, g, b = (_linear(c) for c in rgb)
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def contrast_ratio(lum_a, lum_b):
+    """WCAG contrast ratio between two relative luminances"""
+    hi, lo = max(lum_a, lum_b), min(lum_a, lum_b)
+    return (hi + 0.05) / (lo + 0.05)
+
+
+def rgb_to_lab(rgb):
+    """sRGB (D65) to CIELAB"""
+    r, g, b = (_linear(c) for c in rgb)
+    xyz = (
+        (0.4124 * r + 0.3576 * g + 0.1805 * b) / 0.95047,
+        (0.2126 * r + 0.7152 * g + 0.0722 * b) / 1.00000,
+        (0.0193 * r + 0.1192 * g + 0.9505 * b) / 1.08883,
+    )
+    fx, fy, fz = (t ** (1 / 3) if t > 0.008856 else 7.787 * t + 16 / 116 for t in xyz)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+class KDTree:
+    """3-D KD-tree for nearest-neighbour lookup by Euclidean distance"""
+
+    def __init__(self, points):
+        self.points = points
+        self.root = self._build(list(range(len(points))), 0)
+
+    def _build(self, indices, depth):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        mid = len(indices) // 2
+        return (
+            indices[mid],
+            axis,
+            self._build(indices[:mid], depth + 1),
+            self._build(indices[mid + 1 :], depth + 1),
+        )
+
+    def query(self, target, k):
+        """Return [(distance, point_index), ...] for the k nearest points"""
+        if k < 1:
+            return []
+        heap = []  # Max-heap of (-dist_sq, idx)
+
+        def visit(node):
+            if node is None:
+                return
+            idx, axis, left, right = node
+            point = self.points[idx]
+            dist_sq = sum((p - t) ** 2 for p, t in zip(point, target))
+            if len(heap) < k:
+                heapq.heappush(heap, (-dist_sq, idx))
+            elif dist_sq < -heap[0][0]:
+                heapq.heapreplace(heap, (-dist_sq, idx))
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return sorted(((-d) ** 0.5, idx) for d, idx in heap)
+
+
+_palette_index = None
+
+
+def _get_palette_index():
+    """Parse colors.csv once into Lab points, a KD-tree and per-palette contrasts"""
+    global _palette_index
+    if _palette_index is not None:
+        return _palette_index
+
+    palettes = _load_csv(DATA_DIR / CSV_CONFIG["color"]["file"])
+    points, owners, luminance = [], [], {}
+
+    for p_idx, row in enumerate(palettes):
+        for col in PALETTE_COLS:
+            rgb = parse_hex(row.get(col, ""))
+            if rgb is None:
+                continue
+            points.append(rgb_to_lab(rgb))
+            owners.append((p_idx, col))
+            luminance[(p_idx, col)] = relative_luminance(rgb)
+
+    contrasts = [
+        {
+            f"{fg.replace(' (Hex)', '')}/{bg.replace(' (Hex)', '')}": round(
+                contrast_ratio(luminance[(p_idx, fg)], luminance[(p_idx, bg)]), 2
+            )
+            for fg, bg in CONTRAST_PAIRS
+            if (p_idx, fg) in luminance and (p_idx, bg) in luminance
+        }
+        for p_idx in range(len(palettes))
+    ]
+
+    _palette_index = {
+        "palettes": palettes,
+        "owners": owners,
+        "tree": KDTree(points),
+        "contrasts": contrasts,
+    }
+    return _palette_index
+
+
+def nearest_palette(hex_color, k=NEAREST_PALETTES):
+    """Find the k palettes containing the color closest to hex_color (CIE76 dE)"""
+    rgb = parse_hex(hex_color)
+    if rgb is None:
+        return {"error": f"Invalid hex color: {hex_color}", "domain": "color"}
+
+    index = _get_palette_index()
+    # Each palette owns at most len(PALETTE_COLS) points, so this yields >= k palettes
+    neighbours = index["tree"].query(rgb_to_lab(rgb), k * len(PALETTE_COLS))
+
+    results, seen = [], set()
+    for distance, point_idx in neighbours:
+        p_idx, role = index["owners"][point_idx]
+        if p_idx in seen:
+            continue
+        seen.add(p_idx)
+        row = index["palettes"][p_idx]
+        result = {col: row.get(col, "") for col in CSV_CONFIG["color"]["output_cols"]}
+        result["Matched Role"] = role.replace(" (Hex)", "")
+        result["Delta E"] = round(distance, 2)
+        result["WCAG Contrast"] = index["contrasts"][p_idx]
+        results.append(result)
+        if len(results) >= k:
+            break
+
+    return {
+        "domain": "color",
+        "query": hex_color,
+        "file": CSV_CONFIG["color"]["file"],
+        "count": len(results),
+        "results": results,
+    }
+
+
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
     query_lower = query.lower()
@@ -374,7 +715,7 @@ def detect_domain(query):
     return best if scores[best] > 0 else "style"
 
 
-def search(query, domain=None, max_results=MAX_RESULTS):
+def search(query, domain=None, max_results=MAX_RESULTS, diversity=DIVERSITY):
     """Main search function with auto-domain detection"""
     if domain is None:
         domain = detect_domain(query)
@@ -386,7 +727,12 @@ def search(query, domain=None, max_results=MAX_RESULTS):
         return {"error": f"File not found: {filepath}", "domain": domain}
 
     results = _search_csv(
-        filepath, config["search_cols"], config["output_cols"], query, max_results
+        filepath,
+        config["search_cols"],
+        config["output_cols"],
+        query,
+        max_results,
+        diversity,
     )
 
     return {
@@ -398,8 +744,10 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
-    """Search stack-specific guidelines"""
+def search_stack(
+    query, stack, max_results=MAX_RESULTS, diversity=DIVERSITY, with_ux=False
+):
+    """Search stack-specific guidelines, optionally merged with generic ux ones"""
     if stack not in STACK_CONFIG:
         return {
             "error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"
@@ -410,19 +758,80 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(
-        filepath,
-        _STACK_COLS["search_cols"],
-        _STACK_COLS["output_cols"],
-        query,
-        max_results,
-    )
+    if with_ux:
+        results = _search_joint(
+            _stack_with_ux_parts(filepath), [stack, "ux"], query, max_results, diversity
+        )
+        file = f"{STACK_CONFIG[stack]['file']} + {CSV_CONFIG['ux']['file']}"
+    else:
+        results = _search_csv(
+            filepath,
+            _STACK_COLS["search_cols"],
+            _STACK_COLS["output_cols"],
+            query,
+            max_results,
+            diversity,
+        )
+        file = STACK_CONFIG[stack]["file"]
 
     return {
         "domain": "stack",
         "stack": stack,
+        "with_ux": with_ux,
         "query": query,
-        "file": STACK_CONFIG[stack]["file"],
+        "file": file,
         "count": len(results),
         "results": results,
     }
+
+
+# ============ ASYNC API ============
+# In-flight index builds, shared by concurrent cold queries on the same loop
+_pending_builds = {}
+
+
+async def _ensure_index(key, builder, *args):
+    """Run builder(*args) off the event loop, coalescing concurrent requests"""
+    if key in _index_cache:
+        return
+
+    loop = asyncio.get_running_loop()
+    build = _pending_builds.get((loop, key))
+    if build is None:
+        build = loop.run_in_executor(None, builder, *args)
+        _pending_builds[(loop, key)] = build
+        build.add_done_callback(lambda _: _pending_builds.pop((loop, key), None))
+
+    # Shield so a cancelled caller doesn't cancel the build for the others
+    await asyncio.shield(build)
+
+
+async def asearch(query, domain=None, max_results=MAX_RESULTS, diversity=DIVERSITY):
+    """Async search(): cold index builds run in the default executor"""
+    if domain is None:
+        domain = detect_domain(query)
+
+    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+    filepath = DATA_DIR / config["file"]
+    if filepath.exists():
+        key = _index_key(filepath, config["search_cols"])
+        await _ensure_index(key, _get_index, filepath, config["search_cols"])
+    return search(query, domain, max_results, diversity)
+
+
+async def asearch_stack(
+    query, stack, max_results=MAX_RESULTS, diversity=DIVERSITY, with_ux=False
+):
+    """Async search_stack(): cold index builds run in the default executor"""
+    filepath = DATA_DIR / STACK_CONFIG.get(stack, {}).get("file", "")
+    if stack in STACK_CONFIG and filepath.exists():
+        parts = _stack_with_ux_parts(filepath)
+        if not with_ux:
+            parts = parts[:1]
+        await asyncio.gather(
+            *(
+                _ensure_index(_index_key(path, cols), _get_index, path, cols)
+                for path, cols, _ in parts
+            )
+        )
+    return search_stack(query, stack, max_results, diversity, with_ux)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Evaluate - relevance and latency harness for the BM25 ranking
+Usage: python evaluate.py [--qrels <file>] [--k 3] [--runs 20] [--corpus style]
+       python evaluate.py --tune [--write]
+
+Runs the labeled queries in data/qrels.csv against every corpus and reports
+nDCG@k, MRR@k and recall@k next to query latency percentiles.
+--tune grid-searches k1/b per corpus in parallel processes; --write stores the
+winners in data/bm25_params.json, which core.py uses when fitting indexes.
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from math import log2
+from time import perf_counter
+
+from core import (
+    BM25,
+    BM25_PARAMS_FILE,
+    CSV_CONFIG,
+    DATA_DIR,
+    DIVERSITY,
+    MAX_RESULTS,
+    STACK_CONFIG,
+    _STACK_COLS,
+    _build_documents,
+    _get_bm25_params,
+    _load_csv,
+    _mmr_rerank,
+)
+
+QRELS_FILE = DATA_DIR / "qrels.csv"
+K1_GRID = [0.6, 0.9, 1.2, 1.5, 1.8, 2.1]
+B_GRID = [0.3, 0.5, 0.75, 0.9]
+DEFAULT_PARAMS = {"k1": 1.5, "b": 0.75}
+
+
+def load_qrels(filepath):
+    """Load labeled queries grouped by corpus: {corpus: [(query, {ids}), ...]}"""
+    qrels = defaultdict(list)
+    for row in _load_csv(filepath):
+        qrels[row["Corpus"]].append((row["Query"], set(row["Relevant"].split())))
+    return dict(qrels)
+
+
+def corpus_config(corpus):
+    """Resolve 'style' / 'stack:react' to (data file, search columns)"""
+    if corpus.startswith("stack:"):
+        return STACK_CONFIG[corpus[6:]]["file"], _STACK_COLS["search_cols"]
+    return CSV_CONFIG[corpus]["file"], CSV_CONFIG[corpus]["search_cols"]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def ndcg_at_k(ranked_ids, relevant, k):
+    """Binary-relevance nDCG@k"""
+    dcg = sum(
+        1 / log2(i + 2) for i, rid in enumerate(ranked_ids[:k]) if rid in relevant
+    )
+    idcg = sum(1 / log2(i + 2) for i in range(min(k, len(relevant))))
+    return dcg / idcg if idcg else 0.0
+
+
+def reciprocal_rank(ranked_ids, relevant):
+    """1 / rank of the first relevant result (0 if none)"""
+    for i, rid in enumerate(ranked_ids, 1):
+        if rid in relevant:
+            return 1 / i
+    return 0.0
+
+
+def evaluate_corpus(corpus, queries, k1, b, k=MAX_RESULTS, diversity=DIVERSITY, runs=1):
+    """Fit one corpus with (k1, b) and score every labeled query against it"""
+    file, search_cols = corpus_config(corpus)
+    data = _load_csv(DATA_DIR / file)
+    id_col = next(iter(data[0])) if data else "No"
+
+    start = perf_counter()
+    bm25 = BM25(k1=k1, b=b)
+    bm25.fit(_build_documents(data, search_cols))
+    build_ms = (perf_counter() - start) * 1000
+
+    ndcg, mrr, recall, latencies = [], [], [], []
+    for query, relevant in queries:
+        for _ in range(runs):
+            start = perf_counter()
+            top = _mmr_rerank(bm25, bm25.score(query), k, diversity)
+            latencies.append((perf_counter() - start) * 1000)
+
+        ranked_ids = [data[idx][id_col] for idx in top]
+        ndcg.append(ndcg_at_k(ranked_ids, relevant, k))
+        mrr.append(reciprocal_rank(ranked_ids, relevant))
+        recall.append(len(relevant.intersection(ranked_ids)) / len(relevant))
+
+    n = len(queries)
+    return {
+        "corpus": corpus,
+        "file": file,
+        "k1": k1,
+        "b": b,
+        "queries": n,
+        "ndcg": sum(ndcg) / n,
+        "mrr": sum(mrr) / n,
+        "recall": sum(recall) / n,
+        "build_ms": build_ms,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def tune_corpus(job):
+    """Grid-search k1/b for one corpus; ties keep the defaults"""
+    corpus, queries, k, diversity = job
+    trials = [
+        evaluate_corpus(corpus, queries, k1, b, k, diversity)
+        for k1 in K1_GRID
+        for b in B_GRID
+    ]
+    return max(
+        trials,
+        key=lambda r: (
+            round(r["ndcg"], 6),
+            round(r["mrr"], 6),
+            round(r["recall"], 6),
+            {"k1": r["k1"], "b": r["b"]} == DEFAULT_PARAMS,
+        ),
+    )
+
+
+def write_params(results):
+    """Merge winning parameters into bm25_params.json"""
+    try:
+        with open(BM25_PARAMS_FILE, "r", encoding="utf-8") as f:
+            params = json.load(f)
+    except FileNotFoundError:
+        params = {}
+
+    for r in results:
+        params[r["file"]] = {"k1": r["k1"], "b": r["b"]}
+
+    with open(BM25_PARAMS_FILE, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(params.items())), f, indent=2)
+        f.write("\n")
+
+
+def format_table(results, k):
+    """Format per-corpus metrics as a markdown table"""
+    output = [
+        f"| Corpus | k1 | b | Queries | nDCG@{k} | MRR@{k} | Recall@{k} "
+        f"| Build ms | p50 ms | p95 ms | p99 ms |",
+        "|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        output.append(
+            f"| {r['corpus']} | {r['k1']} | {r['b']} | {r['queries']} "
+            f"| {r['ndcg']:.3f} | {r['mrr']:.3f} | {r['recall']:.3f} "
+            f"| {r['build_ms']:.2f} | {r['p50_ms']:.3f} | {r['p95_ms']:.3f} "
+            f"| {r['p99_ms']:.3f} |"
+        )
+    return "\n".join(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max ranking evaluation")
+    parser.add_argument(
+        "--qrels",
+        default=str(QRELS_FILE),
+        help="Labeled queries CSV (Corpus, Query, Relevant)",
+    )
+    parser.add_argument(
+        "--corpus", "-c", action="append", help="Only evaluate this corpus (repeatable)"
+    )
+    parser.add_argument(
+        "--k",
+        type=int,
+        default=MAX_RESULTS,
+        help=f"Cutoff for metrics (default: {MAX_RESULTS})",
+    )
+    parser.add_argument(
+        "--diversity",
+        type=float,
+        default=DIVERSITY,
+        help=f"MMR diversity (default: {DIVERSITY})",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=20, help="Timed repetitions per query (default: 20)"
+    )
+    parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Grid-search k1/b per corpus in parallel processes",
+    )
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help=f"With --tune, save winners to {BM25_PARAMS_FILE.name}",
+    )
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+    qrels = load_qrels(args.qrels)
+    if args.corpus:
+        qrels = {c: q for c, q in qrels.items() if c in args.corpus}
+
+    if args.tune:
+        jobs = [(c, q, args.k, args.diversity) for c, q in qrels.items()]
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(tune_corpus, jobs))
+        if args.write:
+            write_params(results)
+    else:
+        results = []
+        for corpus, queries in qrels.items():
+            file, _ = corpus_config(corpus)
+            params = {**DEFAULT_PARAMS, **_get_bm25_params(file)}
+            results.append(
+                evaluate_corpus(
+                    corpus,
+                    queries,
+                    params["k1"],
+                    params["b"],
+                    args.k,
+                    args.diversity,
+                    args.runs,
+                )
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_table(results, args.k))
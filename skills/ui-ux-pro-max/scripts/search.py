@@ -2,14 +2,24 @@
 # -*- coding: utf-8 -*-
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
-Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+Usage: python search.py "<query>" [--domain <domain>] [--stack <stack> [--with-ux]] [--max-results 3] [--diversity 0.3]
+       python search.py "#1E40AF" --palette [--max-results 5]
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
+from core import (
+    CSV_CONFIG,
+    AVAILABLE_STACKS,
+    MAX_RESULTS,
+    DIVERSITY,
+    NEAREST_PALETTES,
+    search,
+    search_stack,
+    nearest_palette,
+)
 
 
 def format_output(result):
@@ -19,7 +29,7 @@ def format_output(result):
 
     output = []
     if result.get("stack"):
-        output.append(f"## UI Pro Max Stack Guidelines")
+        output.append(f"## UI Pro Max Stack Guidelines{' + UX' if result.get('with_ux') else ''}")
         output.append(f"**Stack:** {result['stack']} | **Query:** {result['query']}")
     else:
         output.append(f"## UI Pro Max Search Results")
@@ -29,6 +39,8 @@ def format_output(result):
     for i, row in enumerate(result['results'], 1):
         output.append(f"### Result {i}")
         for key, value in row.items():
+            if isinstance(value, dict):
+                value = ", ".join(f"{k} {v}" for k, v in value.items())
             value_str = str(value)
             if len(value_str) > 300:
                 value_str = value_str[:300] + "..."
@@ -43,16 +55,23 @@ if __name__ == "__main__":
     parser.add_argument("query", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
-    parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
+    parser.add_argument("--with-ux", action="store_true", help="With --stack, also search generic UX guidelines in the same pass")
+    parser.add_argument("--max-results", "-n", type=int, help=f"Max results (default: {MAX_RESULTS}, {NEAREST_PALETTES} with --palette)")
+    parser.add_argument("--diversity", type=float, default=DIVERSITY, help=f"Result diversity 0-1, 0 = pure relevance (default: {DIVERSITY})")
+    parser.add_argument("--palette", "-p", action="store_true", help="Nearest palettes to a hex color by perceptual distance")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
 
     args = parser.parse_args()
+    if args.with_ux and not args.stack:
+        parser.error("--with-ux requires --stack")
 
-    # Stack search takes priority
-    if args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+    # Palette lookup, then stack search, take priority
+    if args.palette:
+        result = nearest_palette(args.query, args.max_results or NEAREST_PALETTES)
+    elif args.stack:
+        result = search_stack(args.query, args.stack, args.max_results or MAX_RESULTS, args.diversity, args.with_ux)
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = search(args.query, args.domain, args.max_results or MAX_RESULTS, args.diversity)
 
     if args.json:
         import json
@@ -0,0 +1,69 @@
+"""Edge cases of the BM25 search and palette lookup (run: pytest test_core.py)"""
+
+import core
+
+
+def test_search_defaults_to_pure_relevance():
+    data, bm25 = core._get_index(
+        core.DATA_DIR / core.CSV_CONFIG["style"]["file"],
+        core.CSV_CONFIG["style"]["search_cols"],
+    )
+    query = "minimal dark dashboard"
+    top = [idx for idx, score in bm25.score(query)[: core.MAX_RESULTS] if score > 0]
+    expected = [data[idx]["Style Category"] for idx in top]
+
+    results = core.search(query, domain="style")["results"]
+    assert [r["Style Category"] for r in results] == expected
+
+
+def test_search_with_no_results_requested():
+    for max_results in (0, -1):
+        result = core.search("fintech dashboard", max_results=max_results)
+        assert (result["count"], result["results"]) == (0, [])
+
+
+def test_search_stack_with_no_results_requested():
+    result = core.search_stack("forms", "react", max_results=0, with_ux=True)
+    assert (result["count"], result["results"]) == (0, [])
+
+
+def test_mmr_rerank_empty_pool():
+    bm25 = core.BM25()
+    bm25.fit(["alpha beta", "gamma delta"])
+    assert core._mmr_rerank(bm25, [], 5, 0.3) == []
+
+
+def test_search_stack_with_ux_reuses_corpus_indexes():
+    core.search_stack("form labels", "react")
+    core.search("form labels", domain="ux")
+    resident = len(core._index_cache)
+
+    result = core.search_stack("form labels", "react", max_results=6, with_ux=True)
+    assert {r["Source"] for r in result["results"]} == {"react", "ux"}
+    assert len(core._index_cache) == resident
+
+
+def test_cross_index_similarity():
+    a, b = core.BM25(), core.BM25()
+    a.fit(["form label input", "grid layout"])
+    b.fit(["modal focus trap", "form label input", "color contrast"])
+    assert abs(a.similarity(0, 1, b) - 1.0) < 1e-9
+    assert a.similarity(1, 0, b) == 0.0
+
+
+def test_search_without_matches():
+    result = core.search("zzqxv", domain="style", diversity=0.3)
+    assert result["count"] == 0
+
+
+def test_nearest_palette_k():
+    assert core.nearest_palette("#3366ff", k=0)["results"] == []
+    assert core.nearest_palette("#3366ff", k=-2)["results"] == []
+    assert core.nearest_palette("#3366ff", k=2)["count"] == 2
+
+
+def test_kdtree_query_bounds():
+    tree = core.KDTree([(0, 0, 0), (1, 1, 1), (5, 5, 5)])
+    assert tree.query((0, 0, 0), 0) == []
+    assert [idx for _, idx in tree.query((0, 0, 0), 10)] == [0, 1, 2]
+    assert core.KDTree([]).query((0, 0, 0), 3) == []